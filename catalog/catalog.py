@@ -24,7 +24,7 @@ import os
 import tempfile
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from storage.schema import Schema
 
@@ -40,6 +40,20 @@ SCHEMA_EVOLUTION_NOTE = (
 )
 
 
+# Parsed catalog.dat contents shared by all Catalog instances in the process:
+#   catalog file path → (file signature, tables, indexes)
+# The signature is (st_ino, st_mtime_ns, st_size); save() replaces the file
+# atomically, so any rewrite changes it and forces a re-parse. Entry dicts
+# are never mutated in place, so instances share them and copy only the
+# outer mappings.
+_load_cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any], Dict[str, Any]]] = {}
+
+
+def _file_signature(path: str) -> Tuple[int, int, int]:
+    st = os.stat(path)
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
 class Catalog:
     """
     Database catalog — stores metadata about all tables.
@@ -58,6 +72,11 @@ class Catalog:
         self._tables: Dict[str, Dict[str, Any]] = {}
         self._indexes: Dict[str, Dict[str, Any]] = {}
         self._loaded = False
+        # table name (lowercase) → absolute data file path; cleared on DDL
+        self._file_paths: Dict[str, str] = {}
+        # table name (lowercase) → parsed Schema, shared and read-only;
+        # cleared on DDL
+        self._schemas: Dict[str, Schema] = {}
 
     @property
     def data_dir(self) -> str:
@@ -70,22 +89,33 @@ class Catalog:
         os.makedirs(self._data_dir, exist_ok=True)
 
         if os.path.exists(self._catalog_file):
-            with open(self._catalog_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Validate format version
-            stored_version = data.get("format_version", 0)
-            if stored_version > CATALOG_FORMAT_VERSION:
-                raise ValueError(
-                    f"Catalog format version {stored_version} is newer than "
-                    f"supported version {CATALOG_FORMAT_VERSION}")
-
-            self._tables = data.get("tables", {})
-            self._indexes = data.get("indexes", {})
+            signature = _file_signature(self._catalog_file)
+            cached = _load_cache.get(self._catalog_file)
+            if cached is not None and cached[0] == signature:
+                _, tables, indexes = cached
+            else:
+                with open(self._catalog_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+
+                # Validate format version
+                stored_version = data.get("format_version", 0)
+                if stored_version > CATALOG_FORMAT_VERSION:
+                    raise ValueError(
+                        f"Catalog format version {stored_version} is newer than "
+                        f"supported version {CATALOG_FORMAT_VERSION}")
+
+                tables = data.get("tables", {})
+                indexes = data.get("indexes", {})
+                _load_cache[self._catalog_file] = (signature, tables, indexes)
+
+            self._tables = dict(tables)
+            self._indexes = dict(indexes)
         else:
             self._tables = {}
             self._indexes = {}
 
+        self._file_paths.clear()
+        self._schemas.clear()
         self._loaded = True
 
     def save(self) -> None:
@@ -115,6 +145,9 @@ class Catalog:
                 f.flush()
                 os.fsync(f.fileno())  # Force to disk
             os.replace(tmp_path, self._catalog_file)  # Atomic rename
+            _load_cache[self._catalog_file] = (
+                _file_signature(self._catalog_file),
+                dict(self._tables), dict(self._indexes))
         except Exception:
             # Clean up temp file on failure
             try:
@@ -154,6 +187,8 @@ class Catalog:
             "created_at": datetime.now(timezone.utc).isoformat(),
             "format_version": CATALOG_FORMAT_VERSION,
         }
+        self._file_paths.pop(name_lower, None)
+        self._schemas.pop(name_lower, None)
         self.save()
         return file_name
 
@@ -167,6 +202,8 @@ class Catalog:
         name_lower = table_name.lower()
 
         entry = self._tables.pop(name_lower, None)
+        self._file_paths.pop(name_lower, None)
+        self._schemas.pop(name_lower, None)
         if entry is None:
             return None
 
@@ -185,18 +222,34 @@ class Catalog:
         return self._tables.get(table_name.lower())
 
     def get_table_schema(self, table_name: str) -> Optional[Schema]:
-        """Get the schema for a table, or None if it doesn't exist."""
-        entry = self.get_table(table_name)
+        """
+        Get the schema for a table, or None if it doesn't exist.
+
+        The Schema is parsed once and shared by later calls; do not mutate it.
+        """
+        name_lower = table_name.lower()
+        schema = self._schemas.get(name_lower)
+        if schema is not None:
+            return schema
+        entry = self.get_table(name_lower)
         if entry is None:
             return None
-        return Schema.from_dict(entry["schema"])
+        schema = Schema.from_dict(entry["schema"])
+        self._schemas[name_lower] = schema
+        return schema
 
     def get_table_file(self, table_name: str) -> Optional[str]:
         """Get the absolute file path for a table's data file."""
-        entry = self.get_table(table_name)
+        name_lower = table_name.lower()
+        path = self._file_paths.get(name_lower)
+        if path is not None:
+            return path
+        entry = self.get_table(name_lower)
         if entry is None:
             return None
-        return os.path.join(self._data_dir, entry["file"])
+        path = os.path.join(self._data_dir, entry["file"])
+        self._file_paths[name_lower] = path
+        return path
 
     def list_tables(self) -> List[str]:
         """List all table names (sorted, deterministic)."""
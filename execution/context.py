@@ -14,6 +14,7 @@ class ExecutionContext:
     log_manager: Optional[object] = field(default=None)    # LogManager
     lock_manager: Optional[object] = field(default=None)   # LockManager
     active_txn_id: Optional[int] = field(default=None)     # Current transaction
+    buffer_max_age: Optional[float] = field(default=None)  # Purge pages idle this long (s)
 
     def get_table_path(self, table_name: str) -> str:
         return os.path.join(self.base_path, f"{table_name}.tbl")
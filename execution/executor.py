@@ -14,6 +14,7 @@ from planning.planner import Planner
 from execution.planner import PhysicalPlanner
 from execution.context import ExecutionContext
 from execution.physical_plan import ExecutionRow
+from storage.buffer import write_pages
 
 class Executor:
     """
@@ -48,6 +49,21 @@ class Executor:
                 yield row
         finally:
             physical_plan.close()
+            if self.context.buffer_max_age is not None:
+                self._purge_stale_pages()
+
+    def _purge_stale_pages(self) -> None:
+        """
+        At a statement boundary, drop buffer pages idle for longer than
+        context.buffer_max_age and write back the dirty ones.
+        """
+        dirty = self.context.buffer_manager.purge_stale(self.context.buffer_max_age)
+        if not dirty:
+            return
+        # WAL rule: log records reach disk before the pages they describe
+        if self.context.log_manager is not None:
+            self.context.log_manager.flush()
+        write_pages(dirty)
             
     def execute_and_fetchall(self, sql: str) -> List[Dict[str, Any]]:
         """
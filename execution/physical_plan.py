@@ -6,15 +6,17 @@ Nodes implement open(), next(), close().
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any, Iterator
+from typing import Optional, List, Dict, Any, Iterator, Callable
 import heapq
+import operator
 
-from storage.table import TableFile
+from storage.table import TableFile, PageFilter
 from storage.page import RID
 from storage.types import DataType
 from storage.serializer import serialize_row
 from storage.schema import Schema, Column
 from parser.ast_nodes import Expression, OrderItem, Assignment
+from parser.tokenizer import TokenType
 from execution.expression_evaluator import ExpressionEvaluator, RowValues
 
 # Row Structure Contract
@@ -69,16 +71,98 @@ def _acquire_lock(ctx, table_name: str, lock_type):
             raise RuntimeError(
                 f"Transaction {ctx.active_txn_id} aborted (deadlock victim)")
 
+# Comparison operators a scan can evaluate directly on the raw row tuple
+_SCAN_FILTER_OPS = {
+    TokenType.EQ: operator.eq,
+    TokenType.LT: operator.lt,
+    TokenType.GT: operator.gt,
+    TokenType.LTE: operator.le,
+    TokenType.GTE: operator.ge,
+}
+
+ScanFilter = Callable[[List[Any]], bool]
+
+# Whether some value in [lo, hi] can satisfy 'value OP literal'
+_PAGE_FILTER_TESTS = {
+    TokenType.EQ: lambda lo, hi, lit: lo <= lit <= hi,
+    TokenType.LT: lambda lo, hi, lit: lo < lit,
+    TokenType.GT: lambda lo, hi, lit: hi > lit,
+    TokenType.LTE: lambda lo, hi, lit: lo <= lit,
+    TokenType.GTE: lambda lo, hi, lit: hi >= lit,
+}
+
+
+def compile_scan_filter(col_idx: int, op: TokenType, literal: Any) -> Optional[ScanFilter]:
+    """
+    Compile 'column OP literal' into a closure over the raw row tuple.
+
+    Semantics match ExpressionEvaluator + FilterExec (3VL: only TRUE passes,
+    NULL on either side is UNKNOWN), but the check runs before the row is
+    materialized as a dict, so rejected rows never build one.
+    Returns None if the operator is not supported.
+    """
+    cmp = _SCAN_FILTER_OPS.get(op)
+    if cmp is None:
+        return None
+    if literal is None:
+        return lambda row: False  # col OP NULL is always UNKNOWN
+
+    def scan_filter(row: List[Any]) -> bool:
+        val = row[col_idx]
+        return val is not None and cmp(val, literal) is True
+
+    return scan_filter
+
+
+def compile_page_filter(op: TokenType, literal: Any) -> Optional[PageFilter]:
+    """
+    Compile 'column OP literal' into a page-pruning test for TableFile.scan.
+
+    The result gets the (min, max) of a page's non-NULL column values and
+    returns False only when no value in that range can satisfy the
+    comparison. Incomparable types never prune; the row filter decides.
+    Returns None if the operator is not supported.
+    """
+    can_match = _PAGE_FILTER_TESTS.get(op)
+    if can_match is None:
+        return None
+    if literal is None:
+        return lambda lo, hi: False
+
+    def page_filter(lo: Any, hi: Any) -> bool:
+        try:
+            return can_match(lo, hi, literal) is True
+        except TypeError:
+            return True
+
+    return page_filter
+
+
 class SeqScanExec(PhysicalNode):
-    """Sequential scan of a table."""
+    """
+    Sequential scan of a table.
+
+    If the planner pushed down a simple 'column OP literal' predicate,
+    scan_filter is applied to each raw tuple before it is mapped to a dict,
+    and page_filter lets the table skip pages whose range for that column
+    (filter_column) cannot match.
+    """
     def __init__(self, table: TableFile, schema: Schema, alias: Optional[str] = None,
-                 ctx=None, table_name: str = ""):
+                 ctx=None, table_name: str = "",
+                 predicate: Optional[Expression] = None,
+                 scan_filter: Optional[ScanFilter] = None,
+                 page_filter: Optional[PageFilter] = None,
+                 filter_column: int = 0):
         super().__init__()
         self.table = table
         self.schema = schema
         self.alias = alias
         self._ctx = ctx
         self._table_name = table_name
+        self.predicate = predicate        # For EXPLAIN only
+        self._scan_filter = scan_filter
+        self._page_filter = page_filter
+        self._filter_column = filter_column
         self._iterator: Optional[Iterator[tuple[RID, List[Any]]]] = None
         
         # Pre-compute column names for performance
@@ -90,11 +174,17 @@ class SeqScanExec(PhysicalNode):
         if self._ctx and self._table_name:
             from concurrency.lock_manager import LockType
             _acquire_lock(self._ctx, self._table_name, LockType.SHARED)
-        self._iterator = self.table.scan()
+        if self._page_filter is not None:
+            self._iterator = self.table.scan(self._page_filter, self._filter_column)
+        else:
+            self._iterator = self.table.scan()
 
     def next(self) -> Optional[ExecutionRow]:
         try:
             rid, row_tuple = next(self._iterator)
+            if self._scan_filter is not None:
+                while not self._scan_filter(row_tuple):
+                    rid, row_tuple = next(self._iterator)
             # Map tuple to dict using schema
             # Handle aliases if needed? 
             # If alias is present, do we rename columns to "alias.col"?
@@ -130,7 +220,8 @@ class IndexScanExec(PhysicalNode):
                  low_inclusive: bool = True, high_inclusive: bool = True,
                  residual_predicate: Optional[Expression] = None,
                  alias: Optional[str] = None,
-                 ctx=None, table_name: str = "", index_name: str = ""):
+                 ctx=None, table_name: str = "", index_name: str = "",
+                 limit: Optional[int] = None):
         super().__init__()
         self.table = table
         self.schema = schema
@@ -147,6 +238,9 @@ class IndexScanExec(PhysicalNode):
         self.index_name = index_name
         self.residual_predicate = residual_predicate
         self.alias = alias
+        # Pushed-down LIMIT: stop pulling RIDs once this many rows are out
+        self.limit = limit
+        self._emitted = 0
         self._rid_iter = None
         self._col_names = [col.name for col in schema.columns]
         self._evaluator = ExpressionEvaluator()
@@ -157,21 +251,26 @@ class IndexScanExec(PhysicalNode):
         if self._ctx and self._table_name:
             from concurrency.lock_manager import LockType
             _acquire_lock(self._ctx, self._table_name, LockType.SHARED)
-        if self.scan_type == 'eq':
+        self._emitted = 0
+        if self.scan_type == 'eq' and self.limit is not None:
+            # Exact match under LIMIT: walk duplicates lazily
+            self._rid_iter = self.btree.range_scan_rids(
+                low=self.eq_key, high=self.eq_key)
+        elif self.scan_type == 'eq':
             # Exact match: get list of RIDs
             rids = self.btree.search(self.eq_key)
             self._rid_iter = iter(rids)
         else:
-            # Range scan: get iterator of (key, RID)
-            self._rid_iter = (
-                rid for _, rid in self.btree.range_scan(
-                    low=self.low_key, high=self.high_key,
-                    low_inclusive=self.low_inclusive,
-                    high_inclusive=self.high_inclusive,
-                )
+            # Range scan: RIDs only, keys stay encoded
+            self._rid_iter = self.btree.range_scan_rids(
+                low=self.low_key, high=self.high_key,
+                low_inclusive=self.low_inclusive,
+                high_inclusive=self.high_inclusive,
             )
 
     def next(self) -> Optional['ExecutionRow']:
+        if self.limit is not None and self._emitted >= self.limit:
+            return None
         while True:
             try:
                 rid = next(self._rid_iter)
@@ -192,6 +291,7 @@ class IndexScanExec(PhysicalNode):
                 if result is not True:
                     continue
 
+            self._emitted += 1
             return row
 
     def close(self):
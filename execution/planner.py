@@ -18,7 +18,8 @@ from planning.logical_plan import (
 )
 from execution.physical_plan import (
     PhysicalNode, SeqScanExec, IndexScanExec, FilterExec, ProjectExec,
-    SortExec, LimitExec, ValuesExec, InsertExec, UpdateExec, DeleteExec, DDLExec
+    SortExec, LimitExec, ValuesExec, InsertExec, UpdateExec, DeleteExec, DDLExec,
+    compile_scan_filter, compile_page_filter,
 )
 from execution.context import ExecutionContext
 from storage.table import TableFile
@@ -98,6 +99,11 @@ class PhysicalPlanner:
             if index_plan is not None:
                 return index_plan
 
+            # No index: push a simple predicate down into the SeqScan
+            scan_plan = self._try_filtered_scan(node.child, node.condition)
+            if scan_plan is not None:
+                return scan_plan
+
         # Fallback: standard filter
         return FilterExec(self.plan(node.child), node.condition)
 
@@ -108,7 +114,22 @@ class PhysicalPlanner:
         return SortExec(self.plan(node.child), node.order_by)
         
     def _plan_limit(self, node: LogicalLimit) -> PhysicalNode:
-        return LimitExec(self.plan(node.child), node.limit_expr)
+        child = self.plan(node.child)
+        self._push_down_limit(child, node.limit_expr)
+        return LimitExec(child, node.limit_expr)
+
+    def _push_down_limit(self, node: PhysicalNode, limit_expr: Expression) -> None:
+        """
+        Hand a constant LIMIT to an IndexScanExec directly below the
+        projection, so the index walk stops instead of reading later leaves.
+        LimitExec stays on top; anything reordering rows blocks the push.
+        """
+        if not (isinstance(limit_expr, Literal) and type(limit_expr.value) is int):
+            return
+        while isinstance(node, ProjectExec):
+            node = node.child
+        if isinstance(node, IndexScanExec):
+            node.limit = max(0, limit_expr.value)
 
     def _plan_values(self, node: LogicalValues) -> PhysicalNode:
         return ValuesExec(node.rows, node.columns)
@@ -153,6 +174,45 @@ class PhysicalPlanner:
         
         return DDLExec(self.context.catalog, node.table_name, schema, path, self.context.buffer_manager)
 
+    # ─── Predicate Pushdown ─────────────────────────────────────────
+
+    def _try_filtered_scan(self, scan_node: LogicalScan,
+                           predicate: Expression) -> Optional[PhysicalNode]:
+        """
+        Attempt to evaluate a Filter(Scan(...), predicate) inside the SeqScan.
+
+        Only 'column OP literal' predicates qualify. The column must match a
+        schema column exactly (the evaluator's lookup is case-sensitive), so
+        anything it would reject at runtime still goes through FilterExec.
+        Returns a SeqScanExec with a compiled scan filter, or None.
+        """
+        col_name, op, literal_val = self._extract_indexable_predicate(predicate)
+        if col_name is None:
+            return None
+
+        schema = self.context.catalog.get_table_schema(scan_node.table_name)
+        if not schema:
+            return None
+        col_names = [col.name for col in schema.columns]
+        if col_name not in col_names:
+            return None
+
+        col_idx = col_names.index(col_name)
+        scan_filter = compile_scan_filter(col_idx, op, literal_val)
+        if scan_filter is None:
+            return None
+
+        file_path = self.context.get_table_path(scan_node.table_name)
+        table = TableFile(file_path, self.context.buffer_manager)
+        if os.path.exists(file_path):
+            table.open()
+
+        return SeqScanExec(table, schema, scan_node.alias,
+                           ctx=self.context, table_name=scan_node.table_name,
+                           predicate=predicate, scan_filter=scan_filter,
+                           page_filter=compile_page_filter(op, literal_val),
+                           filter_column=col_idx)
+
     # ─── Index Selection Logic ──────────────────────────────────────
 
     def _try_index_scan(self, scan_node: LogicalScan,
@@ -24,12 +24,14 @@ Delete: not implemented (Phase 5 scope).
 
 import json
 import struct
-from typing import Any, Iterator, List, Optional, Tuple
+from operator import attrgetter
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 
 from storage.page import Page, PAGE_SIZE, RID
-from storage.buffer import BufferManager
+from storage.buffer import BufferManager, PageHint
 from storage.types import DataType
-from indexing.key_encoding import encode_key, decode_key, fixed_key_size
+from indexing.key_encoding import make_encoder, make_decoder, fixed_key_size
 
 import os
 
@@ -48,6 +50,7 @@ NODE_HEADER_SIZE = 7  # bytes
 
 # RID is 6 bytes (page_id: 4B, slot_id: 2B)
 RID_SIZE = 6
+_RID_STRUCT = struct.Struct(">IH")
 # Child pointer is 4 bytes (page_id)
 CHILD_PTR_SIZE = 4
 
@@ -57,6 +60,14 @@ CHILD_PTR_SIZE = 4
 # Practical max tuple size ~ PAGE_SIZE - 100 (conservative)
 MAX_NODE_PAYLOAD = PAGE_SIZE - 200
 
+# Bulk load packs leaves to this share of MAX_NODE_PAYLOAD, leaving room
+# for later inserts before the first split (cf. PostgreSQL fillfactor 90).
+BULK_LOAD_LEAF_FILL = 0.9
+
+# Duplicate-key tiebreak. Same order as comparing RID.to_bytes(), since the
+# big-endian (page_id, slot_id) encoding sorts like the integer tuple.
+_rid_order = attrgetter('page_id', 'slot_id')
+
 
 # ─── Node Serialization ────────────────────────────────────────────────────
 
@@ -129,16 +140,14 @@ class BTreeNode:
             node.keys.append(bytes(data[offset:offset + klen]))
             offset += klen
 
-        # Pointers
+        # Pointers: fixed-width and contiguous, so unpack them in bulk
         if node.is_leaf:
-            for _ in range(key_count):
-                rid = RID.from_bytes(data, offset)
-                node.rids.append(rid)
-                offset += RID_SIZE
+            end = offset + key_count * RID_SIZE
+            node.rids = [RID(page_id, slot_id) for page_id, slot_id
+                         in _RID_STRUCT.iter_unpack(data[offset:end])]
         else:
-            for _ in range(key_count + 1):
-                child = struct.unpack_from(">I", data, offset)[0]; offset += 4
-                node.children.append(child)
+            node.children = list(
+                struct.unpack_from(f">{key_count + 1}I", data, offset))
 
         return node
 
@@ -147,21 +156,19 @@ class BTreeNode:
         Find insertion position maintaining sorted order.
         For duplicate keys, uses RID as tiebreaker for deterministic ordering.
         """
-        for i, k in enumerate(self.keys):
-            if key_bytes < k:
-                return i
-            if key_bytes == k and rid is not None and self.is_leaf:
-                # Tiebreak by RID for deterministic duplicate ordering
-                if rid.to_bytes() < self.rids[i].to_bytes():
-                    return i
-        return len(self.keys)
+        keys = self.keys
+        pos = bisect_right(keys, key_bytes)
+        if rid is None or not self.is_leaf:
+            return pos
+        lo = bisect_left(keys, key_bytes, 0, pos)
+        if lo == pos:
+            return pos
+        # Duplicates occupy keys[lo:pos]; place rid after equal-or-smaller RIDs
+        return bisect_right(self.rids, _rid_order(rid), lo, pos, key=_rid_order)
 
     def find_key_pos(self, key_bytes: bytes) -> int:
         """Find position of first key >= key_bytes (for search/range scan start)."""
-        for i, k in enumerate(self.keys):
-            if k >= key_bytes:
-                return i
-        return len(self.keys)
+        return bisect_left(self.keys, key_bytes)
 
 
 # ─── B-Tree ────────────────────────────────────────────────────────────────
@@ -186,6 +193,8 @@ class BTree:
         self._buffer = buffer_mgr
         self._root_page: int = 0
         self._key_type: DataType = DataType.INT
+        self._encode = make_encoder(self._key_type)
+        self._decode = make_decoder(self._key_type)
         self._table_name: str = ""
         self._column_name: str = ""
         self._next_page: int = 0
@@ -214,7 +223,7 @@ class BTree:
         bt = cls(file_path, buffer_mgr)
         bt._table_name = table_name
         bt._column_name = column_name
-        bt._key_type = key_type
+        bt._bind_key_type(key_type)
 
         # Page 0: metadata
         meta = {
@@ -243,7 +252,7 @@ class BTree:
             f.write(root_page.to_bytes())
 
         # Cache
-        bt._buffer.put_page(bt._file_path, 0, meta_page)
+        bt._buffer.put_page(bt._file_path, 0, meta_page, hint=PageHint.META)
         bt._buffer.put_page(bt._file_path, 1, root_page)
 
         bt._root_page = 1
@@ -263,6 +272,7 @@ class BTree:
 
         # Read metadata page
         meta_page = bt._read_page(0)
+        buffer_mgr.set_hint(bt._file_path, 0, PageHint.META)
         tuples = meta_page.get_all_tuples()
         if not tuples:
             raise ValueError("Corrupted index file: no metadata")
@@ -275,7 +285,7 @@ class BTree:
 
         bt._table_name = meta["table_name"]
         bt._column_name = meta["column_name"]
-        bt._key_type = DataType(meta["key_type"])
+        bt._bind_key_type(DataType(meta["key_type"]))
         bt._root_page = meta["root_page"]
         bt._next_page = meta["next_page"]
         bt._entry_count = meta.get("entry_count", 0)
@@ -290,6 +300,12 @@ class BTree:
         bt._is_open = True
         return bt
 
+    def _bind_key_type(self, key_type: DataType) -> None:
+        """Set the key type and its specialized key encoder/decoder."""
+        self._key_type = key_type
+        self._encode = make_encoder(key_type)
+        self._decode = make_decoder(key_type)
+
     def close(self) -> None:
         """Flush metadata and all dirty pages, then close."""
         if not self._is_open:
@@ -314,20 +330,17 @@ class BTree:
         Follows leaf sibling chain for duplicates that span leaves.
         """
         self._ensure_open()
-        key_bytes = encode_key(key, self._key_type)
+        key_bytes = self._encode(key)
         leaf = self._find_leaf(key_bytes)
 
         results: List[RID] = []
         while leaf is not None:
-            found_in_leaf = False
-            for i, k in enumerate(leaf.keys):
-                if k == key_bytes:
-                    results.append(leaf.rids[i])
-                    found_in_leaf = True
-                elif k > key_bytes:
-                    return results
+            keys = leaf.keys
+            start = bisect_left(keys, key_bytes)
+            end = bisect_right(keys, key_bytes, start)
+            results.extend(leaf.rids[start:end])
             # If we found matches and there might be more in next leaf
-            if found_in_leaf and leaf.right_sibling != 0:
+            if start < end and end == len(keys) and leaf.right_sibling != 0:
                 leaf = self._read_node(leaf.right_sibling)
             else:
                 break
@@ -342,10 +355,55 @@ class BTree:
         - low=None means unbounded below (start from leftmost leaf).
         - high=None means unbounded above (scan to end).
         """
+        decode = self._decode
+        for leaf, start, end in self._leaf_slices(low, high, low_inclusive,
+                                                  high_inclusive):
+            keys = leaf.keys
+            rids = leaf.rids
+            for i in range(start, end):
+                yield decode(keys[i], 0)[0], rids[i]
+
+    def range_scan_rids(self, low: Any = None, high: Any = None,
+                        low_inclusive: bool = True,
+                        high_inclusive: bool = True) -> Iterator[RID]:
+        """
+        Range scan yielding only RIDs, in key order.
+        Keys are compared as encoded bytes and never decoded.
+        """
+        for leaf, start, end in self._leaf_slices(low, high, low_inclusive,
+                                                  high_inclusive):
+            yield from leaf.rids[start:end]
+
+    def range_scan_columns(self, low: Any = None, high: Any = None,
+                           low_inclusive: bool = True,
+                           high_inclusive: bool = True
+                           ) -> Tuple[List[Any], List[RID]]:
+        """
+        Range scan returning parallel (keys, rids) lists.
+
+        Same bounds semantics as range_scan(), but each leaf contributes
+        one slice per column instead of one tuple per entry.
+        """
+        decode = self._decode
+        keys_out: List[Any] = []
+        rids_out: List[RID] = []
+        for leaf, start, end in self._leaf_slices(low, high, low_inclusive,
+                                                  high_inclusive):
+            keys_out.extend(decode(k, 0)[0] for k in leaf.keys[start:end])
+            rids_out.extend(leaf.rids[start:end])
+        return keys_out, rids_out
+
+    def _leaf_slices(self, low: Any, high: Any, low_inclusive: bool,
+                     high_inclusive: bool
+                     ) -> Iterator[Tuple[BTreeNode, int, int]]:
+        """
+        Yield (leaf, start, end) for each leaf overlapping the range.
+        Bounds within a leaf are located by bisection on its sorted keys.
+        """
         self._ensure_open()
 
-        low_bytes = encode_key(low, self._key_type) if low is not None else None
-        high_bytes = encode_key(high, self._key_type) if high is not None else None
+        low_bytes = self._encode(low) if low is not None else None
+        high_bytes = self._encode(high) if high is not None else None
 
         # Find starting leaf
         if low_bytes is not None:
@@ -354,28 +412,24 @@ class BTree:
             leaf = self._find_leftmost_leaf()
 
         while leaf is not None:
-            for i, k in enumerate(leaf.keys):
-                # Check low bound
-                if low_bytes is not None:
-                    if low_inclusive:
-                        if k < low_bytes:
-                            continue
-                    else:
-                        if k <= low_bytes:
-                            continue
-
-                # Check high bound
-                if high_bytes is not None:
-                    if high_inclusive:
-                        if k > high_bytes:
-                            return
-                    else:
-                        if k >= high_bytes:
-                            return
-
-                # Decode and yield
-                val, _ = decode_key(k, 0, self._key_type)
-                yield val, leaf.rids[i]
+            keys = leaf.keys
+            start = 0
+            if low_bytes is not None:
+                if low_inclusive:
+                    start = bisect_left(keys, low_bytes)
+                else:
+                    start = bisect_right(keys, low_bytes)
+            end = len(keys)
+            if high_bytes is not None:
+                if high_inclusive:
+                    end = bisect_right(keys, high_bytes, start)
+                else:
+                    end = bisect_left(keys, high_bytes, start)
+
+            if start < end:
+                yield leaf, start, end
+            if end < len(keys):
+                return  # high bound reached inside this leaf
 
             # Follow sibling chain
             if leaf.right_sibling != 0:
@@ -391,7 +445,7 @@ class BTree:
         Handles node splits and root splits automatically.
         """
         self._ensure_open()
-        key_bytes = encode_key(key, self._key_type)
+        key_bytes = self._encode(key)
         result = self._insert_recursive(self._root_page, key_bytes, rid)
         self._entry_count += 1
 
@@ -464,6 +518,133 @@ class BTree:
         self._write_node(node)
         return None
 
+    # ─── Bulk Load ──────────────────────────────────────────────────
+
+    def bulk_load(self, entries: Iterable[Tuple[Any, RID]]) -> int:
+        """
+        Build an empty tree bottom-up from (key, RID) pairs in any order.
+
+        Entries are encoded and sorted once, packed into leaves left to
+        right, then internal levels are built over them until one root
+        remains. Pages are written to the file sequentially, bypassing
+        per-insert descent and splits. Returns the number of entries loaded.
+        """
+        self._ensure_open()
+        if self._entry_count != 0 or self._tree_height != 1:
+            raise ValueError("bulk_load requires an empty index")
+
+        encode = self._encode
+        items = [(encode(key), rid) for key, rid in entries]
+        if not items:
+            return 0
+        items.sort(key=lambda item: (item[0], item[1].page_id, item[1].slot_id))
+
+        # Leaf level: the empty root leaf (page 1) becomes the first leaf
+        leaves = self._pack_leaves(items)
+        first_page = self._root_page
+        nodes: List[BTreeNode] = []
+        for i, leaf in enumerate(leaves):
+            leaf.page_id = first_page if i == 0 else self._alloc_page()
+            if i > 0:
+                nodes[-1].right_sibling = leaf.page_id
+            nodes.append(leaf)
+
+        # Internal levels: (min_key, page_id) of each node on the level below
+        level = [(node.keys[0], node.page_id) for node in nodes]
+        height = 1
+        while len(level) > 1:
+            parents = self._pack_internal(level)
+            for _, node in parents:
+                node.page_id = self._alloc_page()
+                nodes.append(node)
+            level = [(min_key, node.page_id) for min_key, node in parents]
+            height += 1
+
+        # Pages are contiguous from first_page, so write them in one pass
+        nodes.sort(key=lambda node: node.page_id)
+        blob = bytearray()
+        for node in nodes:
+            page = Page(page_id=node.page_id)
+            page.insert_tuple(node.serialize())
+            blob += page.to_buffer()
+        self._buffer.invalidate(self._file_path, first_page)
+        with open(self._file_path, "r+b") as f:
+            f.seek(first_page * PAGE_SIZE)
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._root_page = level[0][1]
+        self._tree_height = height
+        self._entry_count = len(items)
+        self._write_metadata()
+        return len(items)
+
+    @staticmethod
+    def _pack_leaves(items: List[Tuple[bytes, RID]]) -> List[BTreeNode]:
+        """
+        Cut sorted entries into leaves of at most BULK_LOAD_LEAF_FILL.
+        A cut is moved back to the start of a run of equal keys when
+        possible, so duplicates stay in one leaf like insert() keeps them.
+        """
+        budget = int(MAX_NODE_PAYLOAD * BULK_LOAD_LEAF_FILL)
+        leaves: List[BTreeNode] = []
+        start = 0
+        n = len(items)
+        while start < n:
+            size = NODE_HEADER_SIZE
+            end = start
+            while end < n:
+                entry_size = 2 + len(items[end][0]) + RID_SIZE
+                if end > start and size + entry_size > budget:
+                    break
+                size += entry_size
+                end += 1
+            if end < n and items[end][0] == items[end - 1][0]:
+                run_start = bisect_left(items, (items[end][0],), start, end)
+                if run_start > start:
+                    end = run_start
+            leaf = BTreeNode(page_id=0, node_type=NODE_TYPE_LEAF)
+            leaf.keys = [key for key, _ in items[start:end]]
+            leaf.rids = [rid for _, rid in items[start:end]]
+            leaves.append(leaf)
+            start = end
+        return leaves
+
+    @staticmethod
+    def _pack_internal(level: List[Tuple[bytes, int]]
+                       ) -> List[Tuple[bytes, BTreeNode]]:
+        """
+        Group one level's (min_key, page_id) pairs under internal nodes.
+        Each child after the first contributes its min key as separator.
+        Returns (min_key, node) for each new parent.
+        """
+        groups: List[List[Tuple[bytes, int]]] = []
+        group: List[Tuple[bytes, int]] = []
+        size = NODE_HEADER_SIZE + CHILD_PTR_SIZE
+        for child in level:
+            if group:
+                entry_size = 2 + len(child[0]) + CHILD_PTR_SIZE
+                if size + entry_size > MAX_NODE_PAYLOAD:
+                    groups.append(group)
+                    group = []
+                    size = NODE_HEADER_SIZE + CHILD_PTR_SIZE
+                else:
+                    size += entry_size
+            group.append(child)
+        groups.append(group)
+        # An internal node needs at least two children
+        if len(groups) > 1 and len(groups[-1]) == 1:
+            groups[-1].insert(0, groups[-2].pop())
+
+        parents: List[Tuple[bytes, BTreeNode]] = []
+        for group in groups:
+            node = BTreeNode(page_id=0, node_type=NODE_TYPE_INTERNAL)
+            node.keys = [min_key for min_key, _ in group[1:]]
+            node.children = [page_id for _, page_id in group]
+            parents.append((group[0][0], node))
+        return parents
+
     # ─── Split ──────────────────────────────────────────────────────
 
     def _split_leaf(self, node: BTreeNode) -> Tuple[bytes, int]:
@@ -539,10 +720,7 @@ class BTree:
         Invariant: left subtree < K, right subtree >= K.
         Returns index into node.children.
         """
-        for i, k in enumerate(node.keys):
-            if key_bytes < k:
-                return i
-        return len(node.keys)
+        return bisect_right(node.keys, key_bytes)
 
     def _find_leaf(self, key_bytes: bytes) -> BTreeNode:
         """Navigate from root to the leaf node that should contain the key."""
@@ -583,13 +761,17 @@ class BTree:
         tuples = page.get_all_tuples()
         if not tuples:
             raise ValueError(f"Empty node page {page_id}")
-        return BTreeNode.deserialize(page_id, tuples[0][1])
+        node = BTreeNode.deserialize(page_id, tuples[0][1])
+        if not node.is_leaf:
+            self._buffer.set_hint(self._file_path, page_id, PageHint.INTERNAL)
+        return node
 
     def _write_node(self, node: BTreeNode) -> None:
         """Serialize and write a B-Tree node to its page."""
         page = Page(page_id=node.page_id)
         page.insert_tuple(node.serialize())
-        self._buffer.put_page(self._file_path, node.page_id, page)
+        hint = PageHint.DATA if node.is_leaf else PageHint.INTERNAL
+        self._buffer.put_page(self._file_path, node.page_id, page, hint=hint)
         self._buffer.mark_dirty(self._file_path, node.page_id)
 
     def _alloc_page(self) -> int:
@@ -614,7 +796,7 @@ class BTree:
         meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
         meta_page = Page(page_id=0)
         meta_page.insert_tuple(meta_bytes)
-        self._buffer.put_page(self._file_path, 0, meta_page)
+        self._buffer.put_page(self._file_path, 0, meta_page, hint=PageHint.META)
         self._buffer.mark_dirty(self._file_path, 0)
 
     def _flush(self) -> None:
@@ -635,7 +817,7 @@ class BTree:
             with open(self._file_path, "r+b") as f:
                 for page_id, page in dirty_pages:
                     f.seek(page_id * PAGE_SIZE)
-                    f.write(page.to_bytes())
+                    f.write(page.to_buffer())
                 f.flush()
                 os.fsync(f.fileno())
 
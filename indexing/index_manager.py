@@ -26,7 +26,8 @@ def build_index(catalog: Catalog, table_file: TableFile,
 
     1. Registers the index in the Catalog.
     2. Scans the table for all non-NULL values in the target column.
-    3. Inserts each (key, RID) pair into the B-Tree.
+    3. Bulk-loads the (key, RID) pairs into the B-Tree (sorted once,
+       built bottom-up).
     4. Flushes the index to disk.
 
     Returns the open BTree handle.
@@ -54,10 +55,9 @@ def build_index(catalog: Catalog, table_file: TableFile,
     # Create the B-Tree
     btree = BTree.create(idx_path, table_name, column_name, col_type, buffer_mgr)
 
-    # Scan table and insert all non-NULL keys
-    count = 0
-    for rid, row in table_file.scan():
-        value = row[col_idx]
+    # Scan only the indexed column, collect non-NULL keys, load in one pass
+    entries = []
+    for rid, value in table_file.scan_column(col_idx):
         if value is None:
             continue  # NULLs not indexed
         # Reject NaN floats
@@ -65,8 +65,8 @@ def build_index(catalog: Catalog, table_file: TableFile,
             import math
             if math.isnan(value):
                 continue
-        btree.insert(value, rid)
-        count += 1
+        entries.append((value, rid))
+    btree.bulk_load(entries)
 
     # Flush
     btree.close()
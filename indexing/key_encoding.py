@@ -22,7 +22,7 @@ Concurrency: single-writer assumed.
 import math
 import struct
 from datetime import date, datetime
-from typing import Any, Tuple
+from typing import Any, Callable, Dict, Tuple
 
 from storage.types import DataType
 
@@ -30,9 +30,24 @@ from storage.types import DataType
 # ─── Epoch for DATE ─────────────────────────────────────────────────────────
 _DATE_EPOCH = date(1970, 1, 1)
 
+# ─── FLOAT bit transform ────────────────────────────────────────────────────
+_DOUBLE = struct.Struct(">d")
+_UINT64 = struct.Struct(">Q")
+_SIGN_BIT = 0x8000000000000000
+_ALL_BITS = 0xFFFFFFFFFFFFFFFF
+
+# ─── INT bias ───────────────────────────────────────────────────────────────
+# Flipping the int32 sign bit == adding 2^31 and storing unsigned.
+_UINT32 = struct.Struct(">I")
+_INT32_BIAS = 0x80000000
+
 
 # ─── Encode ─────────────────────────────────────────────────────────────────
 
+KeyEncoder = Callable[[Any], bytes]
+KeyDecoder = Callable[[bytes, int], Tuple[Any, int]]
+
+
 def encode_key(value: Any, dtype: DataType) -> bytes:
     """
     Encode a Python value to an order-preserving binary key.
@@ -42,32 +57,57 @@ def encode_key(value: Any, dtype: DataType) -> bytes:
     """
     if value is None:
         raise ValueError("NULL values cannot be indexed")
+    return make_encoder(dtype)(value)
+
+
+def make_encoder(dtype: DataType) -> KeyEncoder:
+    """
+    Return the encoder for one key type, so callers with a fixed type
+    (a B-Tree over one column) skip the per-call type dispatch.
+    The returned function applies the same NULL/NaN checks as encode_key.
+    """
+    encoder = _ENCODERS.get(dtype)
+    if encoder is None:
+        raise ValueError(f"Unsupported key type: {dtype}")
+    return encoder
+
+
+def _encode_int_key(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("NULL values cannot be indexed")
+    return _encode_int(int(value))
 
-    if dtype == DataType.INT:
-        return _encode_int(int(value))
 
-    elif dtype == DataType.FLOAT:
-        fval = float(value)
-        if math.isnan(fval):
-            raise ValueError("NaN values cannot be indexed")
-        # Normalize -0.0 to +0.0
-        if fval == 0.0:
-            fval = 0.0
-        return _encode_float(fval)
+def _encode_float_key(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("NULL values cannot be indexed")
+    fval = float(value)
+    if math.isnan(fval):
+        raise ValueError("NaN values cannot be indexed")
+    # Normalize -0.0 to +0.0
+    if fval == 0.0:
+        fval = 0.0
+    return _encode_float(fval)
+
+
+def _encode_string_key(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("NULL values cannot be indexed")
+    return _encode_string(str(value))
 
-    elif dtype == DataType.STRING:
-        return _encode_string(str(value))
 
-    elif dtype == DataType.BOOLEAN:
-        return b"\x01" if value else b"\x00"
+def _encode_boolean_key(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("NULL values cannot be indexed")
+    return b"\x01" if value else b"\x00"
 
-    elif dtype == DataType.DATE:
-        if isinstance(value, str):
-            value = datetime.strptime(value, "%Y-%m-%d").date()
-        days = (value - _DATE_EPOCH).days
-        return _encode_int(days)
 
-    raise ValueError(f"Unsupported key type: {dtype}")
+def _encode_date_key(value: Any) -> bytes:
+    if value is None:
+        raise ValueError("NULL values cannot be indexed")
+    if isinstance(value, str):
+        value = datetime.strptime(value, "%Y-%m-%d").date()
+    return _encode_int((value - _DATE_EPOCH).days)
 
 
 def _encode_int(val: int) -> bytes:
@@ -76,28 +116,23 @@ def _encode_int(val: int) -> bytes:
     This maps: MIN_INT → 0x00000000, 0 → 0x80000000, MAX_INT → 0xFFFFFFFF.
     Binary order == numeric order.
     """
-    raw = struct.pack(">i", val)
-    # XOR the sign bit (first byte, bit 7)
-    return bytes([raw[0] ^ 0x80, raw[1], raw[2], raw[3]])
+    # Biasing by 2^31 is the sign-bit XOR; out-of-range values still
+    # raise struct.error as with a plain ">i" pack.
+    return _UINT32.pack(val + _INT32_BIAS)
 
 
 def _encode_float(val: float) -> bytes:
     """
     FLOAT encoding: IEEE 754 sortable transform.
-    1. Pack as big-endian double (8 bytes).
+    1. Reinterpret the big-endian double as a uint64.
     2. If positive (sign bit 0): flip sign bit → positives sort after negatives.
     3. If negative (sign bit 1): flip ALL bits → negatives sort correctly
        (more negative = smaller binary value).
+    Steps 2-3 are one XOR with a mask derived from the sign bit.
     """
-    raw = bytearray(struct.pack(">d", val))
-    if raw[0] & 0x80:
-        # Negative: flip all bits
-        for i in range(8):
-            raw[i] ^= 0xFF
-    else:
-        # Positive (or +0): flip sign bit only
-        raw[0] ^= 0x80
-    return bytes(raw)
+    bits = _UINT64.unpack(_DOUBLE.pack(val))[0]
+    bits ^= ((bits >> 63) * _ALL_BITS) | _SIGN_BIT
+    return _UINT64.pack(bits)
 
 
 def _encode_string(val: str) -> bytes:
@@ -108,17 +143,9 @@ def _encode_string(val: str) -> bytes:
     This preserves lexicographic order under memcmp.
     """
     utf8 = val.encode("utf-8")
-    result = bytearray()
-    for b in utf8:
-        if b == 0x00:
-            result.append(0x00)
-            result.append(0x01)
-        else:
-            result.append(b)
-    # Terminator
-    result.append(0x00)
-    result.append(0x00)
-    return bytes(result)
+    if b"\x00" in utf8:
+        utf8 = utf8.replace(b"\x00", b"\x00\x01")
+    return utf8 + b"\x00\x00"
 
 
 # ─── Decode ─────────────────────────────────────────────────────────────────
@@ -128,49 +155,37 @@ def decode_key(data: bytes, offset: int, dtype: DataType) -> Tuple[Any, int]:
     Decode a key from binary at the given offset.
     Returns (value, new_offset).
     """
-    if dtype == DataType.INT:
-        val, new_off = _decode_int(data, offset)
-        return val, new_off
+    return make_decoder(dtype)(data, offset)
+
 
-    elif dtype == DataType.FLOAT:
-        val, new_off = _decode_float(data, offset)
-        return val, new_off
+def make_decoder(dtype: DataType) -> KeyDecoder:
+    """Return the decoder for one key type (see make_encoder)."""
+    decoder = _DECODERS.get(dtype)
+    if decoder is None:
+        raise ValueError(f"Unsupported key type: {dtype}")
+    return decoder
 
-    elif dtype == DataType.STRING:
-        val, new_off = _decode_string(data, offset)
-        return val, new_off
 
-    elif dtype == DataType.BOOLEAN:
-        return data[offset] != 0, offset + 1
+def _decode_boolean(data: bytes, offset: int) -> Tuple[bool, int]:
+    return data[offset] != 0, offset + 1
 
-    elif dtype == DataType.DATE:
-        days, new_off = _decode_int(data, offset)
-        dt = date.fromordinal(_DATE_EPOCH.toordinal() + days)
-        return dt, new_off
 
-    raise ValueError(f"Unsupported key type: {dtype}")
+def _decode_date(data: bytes, offset: int) -> Tuple[date, int]:
+    days, new_off = _decode_int(data, offset)
+    return date.fromordinal(_DATE_EPOCH.toordinal() + days), new_off
 
 
 def _decode_int(data: bytes, offset: int) -> Tuple[int, int]:
     """Reverse the XOR sign-bit transform and unpack int32."""
-    b = bytearray(data[offset:offset + 4])
-    b[0] ^= 0x80
-    val = struct.unpack(">i", bytes(b))[0]
-    return val, offset + 4
+    return _UINT32.unpack_from(data, offset)[0] - _INT32_BIAS, offset + 4
 
 
 def _decode_float(data: bytes, offset: int) -> Tuple[float, int]:
     """Reverse the IEEE sortable transform and unpack double."""
-    raw = bytearray(data[offset:offset + 8])
-    if raw[0] & 0x80:
-        # Was positive: flip sign bit back
-        raw[0] ^= 0x80
-    else:
-        # Was negative: flip all bits back
-        for i in range(8):
-            raw[i] ^= 0xFF
-    val = struct.unpack(">d", bytes(raw))[0]
-    return val, offset + 8
+    bits = _UINT64.unpack_from(data, offset)[0]
+    # Sign bit set → was positive (flip sign back); clear → flip all back
+    bits ^= ((1 - (bits >> 63)) * _ALL_BITS) | _SIGN_BIT
+    return _DOUBLE.unpack(_UINT64.pack(bits))[0], offset + 8
 
 
 def _decode_string(data: bytes, offset: int) -> Tuple[str, int]:
@@ -179,27 +194,47 @@ def _decode_string(data: bytes, offset: int) -> Tuple[str, int]:
     0x00 0x01 → literal 0x00
     0x00 0x00 → end of string
     """
-    result = bytearray()
+    parts = []
     i = offset
-    while i < len(data):
-        b = data[i]
-        if b == 0x00:
-            # Look at next byte
-            next_b = data[i + 1]
-            if next_b == 0x00:
-                # Terminator
-                i += 2
-                break
-            elif next_b == 0x01:
-                # Escaped null byte
-                result.append(0x00)
-                i += 2
-            else:
-                raise ValueError(f"Invalid escape sequence 0x00 0x{next_b:02X} at offset {i}")
+    while True:
+        z = data.find(b"\x00", i)
+        if z < 0:
+            # Unterminated: take the rest as-is
+            parts.append(data[i:])
+            i = len(data)
+            break
+        parts.append(data[i:z])
+        next_b = data[z + 1]
+        if next_b == 0x00:
+            # Terminator
+            i = z + 2
+            break
+        elif next_b == 0x01:
+            # Escaped null byte
+            parts.append(b"\x00")
+            i = z + 2
         else:
-            result.append(b)
-            i += 1
-    return result.decode("utf-8"), i
+            raise ValueError(f"Invalid escape sequence 0x00 0x{next_b:02X} at offset {z}")
+    return b"".join(parts).decode("utf-8"), i
+
+
+# ─── Dispatch tables ────────────────────────────────────────────────────────
+
+_ENCODERS: Dict[DataType, KeyEncoder] = {
+    DataType.INT: _encode_int_key,
+    DataType.FLOAT: _encode_float_key,
+    DataType.STRING: _encode_string_key,
+    DataType.BOOLEAN: _encode_boolean_key,
+    DataType.DATE: _encode_date_key,
+}
+
+_DECODERS: Dict[DataType, KeyDecoder] = {
+    DataType.INT: _decode_int,
+    DataType.FLOAT: _decode_float,
+    DataType.STRING: _decode_string,
+    DataType.BOOLEAN: _decode_boolean,
+    DataType.DATE: _decode_date,
+}
 
 
 # ─── Key Size ───────────────────────────────────────────────────────────────
@@ -8,22 +8,46 @@ Usage:
 
     ast = parse("SELECT * FROM users")
     print(ast)
+
+Teaching note:
+    The same SQL text is parsed more than once per statement (the CLI
+    inspects it, then the executor plans it), so parse() memoizes ASTs
+    by SQL text. Cached ASTs are shared between callers and must be
+    treated as read-only. Failed parses raise and are never cached.
 """
 
+from functools import lru_cache
+
 from parser.parser import Parser, ParseError
 from parser.tokenizer import Tokenizer, Token, TokenType
 from parser.ast_nodes import Statement
 
+# Tokenizer holds no per-call state; its patterns are compiled at import.
+_TOKENIZER = Tokenizer()
+
+PARSE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(sql: str) -> Statement:
+    return Parser(_TOKENIZER.tokenize(sql)).parse()
+
+
 def parse(sql: str) -> Statement:
     """
     Parse a SQL string into an AST Statement.
     Raises ParseError if syntax is invalid.
+
+    The returned AST may be shared with other callers; do not mutate it.
     """
-    tokenizer = Tokenizer()
-    tokens = tokenizer.tokenize(sql)
-    parser = Parser(tokens)
-    return parser.parse()
+    return _parse_cached(sql)
+
+
+def clear_parse_cache() -> None:
+    """Drop all memoized ASTs."""
+    _parse_cached.cache_clear()
+
 
 def tokenize(sql: str) -> list[Token]:
     """Tokenize SQL string (for debugging)."""
-    return Tokenizer().tokenize(sql)
+    return _TOKENIZER.tokenize(sql)
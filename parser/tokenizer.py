@@ -208,54 +208,61 @@ class Tokenizer:
         (re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*'), TokenType.IDENTIFIER),
     ]
 
+    # All PATTERNS fused into one alternation, tried in the same order.
+    # One regex match per token replaces one match attempt per pattern.
+    _MASTER = re.compile("|".join(
+        f"(?P<t{i}>(?s:{p.pattern}))" if p.flags & re.DOTALL
+        else f"(?P<t{i}>{p.pattern})"
+        for i, (p, _) in enumerate(PATTERNS)
+    ))
+    _GROUP_TYPES = {f"t{i}": token_type
+                    for i, (_, token_type) in enumerate(PATTERNS)}
+
     def tokenize(self, sql: str) -> List[Token]:
         """Tokenize SQL string into a list of Tokens."""
         tokens = []
         pos = 0
         line = 1
         col_start = 0  # position of start of current line in string
-        
-        while pos < len(sql):
-            match = None
-            
-            # Try all regex patterns
-            for pattern, token_type in self.PATTERNS:
-                regex_match = pattern.match(sql, pos)
-                if regex_match:
-                    text = regex_match.group(0)
-                    
-                    if token_type:  # If not skipped (whitespace/comments)
-                        # Handle keywords
-                        if token_type == TokenType.IDENTIFIER and not text.startswith('"'):
-                            upper_text = text.upper()
-                            if upper_text in self.KEYWORDS:
-                                token_type = self.KEYWORDS[upper_text]
-                        
-                        # Handle captured groups for string/quoted identifiers
-                        value = text
-                        if token_type == TokenType.STRING_LIT:
-                            # Unescape '' -> '
-                            value = regex_match.group(1).replace("''", "'")
-                        elif token_type == TokenType.IDENTIFIER and text.startswith('"'):
-                            value = regex_match.group(1)
-                            
-                        # Calculate column
-                        col = pos - col_start + 1
-                        tokens.append(Token(token_type, value, line, col))
-                    
-                    # Advance position
-                    pos += len(text)
-                    
-                    # Update line/col tracking
-                    newlines = text.count('\n')
-                    if newlines > 0:
-                        line += newlines
-                        # New column start is after the last newline
-                        col_start = pos - (len(text) - text.rfind('\n') - 1)
-                    
-                    match = regex_match
-                    break
-            
+        master_match = self._MASTER.match
+        group_types = self._GROUP_TYPES
+        keywords = self.KEYWORDS
+        end = len(sql)
+
+        while pos < end:
+            match = master_match(sql, pos)
+
+            if match:
+                text = match.group(0)
+                # The outer named group closes last, so lastgroup names it
+                token_type = group_types[match.lastgroup]
+
+                if token_type:  # If not skipped (whitespace/comments)
+                    value = text
+                    if token_type == TokenType.IDENTIFIER:
+                        if text[0] == '"':
+                            # Quoted identifier: strip quotes, never a keyword
+                            value = text[1:-1]
+                        else:
+                            token_type = keywords.get(text.upper(), token_type)
+                    elif token_type == TokenType.STRING_LIT:
+                        # Unescape '' -> '
+                        value = text[1:-1].replace("''", "'")
+
+                    # Calculate column
+                    col = pos - col_start + 1
+                    tokens.append(Token(token_type, value, line, col))
+
+                # Advance position
+                pos += len(text)
+
+                # Update line/col tracking
+                newlines = text.count('\n')
+                if newlines > 0:
+                    line += newlines
+                    # New column start is after the last newline
+                    col_start = pos - (len(text) - text.rfind('\n') - 1)
+
             if not match:
                 # Error: unexpected character
                 col = pos - col_start + 1
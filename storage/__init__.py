@@ -11,15 +11,17 @@ Usage:
 from storage.types import DataType, serialize_value, deserialize_value, type_from_string
 from storage.schema import Column, Schema
 from storage.page import Page, RID, PAGE_SIZE, FORMAT_VERSION, MAGIC_BYTES
-from storage.serializer import serialize_row, deserialize_row
-from storage.buffer import BufferManager
-from storage.table import TableFile, get_buffer_manager, reset_buffer_manager
+from storage.serializer import serialize_row, deserialize_row, deserialize_column
+from storage.buffer import BufferManager, EvictionPolicy, PageHint
+from storage.table import (
+    TableFile, ColumnBatch, get_buffer_manager, reset_buffer_manager,
+)
 
 __all__ = [
     "DataType", "serialize_value", "deserialize_value", "type_from_string",
     "Column", "Schema",
     "Page", "RID", "PAGE_SIZE", "FORMAT_VERSION", "MAGIC_BYTES",
-    "serialize_row", "deserialize_row",
-    "BufferManager",
-    "TableFile", "get_buffer_manager", "reset_buffer_manager",
+    "serialize_row", "deserialize_row", "deserialize_column",
+    "BufferManager", "EvictionPolicy", "PageHint",
+    "TableFile", "ColumnBatch", "get_buffer_manager", "reset_buffer_manager",
 ]
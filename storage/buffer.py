@@ -1,31 +1,61 @@
 """
 MiniDB Buffer Manager
 =====================
-In-memory page cache with LRU eviction, pin/unpin, dirty tracking.
+In-memory page cache with CLOCK eviction, pin/unpin, dirty tracking.
 
 Safety guarantees:
   - Single-frame invariant: same (file, page_id) is never loaded twice.
     put_page() updates existing entry if present.
   - Pinned pages cannot be evicted (raises RuntimeError if all pinned).
   - flush_all_and_clear() ensures all dirty pages are returned on shutdown.
-  - Dirty page flush order is deterministic (insertion/access order via OrderedDict).
+  - purge_stale() drops pages idle for too long, returning dirty ones.
+  - Dirty page flush order is deterministic (frame order).
+  - write_pages() writes dirty pages back with one open and one fsync
+    per file.
 
 Teaching note:
   PostgreSQL has a sophisticated shared buffer pool (shared_buffers)
   with clock-sweep eviction. Snowflake doesn't need a traditional buffer
   pool because it uses cloud object storage with local SSD caching.
-  We implement a simple LRU cache that's sufficient for a teaching DB.
+  We use the basic CLOCK policy: pages live in a fixed array of frames,
+  a hit only sets the frame's reference bit, and on eviction a hand
+  sweeps the frames, clearing set bits (a "second chance") and taking
+  the first unreferenced page. Pages enter with the bit clear, so a page
+  touched once (e.g. by a full scan) is evicted before re-used ones.
+  EvictionPolicy.LRU2 instead ranks pages by the time of their
+  second-to-last reference (LRU-2, O'Neil et al.): a page referenced only
+  once has an infinite backward distance and goes first, so a full scan
+  cannot flush a working set that has been touched twice. References that
+  fall within correlated_window ticks of the previous one count as one.
+  Pages can carry a PageHint: B-Tree internal nodes and metadata pages
+  are touched by every lookup, so eviction prefers DATA pages first.
 """
 
-from collections import OrderedDict
-from typing import Optional
+import os
+import time
+from enum import Enum
+from itertools import groupby
+from typing import Iterable, Optional
 
 from storage.page import Page, PAGE_SIZE
 
 
+class PageHint(Enum):
+    """Caller hint about how hot a cached page is."""
+    DATA = "data"           # heap pages and B-Tree leaves (evicted first)
+    INTERNAL = "internal"   # B-Tree internal nodes
+    META = "meta"           # file metadata pages
+
+
+class EvictionPolicy(Enum):
+    """Victim selection policy of a BufferManager."""
+    CLOCK = "clock"   # reference bit + sweeping hand (default)
+    LRU2 = "lru2"     # oldest second-to-last reference first
+
+
 class BufferManager:
     """
-    Page cache with LRU eviction.
+    Page cache with CLOCK eviction.
 
     - Pages are identified by (file_path, page_id) tuples
     - Pin count prevents eviction of pages in active use
@@ -33,73 +63,126 @@ class BufferManager:
     - Single-frame invariant: each (file, page_id) appears at most once
     """
 
-    def __init__(self, capacity: int = 64):
+    def __init__(self, capacity: int = 64,
+                 policy: EvictionPolicy = EvictionPolicy.CLOCK,
+                 correlated_window: int = 0):
         """
         Initialize buffer manager with a maximum number of cached pages.
 
         Args:
             capacity: Max pages to hold in memory (default: 64 = 256KB)
+            policy: Eviction policy (default: CLOCK)
+            correlated_window: LRU2 only — a reference within this many
+                               ticks of the page's last one is not counted
+                               as a new reference
         """
         self._capacity = capacity
-        # OrderedDict gives us LRU ordering: most recently used at the end
-        self._cache: OrderedDict[tuple[str, int], _BufferEntry] = OrderedDict()
+        self._lru2 = policy is EvictionPolicy.LRU2
+        self._correlated_window = correlated_window
+        self._tick = 0  # LRU2 logical clock, advanced on every reference
+        # Frame i holds _keys[i] -> _frames[i]; _ref[i] is its reference bit
+        self._frames: list[Optional[_BufferEntry]] = [None] * capacity
+        self._keys: list[Optional[tuple[str, int]]] = [None] * capacity
+        self._ref = bytearray(capacity)
+        self._index: dict[tuple[str, int], int] = {}
+        # Free frames, popped lowest-first
+        self._free: list[int] = list(range(capacity - 1, -1, -1))
+        self._hand = 0
 
     @property
     def size(self) -> int:
         """Number of pages currently in the cache."""
-        return len(self._cache)
+        return len(self._index)
 
     def get_page(self, file_path: str, page_id: int) -> Optional[Page]:
         """
         Get a page from the cache. Returns None if not cached.
-        Moves the page to the most-recently-used position.
+        Sets the page's reference bit.
         Does NOT pin the page — call pin() separately if needed.
         """
-        key = (file_path, page_id)
-        entry = self._cache.get(key)
-        if entry is None:
+        idx = self._index.get((file_path, page_id))
+        if idx is None:
             return None
-        # Move to end (most recently used)
-        self._cache.move_to_end(key)
+        entry = self._frames[idx]
+        entry.last_used = time.monotonic()
+        if self._lru2:
+            self._reference(entry)
+        else:
+            self._ref[idx] = 1
         return entry.page
 
+    def peek_page(self, file_path: str, page_id: int) -> Optional[Page]:
+        """
+        Like get_page(), but leaves the reference bit and last-used time
+        alone: a page read only to inspect its header is not "in use".
+        """
+        entry = self._entry(file_path, page_id)
+        return None if entry is None else entry.page
+
     def put_page(self, file_path: str, page_id: int, page: Page,
-                 dirty: bool = False) -> Optional[tuple[str, int, Page]]:
+                 dirty: bool = False, hint: PageHint = PageHint.DATA
+                 ) -> Optional[tuple[str, int, Page]]:
         """
         Put a page into the cache (single-frame invariant enforced).
 
         If the key already exists, the entry is UPDATED (not duplicated).
-        If the cache is full, evicts the least-recently-used unpinned page.
+        If the cache is full, the clock hand evicts an unreferenced,
+        unpinned page, preferring DATA pages over INTERNAL/META ones.
 
         Returns:
           The evicted (file_path, page_id, page) if a dirty page was evicted
           (caller must flush it to disk), or None if no dirty eviction happened.
         """
         key = (file_path, page_id)
-        if key in self._cache:
+        idx = self._index.get(key)
+        if idx is not None:
             # Update existing entry — single-frame invariant: no duplicate load
-            entry = self._cache[key]
+            entry = self._frames[idx]
             entry.page = page
             entry.dirty = entry.dirty or dirty
-            self._cache.move_to_end(key)
+            entry.hint = hint
+            entry.last_used = time.monotonic()
+            if self._lru2:
+                self._reference(entry)
+            else:
+                self._ref[idx] = 1
             return None
 
         evicted = None
         # Evict if at capacity
-        if len(self._cache) >= self._capacity:
+        if not self._free:
             evicted = self._evict_one()
 
-        self._cache[key] = _BufferEntry(page=page, dirty=dirty, pin_count=0)
-        self._cache.move_to_end(key)
+        idx = self._free.pop()
+        entry = _BufferEntry(page=page, dirty=dirty, pin_count=0, hint=hint,
+                             last_used=time.monotonic())
+        if self._lru2:
+            self._tick += 1
+            entry.last = self._tick
+        self._frames[idx] = entry
+        self._keys[idx] = key
+        self._ref[idx] = 0
+        self._index[key] = idx
         return evicted
 
+    def _reference(self, entry: "_BufferEntry") -> None:
+        """Record an LRU2 reference, folding correlated ones into the last."""
+        self._tick += 1
+        if self._tick - entry.last > self._correlated_window:
+            entry.prev = entry.last
+        entry.last = self._tick
+
+    def _entry(self, file_path: str, page_id: int) -> Optional["_BufferEntry"]:
+        """Cached entry for (file_path, page_id), without touching its bit."""
+        idx = self._index.get((file_path, page_id))
+        return None if idx is None else self._frames[idx]
+
     def pin(self, file_path: str, page_id: int) -> bool:
         """
         Pin a page to prevent eviction.
         Returns True if the page was found and pinned.
         """
-        key = (file_path, page_id)
-        entry = self._cache.get(key)
+        entry = self._entry(file_path, page_id)
         if entry is None:
             return False
         entry.pin_count += 1
@@ -110,37 +193,42 @@ class BufferManager:
         Unpin a page (decrement pin count).
         Returns True if the page was found and unpinned.
         """
-        key = (file_path, page_id)
-        entry = self._cache.get(key)
+        entry = self._entry(file_path, page_id)
         if entry is None:
             return False
         if entry.pin_count > 0:
             entry.pin_count -= 1
+            if entry.pin_count == 0:
+                entry.last_used = time.monotonic()
         return True
 
+    def set_hint(self, file_path: str, page_id: int, hint: PageHint) -> None:
+        """Change the eviction hint of a cached page."""
+        entry = self._entry(file_path, page_id)
+        if entry is not None:
+            entry.hint = hint
+
     def mark_dirty(self, file_path: str, page_id: int) -> None:
         """Mark a cached page as dirty (needs flushing)."""
-        key = (file_path, page_id)
-        entry = self._cache.get(key)
+        entry = self._entry(file_path, page_id)
         if entry is not None:
             entry.dirty = True
 
     def is_dirty(self, file_path: str, page_id: int) -> bool:
         """Check if a cached page is dirty."""
-        key = (file_path, page_id)
-        entry = self._cache.get(key)
+        entry = self._entry(file_path, page_id)
         return entry.dirty if entry is not None else False
 
     def flush_all(self) -> list[tuple[str, int, Page]]:
         """
         Return all dirty pages that need to be written to disk.
         Clears the dirty flag for each returned page.
-        Order: deterministic (insertion/LRU order from OrderedDict).
+        Order: deterministic (frame order).
         """
         dirty_pages: list[tuple[str, int, Page]] = []
-        for (fp, pid), entry in self._cache.items():
-            if entry.dirty:
-                dirty_pages.append((fp, pid, entry.page))
+        for key, entry in zip(self._keys, self._frames):
+            if entry is not None and entry.dirty:
+                dirty_pages.append((key[0], key[1], entry.page))
                 entry.dirty = False
         return dirty_pages
 
@@ -150,7 +238,13 @@ class BufferManager:
         Must be called before process exit to ensure durability.
         """
         dirty_pages = self.flush_all()
-        self._cache.clear()
+        capacity = self._capacity
+        self._frames = [None] * capacity
+        self._keys = [None] * capacity
+        self._ref = bytearray(capacity)
+        self._index.clear()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._hand = 0
         return dirty_pages
 
     def flush_file(self, file_path: str) -> list[tuple[int, Page]]:
@@ -159,66 +253,206 @@ class BufferManager:
         Clears the dirty flag for each returned page.
         """
         dirty_pages: list[tuple[int, Page]] = []
-        for (fp, pid), entry in self._cache.items():
-            if fp == file_path and entry.dirty:
-                dirty_pages.append((pid, entry.page))
+        for key, entry in zip(self._keys, self._frames):
+            if entry is not None and key[0] == file_path and entry.dirty:
+                dirty_pages.append((key[1], entry.page))
                 entry.dirty = False
         return dirty_pages
 
     def invalidate(self, file_path: str, page_id: int) -> Optional[Page]:
         """Remove a page from the cache. Returns the page if it was dirty."""
-        key = (file_path, page_id)
-        entry = self._cache.pop(key, None)
-        if entry is not None and entry.dirty:
-            return entry.page
-        return None
+        idx = self._index.get((file_path, page_id))
+        if idx is None:
+            return None
+        entry = self._release(idx)
+        return entry.page if entry.dirty else None
 
     def invalidate_file(self, file_path: str) -> list[tuple[int, Page]]:
         """Remove all pages for a file. Returns list of dirty pages."""
         dirty: list[tuple[int, Page]] = []
-        to_remove = [k for k in self._cache if k[0] == file_path]
-        for key in to_remove:
-            entry = self._cache.pop(key)
+        to_remove = [(k[1], i) for k, i in self._index.items()
+                     if k[0] == file_path]
+        for page_id, idx in sorted(to_remove):
+            entry = self._release(idx)
             if entry.dirty:
-                dirty.append((key[1], entry.page))
+                dirty.append((page_id, entry.page))
         return dirty
 
+    def purge_stale(self, max_age: float) -> list[tuple[str, int, Page]]:
+        """
+        Drop every unpinned page not used for more than max_age seconds.
+        Returns the dirty pages among them (caller must flush them to disk).
+        """
+        cutoff = time.monotonic() - max_age
+        dirty: list[tuple[str, int, Page]] = []
+        for idx, entry in enumerate(self._frames):
+            if entry is None or entry.pin_count or entry.last_used > cutoff:
+                continue
+            key = self._keys[idx]
+            self._release(idx)
+            if entry.dirty:
+                dirty.append((key[0], key[1], entry.page))
+        return dirty
+
+    def _release(self, idx: int) -> "_BufferEntry":
+        """Empty frame idx and return the entry it held."""
+        entry = self._frames[idx]
+        del self._index[self._keys[idx]]
+        self._frames[idx] = None
+        self._keys[idx] = None
+        self._ref[idx] = 0
+        self._free.append(idx)
+        return entry
+
     def _evict_one(self) -> Optional[tuple[str, int, Page]]:
         """
-        Evict the least-recently-used unpinned page.
+        Free one frame according to the eviction policy, trying DATA pages
+        before INTERNAL/META pages.
         Returns (file_path, page_id, page) if the evicted page was dirty.
         Raises RuntimeError if all pages are pinned.
         """
-        for key in list(self._cache.keys()):
-            entry = self._cache[key]
-            if entry.pin_count == 0:
-                self._cache.pop(key)
-                if entry.dirty:
-                    return (key[0], key[1], entry.page)
-                return None
+        victim = self._lru2_victim() if self._lru2 else self._clock_victim()
+        if victim is not None:
+            key = self._keys[victim]
+            entry = self._release(victim)
+            if entry.dirty:
+                return (key[0], key[1], entry.page)
+            return None
 
         raise RuntimeError("Buffer pool full: all pages are pinned. "
                            "Cannot evict. Increase buffer pool size or "
                            "unpin pages after use.")
 
+    def _clock_victim(self) -> Optional[int]:
+        """Run the clock hand; return the victim frame or None if all pinned."""
+        frames, ref = self._frames, self._ref
+        capacity = self._capacity
+        victim = None
+        # Two sweeps: the first may only clear reference bits.
+        for _ in range(2 * capacity):
+            idx = self._hand
+            self._hand = idx + 1 if idx + 1 < capacity else 0
+            entry = frames[idx]
+            if entry is None or entry.pin_count:
+                continue
+            if ref[idx]:
+                ref[idx] = 0
+                continue
+            if entry.hint is PageHint.DATA:
+                return idx
+            if victim is None:
+                victim = idx  # fallback if no DATA page turns up
+        return victim
+
+    def _lru2_victim(self) -> Optional[int]:
+        """
+        Unpinned frame with the largest backward-2 distance. Pages with a
+        single reference (prev == 0) rank first, oldest last reference first.
+        """
+        victim = None
+        best = None
+        for idx, entry in enumerate(self._frames):
+            if entry is None or entry.pin_count:
+                continue
+            rank = (entry.hint is not PageHint.DATA, entry.prev, entry.last)
+            if best is None or rank < best:
+                best = rank
+                victim = idx
+        return victim
+
     def stats(self) -> dict:
         """Return buffer pool statistics."""
-        pinned = sum(1 for e in self._cache.values() if e.pin_count > 0)
-        dirty = sum(1 for e in self._cache.values() if e.dirty)
+        entries = [self._frames[i] for i in self._index.values()]
+        pinned = sum(1 for e in entries if e.pin_count > 0)
+        dirty = sum(1 for e in entries if e.dirty)
         return {
             "capacity": self._capacity,
-            "used": len(self._cache),
+            "used": len(self._index),
             "pinned": pinned,
             "dirty": dirty,
-            "free": self._capacity - len(self._cache),
+            "free": self._capacity - len(self._index),
         }
 
 
 class _BufferEntry:
     """Internal cache entry."""
-    __slots__ = ("page", "dirty", "pin_count")
+    __slots__ = ("page", "dirty", "pin_count", "hint", "last_used",
+                 "last", "prev")
 
-    def __init__(self, page: Page, dirty: bool = False, pin_count: int = 0):
+    def __init__(self, page: Page, dirty: bool = False, pin_count: int = 0,
+                 hint: PageHint = PageHint.DATA, last_used: float = 0.0):
         self.page = page
         self.dirty = dirty
         self.pin_count = pin_count
+        self.hint = hint
+        self.last_used = last_used  # monotonic time of last put/get/unpin
+        self.last = 0  # LRU2: tick of the last reference
+        self.prev = 0  # LRU2: tick of the one before it (0 = none)
+
+
+# ─── Write-back ─────────────────────────────────────────────────────────────
+
+# Most iovecs a single pwritev() accepts (POSIX minimum for IOV_MAX is 16;
+# Linux and the BSDs allow 1024)
+_IOV_MAX = 1024
+
+
+def write_pages(dirty: Iterable[tuple[str, int, Page]],
+                skip_missing: bool = False) -> None:
+    """
+    Write (file_path, page_id, page) triples, as returned by flush_all(),
+    flush_file() and purge_stale(), back to their files.
+
+    Each file is opened once and fsynced once. Its pages are written in
+    page order; a run of consecutive page ids goes out in one pwritev()
+    call where available. With skip_missing, pages of files that no
+    longer exist are dropped instead of raising FileNotFoundError.
+    """
+    by_file: dict[str, list[tuple[int, Page]]] = {}
+    for file_path, page_id, page in dirty:
+        by_file.setdefault(file_path, []).append((page_id, page))
+
+    for file_path, pages in by_file.items():
+        try:
+            fd = os.open(file_path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        except FileNotFoundError:
+            if skip_missing:
+                continue
+            raise
+        try:
+            pages.sort(key=lambda item: item[0])
+            # consecutive page ids share (page_id - position)
+            for _, run in groupby(enumerate(pages), lambda x: x[1][0] - x[0]):
+                run = [item for _, item in run]
+                _write_run(fd, run[0][0] * PAGE_SIZE,
+                           [page.to_buffer() for _, page in run])
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _write_run(fd: int, offset: int, buffers: list) -> None:
+    """Write buffers back to back at offset, completing short writes."""
+    if hasattr(os, "pwritev"):
+        for i in range(0, len(buffers), _IOV_MAX):
+            batch = buffers[i:i + _IOV_MAX]
+            size = len(batch) * PAGE_SIZE
+            written = os.pwritev(fd, batch, offset)
+            if written < size:
+                _write_all(fd, memoryview(b"".join(batch))[written:], offset + written)
+            offset += size
+    else:
+        for buf in buffers:
+            _write_all(fd, buf, offset)
+            offset += PAGE_SIZE
+
+
+def _write_all(fd: int, data: memoryview, offset: int) -> None:
+    if hasattr(os, "pwrite"):
+        while data:
+            n = os.pwrite(fd, data, offset)
+            data, offset = data[n:], offset + n
+    else:
+        os.lseek(fd, offset, os.SEEK_SET)
+        while data:
+            data = data[os.write(fd, data):]
@@ -48,7 +48,7 @@ Teaching note:
 import struct
 import zlib
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Optional, Union
 
 # ─── Constants ──────────────────────────────────────────────────────────────
 
@@ -69,6 +69,8 @@ SLOT_STRUCT = struct.Struct(SLOT_FMT)
 
 # Deleted slot marker
 DELETED_SLOT = (0, 0)
+_DELETED_ENTRY = SLOT_STRUCT.pack(*DELETED_SLOT)
+_unpack_slot = SLOT_STRUCT.unpack_from
 
 
 class PageCorruptionError(Exception):
@@ -120,20 +122,24 @@ class Page:
       - All tuple offsets fall within [free_end, PAGE_SIZE)
     """
 
-    def __init__(self, page_id: int = 0, data: Optional[bytes] = None,
+    def __init__(self, page_id: int = 0,
+                 data: Optional[Union[bytes, bytearray, memoryview]] = None,
                  verify: bool = True):
         """
         Create or load a page.
 
         Args:
             page_id: Page number (used when creating fresh pages)
-            data: Raw 4096-byte page data (if loading from disk)
+            data: Raw 4096-byte page data (if loading from disk). Any
+                  bytes-like object is accepted and copied exactly once.
             verify: If True, validate CRC32 checksum on load (default: True)
         """
+        # (key_id, (min, max) or None) cached by key_range()
+        self._key_range: Optional[tuple] = None
         if data is not None:
-            if len(data) != PAGE_SIZE:
-                raise ValueError(f"Page data must be exactly {PAGE_SIZE} bytes, got {len(data)}")
             self._data = bytearray(data)
+            if len(self._data) != PAGE_SIZE:
+                raise ValueError(f"Page data must be exactly {PAGE_SIZE} bytes, got {len(self._data)}")
             self._parse_header()
             if verify:
                 self._verify_on_load()
@@ -255,6 +261,26 @@ class Page:
         off = self._slot_offset(slot_id)
         SLOT_STRUCT.pack_into(self._data, off, tuple_offset, tuple_length)
 
+    def _slots(self):
+        """Iterate all slot entries as (tuple_offset, tuple_length)."""
+        return SLOT_STRUCT.iter_unpack(self._data[HEADER_SIZE:self._free_start])
+
+    def _find_deleted_slot(self) -> Optional[int]:
+        """
+        First deleted slot id, or None. A deleted entry is four zero bytes;
+        bytearray.find scans the directory in C, and a hit that straddles
+        two entries (possible when a live entry ends/starts with zero
+        bytes) is skipped.
+        """
+        data, end = self._data, self._free_start
+        pos = data.find(_DELETED_ENTRY, HEADER_SIZE, end)
+        while pos != -1:
+            rel = pos - HEADER_SIZE
+            if rel % SLOT_SIZE == 0:
+                return rel // SLOT_SIZE
+            pos = data.find(_DELETED_ENTRY, pos + 1, end)
+        return None
+
     # ─── Tuple CRUD ─────────────────────────────────────────────────
 
     def insert_tuple(self, tuple_data: bytes) -> int:
@@ -266,15 +292,11 @@ class Page:
         Slot reuse policy: scans for first deleted slot (offset=0, length=0)
         and reuses it. If none found, appends a new slot.
         """
+        self._key_range = None
         tuple_len = len(tuple_data)
 
         # First, try to reuse a deleted slot
-        reuse_slot = None
-        for i in range(self._num_slots):
-            offset, length = self._read_slot(i)
-            if (offset, length) == DELETED_SLOT:
-                reuse_slot = i
-                break
+        reuse_slot = self._find_deleted_slot()
 
         if reuse_slot is not None:
             # Reuse deleted slot — but still need space for tuple data
@@ -313,14 +335,14 @@ class Page:
         Read a tuple by slot_id.
         Returns None if the slot is deleted or out of range.
         """
-        if slot_id < 0 or slot_id >= self._num_slots:
+        if not 0 <= slot_id < self._num_slots:
             return None
 
-        offset, length = self._read_slot(slot_id)
-        if (offset, length) == DELETED_SLOT:
-            return None
-
-        return bytes(self._data[offset:offset + length])
+        # Slot entry decoded in place (this is the per-RID fetch path)
+        offset, length = _unpack_slot(self._data, HEADER_SIZE + slot_id * SLOT_SIZE)
+        if offset or length:
+            return bytes(self._data[offset:offset + length])
+        return None
 
     def delete_tuple(self, slot_id: int) -> bool:
         """
@@ -348,6 +370,7 @@ class Page:
         deleted row back at its original RID.
         Returns True on success, False if impossible.
         """
+        self._key_range = None
         tuple_len = len(tuple_data)
         if slot_id < 0 or slot_id >= self._num_slots:
             return False
@@ -374,6 +397,7 @@ class Page:
 
         The RID never silently changes. This is a design contract.
         """
+        self._key_range = None
         if slot_id < 0 or slot_id >= self._num_slots:
             return False
 
@@ -415,21 +439,35 @@ class Page:
         Read all live (non-deleted) tuples.
         Returns list of (slot_id, tuple_bytes) in slot order (deterministic).
         """
-        result: list[tuple[int, bytes]] = []
-        for i in range(self._num_slots):
-            data = self.get_tuple(i)
-            if data is not None:
-                result.append((i, data))
+        data = self._data
+        return [(i, bytes(data[off:off + length]))
+                for i, (off, length) in enumerate(self._slots())
+                if off or length]
+
+    def key_range(self, key_id: Any,
+                  key: Callable[[bytes], Any]) -> Optional[tuple[Any, Any]]:
+        """
+        (min, max) of key(tuple) over live tuples, ignoring None and NaN
+        keys (NaN satisfies no comparison and would poison min/max);
+        None if no tuple has a key. Cached until a tuple is inserted,
+        restored or updated (deletes can only narrow the range, so the
+        cached one stays a valid bound). key_id names the key function;
+        asking with a different one recomputes.
+        """
+        cached = self._key_range
+        if cached is not None and cached[0] == key_id:
+            return cached[1]
+        data = self._data
+        keys = [k for off, length in self._slots() if off or length
+                for k in (key(data[off:off + length]),)
+                if k is not None and k == k]
+        result = (min(keys), max(keys)) if keys else None
+        self._key_range = (key_id, result)
         return result
 
     def live_tuple_count(self) -> int:
         """Count of non-deleted tuples in this page."""
-        count = 0
-        for i in range(self._num_slots):
-            offset, length = self._read_slot(i)
-            if (offset, length) != DELETED_SLOT:
-                count += 1
-        return count
+        return sum(1 for off, length in self._slots() if off or length)
 
     # ─── Compaction ─────────────────────────────────────────────────
 
@@ -443,21 +481,21 @@ class Page:
         External RIDs remain valid after compaction.
         """
         # Collect live tuples
-        live: list[tuple[int, bytes]] = []
-        for i in range(self._num_slots):
-            data = self.get_tuple(i)
-            if data is not None:
-                live.append((i, data))
+        live = self.get_all_tuples()
 
         # Clear tuple region
         self._free_end = PAGE_SIZE
 
         # Re-write tuples from the end
+        data = self._data
+        pack_slot = SLOT_STRUCT.pack_into
+        end = PAGE_SIZE
         for slot_id, tdata in live:
-            tlen = len(tdata)
-            self._free_end -= tlen
-            self._data[self._free_end:self._free_end + tlen] = tdata
-            self._write_slot(slot_id, self._free_end, tlen)
+            start = end - len(tdata)
+            data[start:end] = tdata
+            pack_slot(data, HEADER_SIZE + slot_id * SLOT_SIZE, start, end - start)
+            end = start
+        self._free_end = end
 
         # Zero out free space
         self._data[self._free_start:self._free_end] = b"\x00" * (self._free_end - self._free_start)
@@ -468,16 +506,23 @@ class Page:
 
     def compute_checksum(self) -> int:
         """Compute CRC32 checksum of the page (excluding the checksum field at offset 14..17)."""
-        before = self._data[:14]
-        after = self._data[18:]
-        return zlib.crc32(before + after) & 0xFFFFFFFF
+        with memoryview(self._data) as view:
+            return zlib.crc32(view[18:], zlib.crc32(view[:14]))
 
     def to_bytes(self) -> bytes:
         """Serialize the page to PAGE_SIZE bytes with computed CRC32 checksum."""
+        return bytes(self.to_buffer())
+
+    def to_buffer(self) -> memoryview:
+        """
+        Like to_bytes(), but return a read-only view of the page's own
+        buffer instead of a copy. For handing straight to write(); the
+        view reflects later changes to the page.
+        """
         checksum = self.compute_checksum()
         self._checksum = checksum
         struct.pack_into(">I", self._data, 14, checksum)
-        return bytes(self._data)
+        return memoryview(self._data).toreadonly()
 
     def verify_checksum(self) -> bool:
         """Verify the page's CRC32 checksum."""
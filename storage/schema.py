@@ -2,8 +2,8 @@
 MiniDB Schema Definition
 ========================
 Defines table schemas: column name, type, nullable, default value.
-Supports serialization of schema to/from bytes for persistence in
-the table file header page.
+Supports serialization of schema to/from a compact big-endian binary
+form (to_bytes/from_bytes) and to/from dicts for JSON metadata.
 
 Teaching note:
   In PostgreSQL, schemas are stored in system catalog tables (pg_attribute,
@@ -12,10 +12,41 @@ Teaching note:
 """
 
 import json
+import struct
+import sys
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
-from storage.types import DataType, type_from_string
+from storage.types import (
+    DataType, type_from_string, serialize_value, deserialize_value,
+)
+
+
+# ─── Binary schema format ───────────────────────────────────────────────────
+#   header:  format_version (B) | column_count (H)
+#   column:  type code (B) | flags (B) | name_len (H) | name (UTF-8)
+#            [default_len (H) | default (serialize_value)]  if FLAG_DEFAULT
+# Big-endian, like every other on-disk field. The version byte can never
+# be '{', so from_bytes() still reads the older JSON encoding.
+
+SCHEMA_FORMAT_VERSION = 1
+_SCHEMA_HEADER = struct.Struct(">BH")
+_COLUMN_HEADER = struct.Struct(">BBH")
+_DEFAULT_LEN = struct.Struct(">H")
+
+_FLAG_NULLABLE = 0x01
+_FLAG_DEFAULT = 0x02
+
+# Persisted type codes: explicit so reordering DataType never changes them.
+# New types get new codes; existing codes are never reused.
+_CODE_BY_TYPE: dict[DataType, int] = {
+    DataType.INT: 0,
+    DataType.FLOAT: 1,
+    DataType.STRING: 2,
+    DataType.BOOLEAN: 3,
+    DataType.DATE: 4,
+}
+_TYPE_BY_CODE: dict[int, DataType] = {c: t for t, c in _CODE_BY_TYPE.items()}
 
 
 @dataclass
@@ -26,6 +57,11 @@ class Column:
     nullable: bool = True
     default: Optional[Any] = None
 
+    def __post_init__(self) -> None:
+        # Every schema load builds fresh Columns; interning lets all of
+        # them (and the executor's lookups) share one string per name.
+        self.name = sys.intern(self.name)
+
     def to_dict(self) -> dict:
         """Serialize column definition to a dictionary."""
         d: dict = {
@@ -55,6 +91,8 @@ class Schema:
     Provides column lookup by name and index, plus serialization.
     """
     columns: list[Column] = field(default_factory=list)
+    _codec: Optional[tuple] = field(default=None, init=False, repr=False,
+                                    compare=False)
 
     @property
     def column_count(self) -> int:
@@ -93,18 +131,67 @@ class Schema:
                 errors.append(f"Column '{col.name}' does not allow NULL")
         return errors
 
+    def compile_codec(self) -> tuple:
+        """
+        Return (encode, decode) row functions specialized for this schema.
+
+        Generated on first use and cached on the instance; the columns
+        must not be changed afterwards.
+        """
+        if self._codec is None:
+            from storage.serializer import compile_row_codec
+            self._codec = compile_row_codec(self)
+        return self._codec
+
     # ─── Serialization ──────────────────────────────────────────────
 
     def to_bytes(self) -> bytes:
-        """Serialize schema to bytes (JSON-encoded UTF-8)."""
-        data = {"columns": [c.to_dict() for c in self.columns]}
-        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+        """Serialize schema to the packed binary format."""
+        parts = [_SCHEMA_HEADER.pack(SCHEMA_FORMAT_VERSION, len(self.columns))]
+        for col in self.columns:
+            name = col.name.encode("utf-8")
+            flags = _FLAG_NULLABLE if col.nullable else 0
+            if col.default is not None:
+                flags |= _FLAG_DEFAULT
+            parts.append(_COLUMN_HEADER.pack(
+                _CODE_BY_TYPE[col.data_type], flags, len(name)))
+            parts.append(name)
+            if col.default is not None:
+                default = serialize_value(col.default, col.data_type)
+                parts.append(_DEFAULT_LEN.pack(len(default)))
+                parts.append(default)
+        return b"".join(parts)
 
     @classmethod
     def from_bytes(cls, data: bytes) -> "Schema":
-        """Deserialize schema from bytes."""
-        parsed = json.loads(data.decode("utf-8"))
-        columns = [Column.from_dict(d) for d in parsed["columns"]]
+        """Deserialize schema from bytes (packed binary or legacy JSON)."""
+        if data[:1] == b"{":
+            parsed = json.loads(data.decode("utf-8"))
+            return cls.from_dict(parsed)
+
+        version, count = _SCHEMA_HEADER.unpack_from(data, 0)
+        if version > SCHEMA_FORMAT_VERSION:
+            raise ValueError(
+                f"Schema format version {version} is newer than "
+                f"supported version {SCHEMA_FORMAT_VERSION}")
+        off = _SCHEMA_HEADER.size
+        columns = []
+        for _ in range(count):
+            code, flags, name_len = _COLUMN_HEADER.unpack_from(data, off)
+            off += _COLUMN_HEADER.size
+            name = data[off:off + name_len].decode("utf-8")
+            off += name_len
+            dtype = _TYPE_BY_CODE.get(code)
+            if dtype is None:
+                raise ValueError(
+                    f"Unknown type code {code} for column '{name}'")
+            default = None
+            if flags & _FLAG_DEFAULT:
+                (default_len,) = _DEFAULT_LEN.unpack_from(data, off)
+                off += _DEFAULT_LEN.size
+                default, _ = deserialize_value(data, off, dtype)
+                off += default_len
+            columns.append(Column(name, dtype, bool(flags & _FLAG_NULLABLE), default))
         return cls(columns=columns)
 
     def to_dict(self) -> dict:
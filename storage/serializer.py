@@ -16,10 +16,21 @@ Teaching note:
 
 import math
 import struct
-from typing import Any
+from datetime import date
+from typing import Any, Callable
 
 from storage.schema import Schema
-from storage.types import DataType, serialize_value, deserialize_value
+from storage.types import DataType, FIXED_SIZES, serialize_value, deserialize_value
+
+
+_UINT16 = struct.Struct(">H")
+_INT32 = struct.Struct(">i")
+_FLOAT64 = struct.Struct(">d")
+_NO_FLAGS = _UINT16.pack(0)
+_DATE_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+RowEncoder = Callable[[list[Any]], bytes]
+RowDecoder = Callable[..., tuple[list[Any], int]]
 
 
 def _null_bitmap_size(num_columns: int) -> int:
@@ -39,36 +50,26 @@ def serialize_row(row: list[Any], schema: Schema) -> bytes:
 
     Returns the complete tuple bytes.
     """
-    ncols = schema.column_count
-    bmp_size = _null_bitmap_size(ncols)
-
-    # Build null bitmap and column data
-    null_bitmap = bytearray(bmp_size)
-    col_data = bytearray()
+    bmp_size = _null_bitmap_size(schema.column_count)
 
+    # Null bitmap as an int: bit i set = column i is NULL (byte i//8, bit i%8)
+    nulls = 0
+    parts: list[bytes] = []
     for i, (col, val) in enumerate(zip(schema.columns, row)):
         if val is None:
-            # Set bit i in the bitmap
-            byte_idx = i // 8
-            bit_idx = i % 8
-            null_bitmap[byte_idx] |= (1 << bit_idx)
+            nulls |= 1 << i
         else:
-            col_data.extend(serialize_value(val, col.data_type))
-
-    # Flags: 0 for now (reserved)
-    flags = 0
+            parts.append(serialize_value(val, col.data_type))
+    col_data = b"".join(parts)
 
-    # Header: tuple_len (2B) + null_bitmap + flags (2B)
-    header_size = 2 + bmp_size + 2
-    total_len = header_size + len(col_data)
-
-    result = bytearray()
-    result.extend(struct.pack(">H", total_len))
-    result.extend(null_bitmap)
-    result.extend(struct.pack(">H", flags))
-    result.extend(col_data)
-
-    return bytes(result)
+    # Header: tuple_len (2B) + null_bitmap + flags (2B, reserved = 0)
+    total_len = 2 + bmp_size + 2 + len(col_data)
+    return b"".join((
+        _UINT16.pack(total_len),
+        nulls.to_bytes(bmp_size, "little"),
+        _NO_FLAGS,
+        col_data,
+    ))
 
 
 def deserialize_row(data: bytes, schema: Schema, offset: int = 0) -> tuple[list[Any], int]:
@@ -78,38 +79,59 @@ def deserialize_row(data: bytes, schema: Schema, offset: int = 0) -> tuple[list[
     Returns:
       (values_list, new_offset)
     """
-    ncols = schema.column_count
-    bmp_size = _null_bitmap_size(ncols)
+    bmp_size = _null_bitmap_size(schema.column_count)
 
     # Read tuple_len
-    tuple_len = struct.unpack_from(">H", data, offset)[0]
+    tuple_len = _UINT16.unpack_from(data, offset)[0]
     start_offset = offset
     offset += 2
 
-    # Read null bitmap
-    null_bitmap = data[offset:offset + bmp_size]
-    offset += bmp_size
-
-    # Read flags (ignored for now)
-    _flags = struct.unpack_from(">H", data, offset)[0]
-    offset += 2
+    # Read null bitmap (flags after it are reserved and skipped)
+    nulls = int.from_bytes(data[offset:offset + bmp_size], "little")
+    offset += bmp_size + 2
 
     # Read column values
     values: list[Any] = []
+    append = values.append
     for i, col in enumerate(schema.columns):
-        byte_idx = i // 8
-        bit_idx = i % 8
-        is_null = (null_bitmap[byte_idx] >> bit_idx) & 1
-
-        if is_null:
-            values.append(None)
+        if (nulls >> i) & 1:
+            append(None)
         else:
             val, offset = deserialize_value(data, offset, col.data_type)
-            values.append(val)
+            append(val)
 
     return values, start_offset + tuple_len
 
 
+def deserialize_column(data: bytes, schema: Schema, col_idx: int,
+                       offset: int = 0) -> Any:
+    """
+    Decode a single column from a serialized tuple at the given offset.
+
+    Preceding columns are skipped by size (fixed width, or the 2-byte length
+    prefix for STRING) without being decoded, so a projection onto one column
+    allocates only the value it returns. Returns None for NULL.
+    """
+    bitmap_start = offset + 2
+    null_bitmap = data[bitmap_start:bitmap_start + _null_bitmap_size(schema.column_count)]
+    if (null_bitmap[col_idx // 8] >> (col_idx % 8)) & 1:
+        return None
+
+    # Skip tuple_len + null_bitmap + flags, then every non-NULL column before col_idx
+    offset = bitmap_start + len(null_bitmap) + 2
+    for i in range(col_idx):
+        if (null_bitmap[i // 8] >> (i % 8)) & 1:
+            continue
+        size = FIXED_SIZES.get(schema.columns[i].data_type)
+        if size is None:
+            # STRING: 2-byte length prefix + UTF-8 data
+            size = 2 + struct.unpack_from(">H", data, offset)[0]
+        offset += size
+
+    val, _ = deserialize_value(data, offset, schema.columns[col_idx].data_type)
+    return val
+
+
 def serialized_row_size(row: list[Any], schema: Schema) -> int:
     """Calculate the serialized size of a row without actually serializing."""
     ncols = schema.column_count
@@ -119,6 +141,81 @@ def serialized_row_size(row: list[Any], schema: Schema) -> int:
     data_size = 0
     for col, val in zip(schema.columns, row):
         if val is not None:
-            data_size += len(serialize_value(val, col.data_type))
+            size = FIXED_SIZES.get(col.data_type)
+            if size is None:
+                # STRING: 2-byte length prefix + UTF-8 data
+                size = 2 + len(str(val).encode("utf-8"))
+            data_size += size
 
     return header_size + data_size
+
+
+# ─── Compiled per-schema codecs ─────────────────────────────────────────────
+# serialize_row/deserialize_row re-dispatch on every column's type for every
+# row. For a fixed schema that dispatch can be done once: generate Python
+# source with one straight-line block per column and compile it. The
+# generated functions produce and accept exactly the bytes above.
+
+_ENCODE_EXPR = {
+    DataType.INT: "_INT32.pack(int(v))",
+    DataType.FLOAT: "_FLOAT64.pack(float(v))",
+    DataType.BOOLEAN: "b'\\x01' if v else b'\\x00'",
+    DataType.DATE: "serialize_value(v, DataType.DATE)",
+    DataType.STRING: "serialize_value(v, DataType.STRING)",
+}
+
+_DECODE_STMTS = {
+    DataType.INT: ["v = _INT32.unpack_from(data, pos)[0]", "pos += 4"],
+    DataType.FLOAT: ["v = _FLOAT64.unpack_from(data, pos)[0]", "pos += 8"],
+    DataType.BOOLEAN: ["v = data[pos] != 0", "pos += 1"],
+    DataType.DATE: ["v = date.fromordinal(_DATE_EPOCH_ORDINAL"
+                    " + _INT32.unpack_from(data, pos)[0])", "pos += 4"],
+    DataType.STRING: ["n = _UINT16.unpack_from(data, pos)[0]",
+                      "v = data[pos + 2:pos + 2 + n].decode('utf-8')",
+                      "pos += 2 + n"],
+}
+
+_CODEC_GLOBALS = {
+    "_INT32": _INT32, "_FLOAT64": _FLOAT64, "_UINT16": _UINT16,
+    "_NO_FLAGS": _NO_FLAGS, "_DATE_EPOCH_ORDINAL": _DATE_EPOCH_ORDINAL,
+    "date": date, "DataType": DataType, "serialize_value": serialize_value,
+}
+
+
+def compile_row_codec(schema: Schema) -> tuple[RowEncoder, RowDecoder]:
+    """
+    Build (encode, decode) specialized for this schema's column types.
+
+    encode(row) == serialize_row(row, schema) and
+    decode(data, offset=0) == deserialize_row(data, schema, offset).
+    Prefer Schema.compile_codec(), which caches the result.
+    """
+    bmp_size = _null_bitmap_size(schema.column_count)
+    header_size = 2 + bmp_size + 2
+
+    enc = ["def encode(row):", "    nulls = 0", "    parts = []"]
+    dec = ["def decode(data, offset=0):",
+           "    tuple_len = _UINT16.unpack_from(data, offset)[0]",
+           f"    nulls = int.from_bytes(data[offset + 2:offset + {2 + bmp_size}], 'little')",
+           f"    pos = offset + {header_size}"]
+    for i, col in enumerate(schema.columns):
+        enc += [f"    v = row[{i}]",
+                "    if v is None:",
+                f"        nulls |= {1 << i}",
+                "    else:",
+                f"        parts.append({_ENCODE_EXPR[col.data_type]})"]
+        dec += [f"    if nulls & {1 << i}:",
+                f"        c{i} = None",
+                "    else:"]
+        dec += [f"        {stmt}" for stmt in _DECODE_STMTS[col.data_type]]
+        dec += [f"        c{i} = v"]
+    enc += ["    data = b''.join(parts)",
+            f"    return b''.join((_UINT16.pack({header_size} + len(data)),",
+            f"                     nulls.to_bytes({bmp_size}, 'little'), _NO_FLAGS, data))"]
+    values = ", ".join(f"c{i}" for i in range(schema.column_count))
+    dec += [f"    return [{values}], offset + tuple_len"]
+
+    namespace = dict(_CODEC_GLOBALS)
+    source = "\n".join(enc + [""] + dec)
+    exec(compile(source, "<minidb row codec>", "exec"), namespace)
+    return namespace["encode"], namespace["decode"]
@@ -28,8 +28,9 @@ Teaching note:
 import json
 import os
 import struct
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Iterator, Optional
+from typing import Any, Callable, Iterator, Optional
 
 from storage.buffer import BufferManager
 from storage.page import (
@@ -37,7 +38,31 @@ from storage.page import (
     Page, RID, PageCorruptionError,
 )
 from storage.schema import Schema
-from storage.serializer import serialize_row, deserialize_row
+from storage.serializer import deserialize_column
+
+
+# page_filter(min, max) for TableFile.scan: False when no value in the
+# page's [min, max] range can satisfy the caller's predicate
+PageFilter = Callable[[Any, Any], bool]
+
+
+@dataclass
+class ColumnBatch:
+    """
+    A batch of rows in column-major (struct-of-arrays) form.
+    columns[c][i] is column c of the row at rids[i]; None for NULL.
+    """
+    rids: list[RID] = field(default_factory=list)
+    columns: list[list[Any]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.rids)
+
+
+def _to_batch(rids: list[RID], rows: list[list[Any]], ncols: int) -> ColumnBatch:
+    """Transpose row-major values into a ColumnBatch."""
+    columns = [list(col) for col in zip(*rows)] if rows else [[] for _ in range(ncols)]
+    return ColumnBatch(rids=rids, columns=columns)
 
 
 # ─── Shared global buffer manager ──────────────────────────────────────────
@@ -187,7 +212,7 @@ class TableFile:
             with open(self._file_path, "r+b") as f:
                 for page_id, page in dirty_pages:
                     f.seek(page_id * PAGE_SIZE)
-                    f.write(page.to_bytes())
+                    f.write(page.to_buffer())
                 f.flush()
                 os.fsync(f.fileno())  # Force to disk
 
@@ -232,7 +257,7 @@ class TableFile:
 
         # Write full page to disk immediately (atomic 4KB write)
         with open(self._file_path, "ab") as f:
-            f.write(page.to_bytes())
+            f.write(page.to_buffer())
             f.flush()
             os.fsync(f.fileno())
 
@@ -270,7 +295,8 @@ class TableFile:
             raise ValueError(f"Row validation failed: {'; '.join(errors)}")
 
         # Serialize
-        tuple_data = serialize_row(row, self._schema)
+        encode, _ = self._schema.compile_codec()
+        tuple_data = encode(row)
         tuple_len = len(tuple_data)
 
         # Find a page with space
@@ -282,6 +308,48 @@ class TableFile:
 
         return RID(page_id=page.page_id, slot_id=slot_id)
 
+    def insert_rows(self, rows: list[list[Any]]) -> list[RID]:
+        """
+        Insert many rows; returns their RIDs in input order.
+
+        Placement is identical to calling insert_row() per row (first page
+        with room), but pages that cannot hold even the smallest tuple of
+        the batch are skipped once instead of being re-probed for every row.
+        All rows are validated before any is written.
+        """
+        self._ensure_open()
+
+        schema = self._schema
+        for row in rows:
+            errors = schema.validate_row(row)
+            if errors:
+                raise ValueError(f"Row validation failed: {'; '.join(errors)}")
+        encode, _ = schema.compile_codec()
+        tuples = [encode(row) for row in rows]
+        if not tuples:
+            return []
+
+        min_len = min(len(t) for t in tuples)
+        # Pages below `first` cannot fit any tuple of this batch; free
+        # space only shrinks while the batch runs, so they stay skipped.
+        first = 1
+        rids: list[RID] = []
+        for tuple_data in tuples:
+            while first < self._num_pages and not self._get_page(first).can_fit(min_len):
+                first += 1
+            page = None
+            for pid in range(first, self._num_pages):
+                candidate = self._get_page(pid)
+                if candidate.can_fit(len(tuple_data)):
+                    page = candidate
+                    break
+            if page is None:
+                page = self._allocate_page()
+            slot_id = page.insert_tuple(tuple_data)
+            self._buffer.mark_dirty(self._file_path, page.page_id)
+            rids.append(RID(page_id=page.page_id, slot_id=slot_id))
+        return rids
+
     def get_row(self, rid: RID) -> Optional[list[Any]]:
         """
         Fetch a row by its RID.
@@ -297,7 +365,8 @@ class TableFile:
         if tuple_data is None:
             return None
 
-        values, _ = deserialize_row(tuple_data, self._schema)
+        _, decode = self._schema.compile_codec()
+        values, _ = decode(tuple_data)
         return values
 
     def delete_row(self, rid: RID) -> bool:
@@ -335,17 +404,26 @@ class TableFile:
             return False
 
         page = self._get_page(rid.page_id)
-        new_data = serialize_row(row, self._schema)
+        encode, _ = self._schema.compile_codec()
+        new_data = encode(row)
         updated = page.update_tuple(rid.slot_id, new_data)
         if updated:
             self._buffer.mark_dirty(self._file_path, page.page_id)
         return updated
 
-    def scan(self) -> Iterator[tuple[RID, list[Any]]]:
+    def scan(self, page_filter: Optional[PageFilter] = None,
+             column: int = 0) -> Iterator[tuple[RID, list[Any]]]:
         """
         Full table scan — iterate all live rows.
         Yields (RID, row_values) for each non-deleted tuple.
 
+        page_filter(min, max) prunes whole pages: it is given the range of
+        the column's non-NULL values on a page and returns False when no
+        value in that range can match, and the page's rows are skipped. The
+        range is cached on the buffered Page, so repeated filtered scans
+        decode nothing on pruned pages. Pages with only NULLs in the column
+        are skipped too. Callers must still filter the rows they receive.
+
         Order is deterministic:
           - Pages in ascending page_id order (1, 2, 3, ...)
           - Tuples in ascending slot_id order within each page
@@ -358,12 +436,76 @@ class TableFile:
         """
         self._ensure_open()
 
+        _, decode = self._schema.compile_codec()
+        if page_filter is not None:
+            schema = self._schema
+            if not 0 <= column < schema.column_count:
+                raise IndexError(f"Column index {column} out of range "
+                                 f"(table has {schema.column_count} columns)")
+
+            def column_key(data: bytes) -> Any:
+                return deserialize_column(data, schema, column)
+
         for pid in range(1, self._num_pages):
             page = self._get_page(pid)
+            if page_filter is not None:
+                bounds = page.key_range(column, column_key)
+                if bounds is None or not page_filter(*bounds):
+                    continue
             for slot_id, tuple_data in page.get_all_tuples():
-                values, _ = deserialize_row(tuple_data, self._schema)
+                values, _ = decode(tuple_data)
                 yield RID(page_id=pid, slot_id=slot_id), values
 
+    def scan_column(self, col_idx: int) -> Iterator[tuple[RID, Any]]:
+        """
+        Full table scan projected onto a single column.
+        Yields (RID, value) for each non-deleted tuple, value None for NULL.
+
+        Same deterministic order as scan(), but only the requested column is
+        decoded — the other fields are skipped by size. Used by callers that
+        touch one column per row (e.g. building an index).
+        """
+        self._ensure_open()
+
+        if col_idx < 0 or col_idx >= self._schema.column_count:
+            raise IndexError(f"Column index {col_idx} out of range "
+                             f"(table has {self._schema.column_count} columns)")
+
+        for pid in range(1, self._num_pages):
+            page = self._get_page(pid)
+            for slot_id, tuple_data in page.get_all_tuples():
+                value = deserialize_column(tuple_data, self._schema, col_idx)
+                yield RID(page_id=pid, slot_id=slot_id), value
+
+    def scan_columnar(self, batch_size: int = 1024) -> Iterator[ColumnBatch]:
+        """
+        Full table scan in column-major batches of up to batch_size rows.
+
+        Same deterministic order as scan(). Rows are decoded a page at a
+        time and transposed with zip(), so callers that consume whole
+        columns (aggregates, bulk loads) get one list per column instead
+        of a list per row.
+        """
+        self._ensure_open()
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        schema = self._schema
+        ncols = schema.column_count
+        _, decode = schema.compile_codec()
+        rids: list[RID] = []
+        rows: list[list[Any]] = []
+        for pid in range(1, self._num_pages):
+            page = self._get_page(pid)
+            for slot_id, tuple_data in page.get_all_tuples():
+                rids.append(RID(pid, slot_id))
+                rows.append(decode(tuple_data)[0])
+            while len(rids) >= batch_size:
+                yield _to_batch(rids[:batch_size], rows[:batch_size], ncols)
+                del rids[:batch_size], rows[:batch_size]
+        if rids:
+            yield _to_batch(rids, rows, ncols)
+
     def row_count(self) -> int:
         """Count all live rows (full scan). Use with caution on large tables."""
         return sum(1 for _ in self.scan())
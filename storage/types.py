@@ -58,15 +58,15 @@ def validate(value: Any, dtype: DataType) -> bool:
     if value is None:
         return True  # NULL is valid for any type (nullable checked at schema level)
 
-    if dtype == DataType.INT:
+    if dtype is DataType.INT:
         return isinstance(value, int) and not isinstance(value, bool)
-    elif dtype == DataType.FLOAT:
+    elif dtype is DataType.FLOAT:
         return isinstance(value, (int, float)) and not isinstance(value, bool)
-    elif dtype == DataType.STRING:
+    elif dtype is DataType.STRING:
         return isinstance(value, str)
-    elif dtype == DataType.BOOLEAN:
+    elif dtype is DataType.BOOLEAN:
         return isinstance(value, bool)
-    elif dtype == DataType.DATE:
+    elif dtype is DataType.DATE:
         return isinstance(value, (date, str))
     return False
 
@@ -80,13 +80,13 @@ def coerce(value: Any, dtype: DataType) -> Any:
     if value is None:
         return None
 
-    if dtype == DataType.INT:
+    if dtype is DataType.INT:
         return int(value)
-    elif dtype == DataType.FLOAT:
+    elif dtype is DataType.FLOAT:
         return float(value)
-    elif dtype == DataType.STRING:
+    elif dtype is DataType.STRING:
         return str(value)
-    elif dtype == DataType.BOOLEAN:
+    elif dtype is DataType.BOOLEAN:
         if isinstance(value, bool):
             return value
         if isinstance(value, str):
@@ -95,7 +95,7 @@ def coerce(value: Any, dtype: DataType) -> Any:
             if value.upper() in ("FALSE", "0", "NO"):
                 return False
         raise ValueError(f"Cannot coerce {value!r} to BOOLEAN")
-    elif dtype == DataType.DATE:
+    elif dtype is DataType.DATE:
         if isinstance(value, date):
             return value
         if isinstance(value, str):
@@ -108,6 +108,12 @@ def coerce(value: Any, dtype: DataType) -> Any:
 
 # Epoch for DATE type
 _DATE_EPOCH = date(1970, 1, 1)
+_DATE_EPOCH_ORDINAL = _DATE_EPOCH.toordinal()
+
+# Precompiled big-endian codecs
+_INT32 = struct.Struct(">i")
+_FLOAT64 = struct.Struct(">d")
+_UINT16 = struct.Struct(">H")
 
 
 def serialize_value(value: Any, dtype: DataType) -> bytes:
@@ -115,26 +121,25 @@ def serialize_value(value: Any, dtype: DataType) -> bytes:
     Serialize a Python value to bytes according to its DataType.
     Raises ValueError if the value cannot be serialized.
     """
-    if dtype == DataType.INT:
-        return struct.pack(">i", int(value))
+    if dtype is DataType.INT:
+        return _INT32.pack(int(value))
+
+    elif dtype is DataType.STRING:
+        encoded = str(value).encode("utf-8")
+        if len(encoded) > 65535:
+            raise ValueError(f"String too long: {len(encoded)} bytes (max 65535)")
+        return _UINT16.pack(len(encoded)) + encoded
 
-    elif dtype == DataType.FLOAT:
-        return struct.pack(">d", float(value))
+    elif dtype is DataType.FLOAT:
+        return _FLOAT64.pack(float(value))
 
-    elif dtype == DataType.BOOLEAN:
+    elif dtype is DataType.BOOLEAN:
         return b"\x01" if value else b"\x00"
 
-    elif dtype == DataType.DATE:
+    elif dtype is DataType.DATE:
         if isinstance(value, str):
             value = datetime.strptime(value, "%Y-%m-%d").date()
-        delta = value - _DATE_EPOCH
-        return struct.pack(">i", delta.days)
-
-    elif dtype == DataType.STRING:
-        encoded = str(value).encode("utf-8")
-        if len(encoded) > 65535:
-            raise ValueError(f"String too long: {len(encoded)} bytes (max 65535)")
-        return struct.pack(">H", len(encoded)) + encoded
+        return _INT32.pack(value.toordinal() - _DATE_EPOCH_ORDINAL)
 
     raise ValueError(f"Cannot serialize type: {dtype}")
 
@@ -144,29 +149,25 @@ def deserialize_value(data: bytes, offset: int, dtype: DataType) -> tuple[Any, i
     Deserialize a value from bytes at the given offset.
     Returns (value, new_offset).
     """
-    if dtype == DataType.INT:
-        val = struct.unpack_from(">i", data, offset)[0]
-        return val, offset + 4
-
-    elif dtype == DataType.FLOAT:
-        val = struct.unpack_from(">d", data, offset)[0]
-        return val, offset + 8
-
-    elif dtype == DataType.BOOLEAN:
-        val = data[offset] != 0
-        return val, offset + 1
-
-    elif dtype == DataType.DATE:
-        days = struct.unpack_from(">i", data, offset)[0]
-        val = date.fromordinal(_DATE_EPOCH.toordinal() + days)
-        return val, offset + 4
+    if dtype is DataType.INT:
+        return _INT32.unpack_from(data, offset)[0], offset + 4
 
-    elif dtype == DataType.STRING:
-        length = struct.unpack_from(">H", data, offset)[0]
+    elif dtype is DataType.STRING:
+        length = _UINT16.unpack_from(data, offset)[0]
         offset += 2
         val = data[offset:offset + length].decode("utf-8")
         return val, offset + length
 
+    elif dtype is DataType.FLOAT:
+        return _FLOAT64.unpack_from(data, offset)[0], offset + 8
+
+    elif dtype is DataType.BOOLEAN:
+        return data[offset] != 0, offset + 1
+
+    elif dtype is DataType.DATE:
+        days = _INT32.unpack_from(data, offset)[0]
+        return date.fromordinal(_DATE_EPOCH_ORDINAL + days), offset + 4
+
     raise ValueError(f"Cannot deserialize type: {dtype}")
 
 
@@ -1,2 +1,10 @@
 # MiniDB Test Configuration
-# This file is intentionally empty but required for pytest discovery.
+# Required for pytest discovery; registers the suite's custom markers.
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "needs_buffer: test uses the process-global buffer manager, "
+        "which is reset before and after it",
+    )
@@ -133,3 +133,53 @@ def test_select_expression_alias_naming(executor):
     # __str__: "(1 + 1)"
     assert "(1 + 1)" in rows[0].values
     assert rows[0].values["(1 + 1)"] == 2
+
+def test_seqscan_predicate_pushdown(executor):
+    from execution.physical_plan import SeqScanExec
+    from parser import parse
+
+    list(executor.execute("CREATE TABLE t (id INT, val INT)"))
+    list(executor.execute("INSERT INTO t VALUES (1, 100)"))
+    list(executor.execute("INSERT INTO t VALUES (2, NULL)"))
+    list(executor.execute("INSERT INTO t VALUES (3, 300)"))
+
+    # Simple predicate without an index is evaluated inside the scan
+    logical = executor.logical_planner.plan(parse("SELECT id FROM t WHERE val >= 100"))
+    scan = executor.physical_planner.plan(logical).child
+    assert isinstance(scan, SeqScanExec)
+    assert scan.predicate is not None
+
+    # NULLs never pass (3VL), flipped literal form is canonicalized
+    rows = executor.execute_and_fetchall("SELECT id FROM t WHERE 200 < val")
+    assert [r['id'] for r in rows] == [3]
+    rows = executor.execute_and_fetchall("SELECT id FROM t WHERE val = NULL")
+    assert rows == []
+
+
+def test_page_pruning_ignores_nan(executor):
+    # inf - inf stores a NaN; it must not poison the page's (min, max)
+    big = "9" * 400 + ".0"
+    list(executor.execute("CREATE TABLE t (v FLOAT)"))
+    list(executor.execute(f"INSERT INTO t VALUES ({big} - {big})"))
+    list(executor.execute("INSERT INTO t VALUES (1.0)"))
+
+    rows = executor.execute_and_fetchall("SELECT v FROM t WHERE v = 1.0")
+    assert rows == [{'v': 1.0}]
+    rows = executor.execute_and_fetchall("SELECT v FROM t WHERE v < 2.0")
+    assert rows == [{'v': 1.0}]
+
+
+def test_purge_stale_pages_between_statements(tmp_path):
+    base_path = str(tmp_path)
+    buffer_manager = BufferManager()
+    context = ExecutionContext(Catalog(base_path), buffer_manager, base_path,
+                               buffer_max_age=0.0)
+    executor = Executor(context)
+
+    list(executor.execute("CREATE TABLE t (id INT, name STRING)"))
+    list(executor.execute("INSERT INTO t VALUES (1, 'a')"))
+    assert buffer_manager.size == 0
+
+    rows = executor.execute_and_fetchall("SELECT * FROM t")
+    assert rows == [{'id': 1, 'name': 'a'}]
+    assert buffer_manager.size == 0
@@ -17,13 +17,15 @@ from storage.types import DataType
 from storage.schema import Schema, Column
 from storage.table import TableFile
 
-from indexing.key_encoding import encode_key, decode_key
+from indexing.key_encoding import encode_key, decode_key, make_encoder, make_decoder
 from indexing.btree import BTree
 from indexing.index_manager import build_index, open_index_by_info
 
 from catalog.catalog import Catalog
 from execution.executor import Executor
 from execution.context import ExecutionContext
+from execution.physical_plan import IndexScanExec
+from parser import parse
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -109,6 +111,19 @@ class TestKeyEncoding:
         with pytest.raises(ValueError, match="NULL"):
             encode_key(None, DataType.INT)
 
+    def test_specialized_codecs_match_generic(self):
+        from datetime import date
+        samples = {
+            DataType.INT: -7, DataType.FLOAT: -0.0, DataType.STRING: "a\x00b",
+            DataType.BOOLEAN: True, DataType.DATE: date(2024, 2, 29),
+        }
+        for dtype, val in samples.items():
+            enc = make_encoder(dtype)
+            assert enc(val) == encode_key(val, dtype)
+            assert make_decoder(dtype)(enc(val), 0) == decode_key(enc(val), 0, dtype)
+            with pytest.raises(ValueError, match="NULL"):
+                enc(None)
+
 
 # ═══════════════════════════════════════════════════════════════════
 # B-Tree Core Tests
@@ -143,6 +158,21 @@ class TestBTree:
         assert rid_bytes == sorted(rid_bytes), "Duplicates must be ordered by RID"
         bt.close()
 
+    def test_duplicate_keys_unordered_inserts(self, tmpdir, bm):
+        """RID tiebreak holds for a long run of shuffled duplicates."""
+        path = os.path.join(tmpdir, "dupmany.idx")
+        bt = BTree.create(path, "t", "col", DataType.INT, bm)
+        rids = [RID(p, s) for p in range(5) for s in range(20)]
+        for i in range(len(rids)):
+            # Deterministic shuffle: 7 is coprime with 100
+            bt.insert(7, rids[(i * 7) % len(rids)])
+        bt.insert(6, RID(0, 0))
+        bt.insert(8, RID(0, 0))
+
+        assert bt.search(7) == rids
+        assert [v for v, _ in bt.range_scan(6, 8)] == [6] + [7] * 100 + [8]
+        bt.close()
+
     def test_range_scan_ordered(self, tmpdir, bm):
         path = os.path.join(tmpdir, "range.idx")
         bt = BTree.create(path, "t", "col", DataType.INT, bm)
@@ -207,6 +237,44 @@ class TestBTree:
         assert vals == list(range(100, 401))
         bt.close()
 
+    def test_range_scan_columns(self, tmpdir, bm):
+        """Columnar range scan matches range_scan across leaves."""
+        path = os.path.join(tmpdir, "cols.idx")
+        bt = BTree.create(path, "t", "col", DataType.INT, bm)
+
+        for i in range(500):
+            bt.insert(i, RID(1, i))
+
+        keys, rids = bt.range_scan_columns(100, 400, False, False)
+        assert keys == list(range(101, 400))
+        assert rids == [RID(1, i) for i in range(101, 400)]
+        assert list(zip(keys, rids)) == list(bt.range_scan(100, 400, False, False))
+        assert bt.range_scan_columns(600, None) == ([], [])
+        assert list(bt.range_scan_rids(100, 400, False, False)) == rids
+        bt.close()
+
+    def test_bulk_load(self, tmpdir, bm):
+        """Bottom-up build matches insert() results and survives reopen."""
+        path = os.path.join(tmpdir, "bulk.idx")
+        bt = BTree.create(path, "t", "col", DataType.INT, bm)
+        # 3000 keys in scrambled order (7 is coprime with 3000), plus duplicates
+        entries = [((i * 7) % 3000, RID(1, i)) for i in range(3000)]
+        entries += [(42, RID(0, s)) for s in range(5)]
+        assert bt.bulk_load(entries) == 3005
+        assert bt.tree_height > 1
+        assert bt.verify_structure() == []
+        bt.close()
+
+        bt = BTree.open(path, bm)
+        assert bt.entry_count == 3005
+        assert [k for k, _ in bt.range_scan()] == sorted(k for k, _ in entries)
+        assert bt.search(42)[:5] == [RID(0, s) for s in range(5)]
+        bt.insert(5000, RID(9, 9))
+        assert bt.search(5000) == [RID(9, 9)]
+        with pytest.raises(ValueError, match="empty index"):
+            bt.bulk_load([(1, RID(1, 1))])
+        bt.close()
+
     def test_persistence_after_split(self, tmpdir):
         """Close and reopen B-Tree after splits — data survives."""
         path = os.path.join(tmpdir, "persist.idx")
@@ -383,6 +451,31 @@ class TestIndexExecution:
         scores = sorted([r["score"] for r in rows])
         assert scores == [70, 80, 90, 100]
 
+    def test_index_scan_limit_pushdown(self, tmpdir, bm):
+        """Constant LIMIT is handed to the IndexScan so the walk stops early."""
+        executor = _make_executor(tmpdir, bm)
+
+        executor.execute_and_fetchall("CREATE TABLE scores (id INT, score INT)")
+        for i in range(1, 11):
+            executor.execute_and_fetchall(f"INSERT INTO scores VALUES ({i}, {i * 10})")
+        executor.execute_and_fetchall("INSERT INTO scores VALUES (11, 30)")
+
+        catalog = executor.context.catalog
+        tf = TableFile(catalog.get_table_file("scores"), bm)
+        tf.open()
+        build_index(catalog, tf, "scores", "score", "idx_scores_score", bm)
+        tf.close()
+
+        logical = executor.logical_planner.plan(parse("SELECT id FROM scores WHERE score >= 70 LIMIT 2"))
+        plan = executor.physical_planner.plan(logical)
+        assert isinstance(plan.child.child, IndexScanExec)
+        assert plan.child.child.limit == 2
+
+        rows = executor.execute_and_fetchall("SELECT id FROM scores WHERE score >= 70 LIMIT 2")
+        assert [r["id"] for r in rows] == [7, 8]
+        rows = executor.execute_and_fetchall("SELECT id FROM scores WHERE score = 30 LIMIT 1")
+        assert len(rows) == 1 and rows[0]["id"] in (3, 11)
+
     def test_fallback_to_seqscan(self, tmpdir, bm):
         """When no index exists, planner falls back to SeqScan."""
         executor = _make_executor(tmpdir, bm)
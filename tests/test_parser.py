@@ -20,7 +20,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.insert(0, parent_dir)
 
-from parser import parse, ParseError
+from parser import parse, ParseError, clear_parse_cache
 from parser.ast_nodes import (
     SelectStmt, InsertStmt, UpdateStmt, DeleteStmt, CreateTableStmt,
     BinaryExpr, UnaryExpr, Literal, QualifiedName, GroupingExpr, IsNullExpr,
@@ -223,5 +223,22 @@ class TestParser:
             parse("SELECT 1; SELECT 2")
         assert "Multiple statements" in str(exc.value)
 
+    # ─── Parse cache ────────────────────────────────────────────────
+
+    def test_parse_is_memoized(self):
+        clear_parse_cache()
+        sql = "SELECT id FROM users WHERE id = 1"
+        first = parse(sql)
+        assert parse(sql) is first
+        clear_parse_cache()
+        again = parse(sql)
+        assert again is not first
+        assert again == first
+
+    def test_parse_errors_not_cached(self):
+        for _ in range(2):
+            with pytest.raises(ParseError):
+                parse("SELECT * FROM t WHERE")
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "--tb=short"])
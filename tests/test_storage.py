@@ -17,7 +17,6 @@ import json
 import os
 import sys
 import tempfile
-import shutil
 from datetime import date
 
 import pytest
@@ -30,9 +29,14 @@ from storage.types import (
     type_from_string,
 )
 from storage.schema import Column, Schema
-from storage.serializer import serialize_row, deserialize_row, serialized_row_size
-from storage.page import Page, RID, PAGE_SIZE, FORMAT_VERSION, DELETED_SLOT, PageCorruptionError
-from storage.buffer import BufferManager
+from storage.serializer import (
+    serialize_row, deserialize_row, deserialize_column, serialized_row_size,
+)
+from storage.page import (
+    Page, RID, PAGE_SIZE, HEADER_SIZE, SLOT_SIZE, FORMAT_VERSION, DELETED_SLOT,
+    PageCorruptionError,
+)
+from storage.buffer import BufferManager, EvictionPolicy, PageHint, write_pages
 from storage.table import TableFile, reset_buffer_manager
 from catalog.catalog import Catalog
 
@@ -41,23 +45,53 @@ from catalog.catalog import Catalog
 # Fixtures
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Under pytest-xdist each worker is its own process with its own global
+# buffer manager; tag temp dirs with the worker id so leftovers are traceable.
+_WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+# Prefer a RAM-backed base dir: storage tests fsync every page write.
+# MINIDB_TEST_TMP overrides; otherwise /dev/shm, else the system default.
+_TMP_BASE = os.environ.get("MINIDB_TEST_TMP") or (
+    "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK)
+    else None
+)
+
+# Encoded tuple payloads shared by the page tests (tuple_0000, tuple_0001, ...).
+_PAYLOADS = [f"tuple_{i:04d}".encode() for i in range(256)]
+
+
+def _remove_dir(path: str) -> None:
+    """Remove a flat test directory; tests only create plain files in it."""
+    try:
+        for entry in os.scandir(path):
+            os.unlink(entry.path)
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
 @pytest.fixture
 def tmp_dir():
     """Create a temporary directory for test files."""
-    path = tempfile.mkdtemp(prefix="minidb_test_")
+    path = tempfile.mkdtemp(prefix=f"minidb_test_{_WORKER_ID}_", dir=_TMP_BASE)
     yield path
-    shutil.rmtree(path, ignore_errors=True)
+    _remove_dir(path)
 
 
 @pytest.fixture(autouse=True)
-def clean_buffer():
-    """Reset global buffer manager between tests."""
+def clean_buffer(request):
+    """Reset global buffer manager around tests marked needs_buffer."""
+    if request.node.get_closest_marker("needs_buffer") is None:
+        yield
+        return
     reset_buffer_manager()
     yield
     reset_buffer_manager()
 
 
-@pytest.fixture
+# Schemas are read-only in every test, so one instance serves the session.
+@pytest.fixture(scope="session")
 def user_schema():
     """Sample schema: users(id INT, name STRING, active BOOLEAN)."""
     return Schema(columns=[
@@ -67,7 +101,7 @@ def user_schema():
     ])
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def full_schema():
     """Schema with all 5 data types."""
     return Schema(columns=[
@@ -79,6 +113,39 @@ def full_schema():
     ])
 
 
+@pytest.fixture(scope="class")
+def class_table(user_schema):
+    """One open users table per test class, on its own buffer manager so
+    the global resets done by clean_buffer never touch it."""
+    path = tempfile.mkdtemp(prefix=f"minidb_test_{_WORKER_ID}_", dir=_TMP_BASE)
+    tbl = TableFile(os.path.join(path, "shared.tbl"), BufferManager(capacity=16))
+    tbl.create("shared", user_schema)
+    yield tbl
+    tbl.close()
+    _remove_dir(path)
+
+
+@pytest.fixture
+def shared_tbl(class_table):
+    """The class table with savepoint semantics: rows the test leaves
+    behind are deleted afterwards. For tests that don't count rows."""
+    before = {rid for rid, _ in class_table.scan()}
+    yield class_table
+    for rid, _ in list(class_table.scan()):
+        if rid not in before:
+            class_table.delete_row(rid)
+
+
+@pytest.fixture(scope="module")
+def filled_page_bytes():
+    """Serialized page 1 holding tuple_0000 .. tuple_0009 in slots 0-9.
+    Tests get their own Page via Page(1, data=...); the bytes are shared."""
+    page = Page(page_id=1)
+    for payload in _PAYLOADS[:10]:
+        page.insert_tuple(payload)
+    return page.to_bytes()
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 1. Data Type Tests
 # ═══════════════════════════════════════════════════════════════════════════
@@ -86,70 +153,45 @@ def full_schema():
 class TestDataTypes:
     """Test the data type system: serialize, deserialize, validate, coerce."""
 
-    def test_int_roundtrip(self):
-        data = serialize_value(42, DataType.INT)
-        val, off = deserialize_value(data, 0, DataType.INT)
-        assert val == 42 and off == 4
-
-    def test_int_negative(self):
-        data = serialize_value(-1000, DataType.INT)
-        val, _ = deserialize_value(data, 0, DataType.INT)
-        assert val == -1000
-
-    def test_float_roundtrip(self):
-        data = serialize_value(3.14159, DataType.FLOAT)
-        val, off = deserialize_value(data, 0, DataType.FLOAT)
-        assert abs(val - 3.14159) < 1e-10 and off == 8
-
-    def test_string_roundtrip(self):
-        data = serialize_value("hello 🌍", DataType.STRING)
-        val, off = deserialize_value(data, 0, DataType.STRING)
-        assert val == "hello 🌍"
-
-    def test_string_empty(self):
-        data = serialize_value("", DataType.STRING)
-        val, _ = deserialize_value(data, 0, DataType.STRING)
-        assert val == ""
-
-    def test_boolean_true(self):
-        data = serialize_value(True, DataType.BOOLEAN)
-        val, _ = deserialize_value(data, 0, DataType.BOOLEAN)
-        assert val is True
-
-    def test_boolean_false(self):
-        data = serialize_value(False, DataType.BOOLEAN)
-        val, _ = deserialize_value(data, 0, DataType.BOOLEAN)
-        assert val is False
-
-    def test_date_roundtrip(self):
-        d = date(2026, 2, 16)
-        data = serialize_value(d, DataType.DATE)
-        val, _ = deserialize_value(data, 0, DataType.DATE)
-        assert val == d
-
-    def test_date_from_string(self):
-        data = serialize_value("2000-01-01", DataType.DATE)
-        val, _ = deserialize_value(data, 0, DataType.DATE)
-        assert val == date(2000, 1, 1)
-
-    def test_validate_int(self):
-        assert validate(42, DataType.INT) is True
-        assert validate("42", DataType.INT) is False
-        assert validate(True, DataType.INT) is False  # bool is not int
+    @pytest.mark.parametrize("value, dtype, expected, size", [
+        (42, DataType.INT, 42, 4),
+        (-1000, DataType.INT, -1000, 4),
+        (3.14159, DataType.FLOAT, 3.14159, 8),
+        ("hello 🌍", DataType.STRING, "hello 🌍", 12),
+        ("", DataType.STRING, "", 2),
+        (True, DataType.BOOLEAN, True, 1),
+        (False, DataType.BOOLEAN, False, 1),
+        (date(2026, 2, 16), DataType.DATE, date(2026, 2, 16), 4),
+        ("2000-01-01", DataType.DATE, date(2000, 1, 1), 4),
+    ], ids=["int", "int_negative", "float", "string", "string_empty",
+            "boolean_true", "boolean_false", "date", "date_from_string"])
+    def test_roundtrip(self, value, dtype, expected, size):
+        data = serialize_value(value, dtype)
+        val, off = deserialize_value(data, 0, dtype)
+        assert val == expected and type(val) is type(expected)
+        assert off == size == len(data)
+
+    @pytest.mark.parametrize("value, dtype, valid", [
+        (42, DataType.INT, True),
+        ("42", DataType.INT, False),
+        (True, DataType.INT, False),  # bool is not int
+    ])
+    def test_validate(self, value, dtype, valid):
+        assert validate(value, dtype) is valid
 
     def test_validate_null(self):
         for dt in DataType:
             assert validate(None, dt) is True
 
-    def test_coerce_string_to_int(self):
-        assert coerce("123", DataType.INT) == 123
-
-    def test_coerce_string_to_bool(self):
-        assert coerce("true", DataType.BOOLEAN) is True
-        assert coerce("FALSE", DataType.BOOLEAN) is False
-
-    def test_coerce_string_to_date(self):
-        assert coerce("2026-02-16", DataType.DATE) == date(2026, 2, 16)
+    @pytest.mark.parametrize("text, dtype, expected", [
+        ("123", DataType.INT, 123),
+        ("true", DataType.BOOLEAN, True),
+        ("FALSE", DataType.BOOLEAN, False),
+        ("2026-02-16", DataType.DATE, date(2026, 2, 16)),
+    ])
+    def test_coerce_from_string(self, text, dtype, expected):
+        val = coerce(text, dtype)
+        assert val == expected and type(val) is type(expected)
 
     def test_type_from_string(self):
         assert type_from_string("INT") == DataType.INT
@@ -206,6 +248,42 @@ class TestSchema:
             assert orig.data_type == rest.data_type
             assert orig.nullable == rest.nullable
 
+    def test_loaded_schemas_share_names_and_types(self, user_schema):
+        a = Schema.from_dict(json.loads(json.dumps(user_schema.to_dict())))
+        b = Schema.from_bytes(user_schema.to_bytes())
+        for x, y in zip(a.columns, b.columns):
+            assert x.name is y.name
+            assert x.data_type is y.data_type
+
+    def test_schema_bytes_packed_with_defaults(self, full_schema):
+        schema = Schema(columns=full_schema.columns + [
+            Column("tag", DataType.STRING, default="none"),
+            Column("since", DataType.DATE, nullable=False,
+                   default=date(2020, 1, 2)),
+        ])
+        data = schema.to_bytes()
+        assert data[:1] == b"\x01"  # format version, not JSON
+        assert Schema.from_bytes(data) == schema
+
+    @pytest.mark.parametrize("dtype, code", [
+        (DataType.INT, 0), (DataType.FLOAT, 1), (DataType.STRING, 2),
+        (DataType.BOOLEAN, 3), (DataType.DATE, 4),
+    ])
+    def test_schema_type_codes_are_pinned(self, dtype, code):
+        data = Schema(columns=[Column("c", dtype)]).to_bytes()
+        assert data[3] == code  # first byte after the (B, H) header
+        assert Schema.from_bytes(data).columns[0].data_type is dtype
+
+    def test_schema_unknown_type_code_rejected(self, user_schema):
+        data = bytearray(user_schema.to_bytes())
+        data[3] = 0xFF
+        with pytest.raises(ValueError, match="Unknown type code 255"):
+            Schema.from_bytes(bytes(data))
+
+    def test_schema_from_legacy_json_bytes(self, user_schema):
+        legacy = json.dumps(user_schema.to_dict()).encode("utf-8")
+        assert Schema.from_bytes(legacy) == user_schema
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 3. Serializer Tests
@@ -248,6 +326,26 @@ class TestSerializer:
         restored, _ = deserialize_row(data, user_schema)
         assert restored == [1, "", True]
 
+    def test_deserialize_single_column(self, full_schema):
+        row = [42, None, "skip me", True, date(2026, 1, 1)]
+        data = serialize_row(row, full_schema)
+        for i, expected in enumerate(row):
+            assert deserialize_column(data, full_schema, i) == expected
+
+    def test_compiled_codec_matches_generic(self, full_schema):
+        encode, decode = full_schema.compile_codec()
+        assert full_schema.compile_codec()[0] is encode
+        rows = [
+            [42, 3.14, "tést", True, date(2026, 1, 1)],
+            [-7, None, None, False, None],
+            [0, -0.5, "", None, date(1969, 12, 31)],
+        ]
+        for row in rows:
+            data = serialize_row(row, full_schema)
+            assert encode(row) == data
+            padded = b"\xff" * 3 + data
+            assert decode(padded, 3) == deserialize_row(padded, full_schema, 3)
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 4. Page Tests — Core Verification Criteria
@@ -288,13 +386,10 @@ class TestPage:
 
     def test_insert_multiple_tuples(self):
         page = Page(page_id=1)
-        ids = []
-        for i in range(5):
-            sid = page.insert_tuple(f"tuple_{i}".encode())
-            ids.append(sid)
+        blobs = _PAYLOADS[:5]
+        ids = [page.insert_tuple(b) for b in blobs]
         assert ids == [0, 1, 2, 3, 4]
-        for i, sid in enumerate(ids):
-            assert page.get_tuple(sid) == f"tuple_{i}".encode()
+        assert [page.get_tuple(sid) for sid in ids] == blobs
 
     def test_get_invalid_slot(self):
         page = Page(page_id=1)
@@ -324,14 +419,14 @@ class TestPage:
 
     def test_page_full(self):
         page = Page(page_id=1)
-        # Fill the page with tuples until it's full
-        count = 0
-        while page.can_fit(100):
-            page.insert_tuple(b"x" * 100)
-            count += 1
-        assert count > 0
+        # The page geometry fixes how many 100-byte tuples fit
+        payload = b"x" * 100
+        cap = (PAGE_SIZE - HEADER_SIZE) // (len(payload) + SLOT_SIZE)
+        slots = [page.insert_tuple(payload) for _ in range(cap)]
+        assert slots == list(range(cap))
+        assert not page.can_fit(len(payload))
         with pytest.raises(ValueError):
-            page.insert_tuple(b"x" * 100)
+            page.insert_tuple(payload)
 
     def test_can_fit_reports_correctly(self):
         page = Page(page_id=1)
@@ -353,10 +448,18 @@ class TestPage:
         assert page.get_tuple(s2) == b"third"
         assert page.get_tuple(s1) == b"second"
 
-    def test_compaction(self):
+    def test_slot_reuse_ignores_straddling_zero_bytes(self):
         page = Page(page_id=1)
-        for i in range(10):
-            page.insert_tuple(f"tuple_{i:04d}".encode())
+        page.insert_tuple(b"x" * (PAGE_SIZE - 256))  # free_end -> 256
+        page.insert_tuple(b"")    # slot 1 = (256, 0)   -> 01 00 00 00
+        page.insert_tuple(b"z")   # slot 2 = (255, 1)   -> 00 FF 00 01
+        # The zero run across slots 1|2 is not a deleted slot
+        assert page.insert_tuple(b"w") == 3
+        page.delete_tuple(2)
+        assert page.insert_tuple(b"v") == 2
+
+    def test_compaction(self, filled_page_bytes):
+        page = Page(page_id=1, data=filled_page_bytes)
 
         free_before = page.free_space
         # Delete half the tuples
@@ -372,38 +475,31 @@ class TestPage:
         # Remaining tuples should still be accessible
         for i in range(1, 10, 2):
             data = page.get_tuple(i)
-            assert data == f"tuple_{i:04d}".encode()
+            assert data == _PAYLOADS[i]
 
     # ── Checksum ────────────────────────────────────────────────────
 
-    def test_checksum_verification(self):
-        page = Page(page_id=1)
-        page.insert_tuple(b"test data")
-        data = page.to_bytes()
-        restored = Page(page_id=1, data=data)
+    def test_checksum_verification(self, filled_page_bytes):
+        restored = Page(page_id=1, data=filled_page_bytes)
         assert restored.verify_checksum() is True
+        assert restored.get_tuple(9) == b"tuple_0009"
 
     # ── Live Tuple Count ────────────────────────────────────────────
 
-    def test_live_tuple_count(self):
-        page = Page(page_id=1)
-        page.insert_tuple(b"a")
-        page.insert_tuple(b"b")
-        page.insert_tuple(b"c")
-        assert page.live_tuple_count() == 3
+    def test_live_tuple_count(self, filled_page_bytes):
+        page = Page(page_id=1, data=filled_page_bytes)
+        assert page.live_tuple_count() == 10
         page.delete_tuple(1)
-        assert page.live_tuple_count() == 2
+        assert page.live_tuple_count() == 9
 
-    def test_get_all_tuples(self):
-        page = Page(page_id=1)
-        page.insert_tuple(b"a")
-        page.insert_tuple(b"b")
-        page.insert_tuple(b"c")
-        page.delete_tuple(1)
+    def test_get_all_tuples(self, filled_page_bytes):
+        page = Page(page_id=1, data=filled_page_bytes)
+        for i in range(1, 9):
+            page.delete_tuple(i)
         tuples = page.get_all_tuples()
         assert len(tuples) == 2
-        assert tuples[0] == (0, b"a")
-        assert tuples[1] == (2, b"c")
+        assert tuples[0] == (0, b"tuple_0000")
+        assert tuples[1] == (9, b"tuple_0009")
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -440,7 +536,7 @@ class TestRID:
 # ═══════════════════════════════════════════════════════════════════════════
 
 class TestBufferManager:
-    """Test LRU page cache, pin/unpin, dirty tracking, eviction."""
+    """Test CLOCK page cache, pin/unpin, dirty tracking, eviction."""
 
     def test_put_and_get(self):
         buf = BufferManager(capacity=4)
@@ -485,6 +581,61 @@ class TestBufferManager:
         assert buf.get_page("t.tbl", 2) is None
         assert buf.get_page("t.tbl", 1) is not None
 
+    def test_clock_second_chance(self):
+        buf = BufferManager(capacity=3)
+        for pid in (1, 2, 3):
+            buf.put_page("t.tbl", pid, Page(page_id=pid))
+        buf.get_page("t.tbl", 1)
+        buf.get_page("t.tbl", 2)
+
+        # Referenced pages 1 and 2 survive one sweep; their bits are cleared
+        buf.put_page("t.tbl", 4, Page(page_id=4))
+        assert buf.stats()["used"] == 3
+        assert buf.get_page("t.tbl", 3) is None
+
+        # Page 1 is now unreferenced and first under the hand
+        buf.put_page("t.tbl", 5, Page(page_id=5))
+        assert buf.size == 3
+        assert buf.get_page("t.tbl", 1) is None
+        assert buf.get_page("t.tbl", 2) is not None
+
+    def test_lru2_scan_resistance(self):
+        buf = BufferManager(capacity=4, policy=EvictionPolicy.LRU2)
+        for pid in (1, 2):
+            buf.put_page("t.tbl", pid, Page(page_id=pid))
+            buf.get_page("t.tbl", pid)
+
+        # A scan touches each page once; it recycles its own frames
+        for pid in range(10, 20):
+            buf.put_page("t.tbl", pid, Page(page_id=pid))
+        assert buf.get_page("t.tbl", 1) is not None
+        assert buf.get_page("t.tbl", 2) is not None
+
+    def test_lru2_correlated_window(self):
+        buf = BufferManager(capacity=2, policy=EvictionPolicy.LRU2,
+                            correlated_window=5)
+        buf.put_page("t.tbl", 1, Page(page_id=1))
+        buf.get_page("t.tbl", 1)  # correlated with the load: still one ref
+        buf.put_page("t.tbl", 2, Page(page_id=2))
+        buf.put_page("t.tbl", 3, Page(page_id=3))
+        assert buf.get_page("t.tbl", 1) is None
+
+    def test_eviction_prefers_data_pages(self):
+        buf = BufferManager(capacity=3)
+        buf.put_page("t.idx", 0, Page(page_id=0), hint=PageHint.META)
+        buf.put_page("t.idx", 1, Page(page_id=1), hint=PageHint.INTERNAL)
+        buf.put_page("t.idx", 2, Page(page_id=2))
+
+        # Page 2 is most recent but is the only DATA page
+        buf.put_page("t.idx", 3, Page(page_id=3))
+        assert buf.get_page("t.idx", 2) is None
+        assert buf.get_page("t.idx", 0) is not None
+
+        # With no unpinned DATA page left, fall back to plain LRU
+        buf.pin("t.idx", 3)
+        buf.put_page("t.idx", 4, Page(page_id=4))
+        assert buf.get_page("t.idx", 1) is None
+
     def test_flush_all(self):
         buf = BufferManager(capacity=4)
         buf.put_page("t.tbl", 1, Page(page_id=1), dirty=True)
@@ -502,6 +653,19 @@ class TestBufferManager:
         assert evicted is not None  # dirty page evicted
         assert evicted[1] == 1  # page_id of evicted page
 
+    def test_purge_stale(self):
+        buf = BufferManager(capacity=4)
+        buf.put_page("t.tbl", 1, Page(page_id=1), dirty=True)
+        buf.put_page("t.tbl", 2, Page(page_id=2))
+        buf.put_page("t.tbl", 3, Page(page_id=3), dirty=True)
+        buf.pin("t.tbl", 3)
+
+        assert buf.purge_stale(3600) == []  # nothing is that old
+        dirty = buf.purge_stale(0)
+        assert [(fp, pid) for fp, pid, _ in dirty] == [("t.tbl", 1)]
+        assert buf.size == 1  # pinned page 3 stays
+        assert buf.get_page("t.tbl", 3) is not None
+
     def test_stats(self):
         buf = BufferManager(capacity=8)
         buf.put_page("t.tbl", 1, Page(page_id=1), dirty=True)
@@ -512,11 +676,38 @@ class TestBufferManager:
         assert s["dirty"] == 1
         assert s["capacity"] == 8
 
+    def test_write_pages_one_fsync_per_file(self, tmp_path, monkeypatch):
+        paths = [str(tmp_path / "a.tbl"), str(tmp_path / "b.tbl")]
+        for p in paths:
+            with open(p, "wb") as f:
+                f.write(b"\x00" * PAGE_SIZE * 4)
+        buf = BufferManager(capacity=8)
+        for p in paths:
+            for pid in (3, 0, 1):  # runs 0-1 and 3
+                page = Page(page_id=pid)
+                page.insert_tuple(f"{pid}".encode())
+                buf.put_page(p, pid, page, dirty=True)
+
+        fsyncs = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: fsyncs.append(real_fsync(fd)))
+        write_pages(buf.flush_all() + [(str(tmp_path / "gone.tbl"), 0, Page(page_id=0))],
+                    skip_missing=True)
+        assert len(fsyncs) == 2
+
+        for p in paths:
+            with open(p, "rb") as f:
+                data = f.read()
+            for pid in (0, 1, 3):
+                page = Page(pid, data=data[pid * PAGE_SIZE:(pid + 1) * PAGE_SIZE])
+                assert page.get_tuple(0) == f"{pid}".encode()
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 7. Table File Tests — Full CRUD + Persistence
 # ═══════════════════════════════════════════════════════════════════════════
 
+@pytest.mark.needs_buffer
 class TestTableFile:
     """Test table file operations: create, insert, fetch, delete, scan, persistence."""
 
@@ -529,61 +720,43 @@ class TestTableFile:
 
     # ── Insert and Fetch by RID ─────────────────────────────────────
 
-    def test_insert_and_get(self, tmp_dir, user_schema):
-        tbl = self._make_table(tmp_dir, user_schema)
-        rid = tbl.insert_row([1, "Alice", True])
-        row = tbl.get_row(rid)
+    def test_insert_and_get(self, shared_tbl):
+        rid = shared_tbl.insert_row([1, "Alice", True])
+        row = shared_tbl.get_row(rid)
         assert row == [1, "Alice", True]
-        tbl.close()
 
-    def test_insert_with_nulls(self, tmp_dir, user_schema):
-        tbl = self._make_table(tmp_dir, user_schema)
-        rid = tbl.insert_row([2, None, None])
-        row = tbl.get_row(rid)
+    def test_insert_with_nulls(self, shared_tbl):
+        rid = shared_tbl.insert_row([2, None, None])
+        row = shared_tbl.get_row(rid)
         assert row == [2, None, None]
-        tbl.close()
 
-    def test_insert_validation(self, tmp_dir, user_schema):
-        tbl = self._make_table(tmp_dir, user_schema)
+    def test_insert_validation(self, shared_tbl):
         with pytest.raises(ValueError, match="validation"):
-            tbl.insert_row([1, "Alice"])  # Too few columns
-        tbl.close()
+            shared_tbl.insert_row([1, "Alice"])  # Too few columns
 
-    def test_insert_null_violation(self, tmp_dir, user_schema):
-        tbl = self._make_table(tmp_dir, user_schema)
+    def test_insert_null_violation(self, shared_tbl):
         with pytest.raises(ValueError, match="NULL"):
-            tbl.insert_row([None, "Alice", True])  # id is NOT NULL
-        tbl.close()
+            shared_tbl.insert_row([None, "Alice", True])  # id is NOT NULL
 
     # ── Delete ──────────────────────────────────────────────────────
 
-    def test_delete_row(self, tmp_dir, user_schema):
-        tbl = self._make_table(tmp_dir, user_schema)
-        rid = tbl.insert_row([1, "Alice", True])
-        assert tbl.delete_row(rid) is True
-        assert tbl.get_row(rid) is None
-        tbl.close()
+    def test_delete_row(self, shared_tbl):
+        rid = shared_tbl.insert_row([1, "Alice", True])
+        assert shared_tbl.delete_row(rid) is True
+        assert shared_tbl.get_row(rid) is None
 
-    def test_delete_nonexistent(self, tmp_dir, user_schema):
-        tbl = self._make_table(tmp_dir, user_schema)
-        assert tbl.delete_row(RID(99, 0)) is False
-        tbl.close()
+    def test_delete_nonexistent(self, shared_tbl):
+        assert shared_tbl.delete_row(RID(99, 0)) is False
 
     # ── Full Table Scan ─────────────────────────────────────────────
 
     def test_scan(self, tmp_dir, user_schema):
         tbl = self._make_table(tmp_dir, user_schema)
-        expected = []
-        for i in range(10):
-            rid = tbl.insert_row([i, f"user_{i}", i % 2 == 0])
-            expected.append((rid, [i, f"user_{i}", i % 2 == 0]))
+        rows = [[i, f"user_{i}", i % 2 == 0] for i in range(10)]
+        rids = tbl.insert_rows(rows)
 
         results = list(tbl.scan())
-        assert len(results) == 10
-
-        for (exp_rid, exp_vals), (act_rid, act_vals) in zip(expected, results):
-            assert exp_rid == act_rid
-            assert exp_vals == act_vals
+        assert results == list(zip(rids, rows))
         tbl.close()
 
     def test_scan_with_deletes(self, tmp_dir, user_schema):
@@ -595,6 +768,46 @@ class TestTableFile:
         assert len(results) == 3
         tbl.close()
 
+    def test_scan_column(self, tmp_dir, user_schema):
+        tbl = self._make_table(tmp_dir, user_schema)
+        rids = [tbl.insert_row([i, None if i % 2 else f"u{i}", True])
+                for i in range(5)]
+        tbl.delete_row(rids[2])
+        results = list(tbl.scan_column(1))
+        assert results == [(rids[0], "u0"), (rids[1], None),
+                           (rids[3], None), (rids[4], "u4")]
+        tbl.close()
+
+    def test_scan_columnar(self, tmp_dir, user_schema):
+        tbl = self._make_table(tmp_dir, user_schema)
+        rows = [[i, None if i % 3 == 0 else f"u{i}", i % 2 == 0] for i in range(10)]
+        rids = tbl.insert_rows(rows)
+        batches = list(tbl.scan_columnar(batch_size=4))
+        assert [len(b) for b in batches] == [4, 4, 2]
+        assert [rid for b in batches for rid in b.rids] == rids
+        for c in range(3):
+            assert [v for b in batches for v in b.columns[c]] == [r[c] for r in rows]
+        tbl.close()
+
+    def test_scan_prunes_pages_by_column_range(self, tmp_dir, user_schema):
+        tbl = self._make_table(tmp_dir, user_schema)
+        rows = [[i, f"user_{i:04d}_padding_data", True] for i in range(300)]
+        tbl.insert_rows(rows)
+        seen = []
+
+        def page_filter(lo, hi):
+            seen.append((lo, hi))
+            return lo <= 150 <= hi
+
+        hits = [v for _, v in tbl.scan(page_filter) if v[0] == 150]
+        assert hits == [rows[150]]
+        assert len(seen) > 2 and sum(lo <= 150 <= hi for lo, hi in seen) == 1
+        rid, _ = next(tbl.scan(lambda lo, hi: lo <= 0 <= hi))
+        tbl.update_row(rid, [999, "moved", True])  # widens that page's range
+        found = [v[0] for _, v in tbl.scan(lambda lo, hi: hi >= 999)]
+        assert 999 in found and 150 not in found
+        tbl.close()
+
     def test_row_count(self, tmp_dir, user_schema):
         tbl = self._make_table(tmp_dir, user_schema)
         for i in range(7):
@@ -608,36 +821,66 @@ class TestTableFile:
         """Insert enough rows to span multiple pages."""
         tbl = self._make_table(tmp_dir, user_schema)
         n = 200  # Should easily span 2+ pages with STRING data
-        rids = []
-        for i in range(n):
-            rid = tbl.insert_row([i, f"user_{i:04d}_padding_data", i % 2 == 0])
-            rids.append(rid)
+        rows = [[i, f"user_{i:04d}_padding_data", i % 2 == 0] for i in range(n)]
+        rids = tbl.insert_rows(rows)
 
         # Verify data pages > 1
         assert tbl.num_data_pages > 1, f"Expected >1 data pages, got {tbl.num_data_pages}"
 
         # Verify all rows accessible
-        for i, rid in enumerate(rids):
+        for i, rid in zip(range(n), rids):
             row = tbl.get_row(rid)
             assert row is not None, f"Row {i} at {rid} is None"
             assert row[0] == i
 
         tbl.close()
 
-    # ── Persistence After Restart ───────────────────────────────────
-
-    def test_persistence(self, tmp_dir, user_schema):
-        """Data survives close → reopen."""
+    def test_insert_rows_matches_insert_row(self, tmp_dir, user_schema):
+        """Batch insert places rows exactly where single inserts would."""
+        rows = [[i, "x" * (i % 37), None] for i in range(300)]
+        one = TableFile(os.path.join(tmp_dir, "one.tbl"))
+        one.create("one", user_schema)
+        batch = TableFile(os.path.join(tmp_dir, "batch.tbl"))
+        batch.create("batch", user_schema)
+
+        # Free a few slots so first-fit has gaps to reuse
+        for tbl in (one, batch):
+            seed = [tbl.insert_row([i, "y" * 60, True]) for i in range(120)]
+            for rid in seed[::3]:
+                tbl.delete_row(rid)
+
+        assert [one.insert_row(r) for r in rows] == batch.insert_rows(rows)
+        with pytest.raises(ValueError, match="validation"):
+            batch.insert_rows([[1, "ok", True], [None, "bad", True]])
+        one.close()
+        batch.close()
+
+    # ── Persistence After Restart / Buffer Flush Correctness ───────
+
+    # (rows, indices deleted before persisting, how the writer persists)
+    _PERSISTENCE_SCENARIOS = [
+        pytest.param([[i, f"user_{i}", True] for i in range(20)], (), "close",
+                     id="close"),
+        pytest.param([[1, "Alice", True], [2, "Bob", False], [3, "Charlie", True]],
+                     (1,), "close", id="deletes"),
+        pytest.param([[1, "test", True]], (), "flush", id="flush"),
+    ]
+
+    @pytest.mark.parametrize("rows, deleted, persist", _PERSISTENCE_SCENARIOS)
+    def test_persistence(self, tmp_dir, user_schema, rows, deleted, persist):
+        """Inserts and deletes survive close (or an explicit flush) → reopen."""
         path = os.path.join(tmp_dir, "persist.tbl")
 
         # Write
         tbl = TableFile(path)
         tbl.create("persist_test", user_schema)
-        rids = []
-        for i in range(20):
-            rid = tbl.insert_row([i, f"user_{i}", True])
-            rids.append(rid)
-        tbl.close()
+        rids = [tbl.insert_row(row) for row in rows]
+        for i in deleted:
+            tbl.delete_row(rids[i])
+        if persist == "close":
+            tbl.close()
+        else:
+            tbl.flush()  # data must reach disk without closing
 
         # Reset buffer to simulate fresh start
         reset_buffer_manager()
@@ -649,64 +892,20 @@ class TestTableFile:
         assert tbl2.table_name == "persist_test"
         assert tbl2.schema.column_count == 3
 
-        for i, rid in enumerate(rids):
-            row = tbl2.get_row(rid)
-            assert row is not None, f"Row {i} missing after restart"
-            assert row[0] == i
-            assert row[1] == f"user_{i}"
+        for i, (rid, row) in enumerate(zip(rids, rows)):
+            expected = None if i in deleted else row
+            assert tbl2.get_row(rid) == expected, f"Row {i} wrong after restart"
+        assert tbl2.row_count() == len(rows) - len(deleted)
 
         tbl2.close()
 
-    def test_persistence_with_deletes(self, tmp_dir, user_schema):
-        """Deletes persist across restart."""
-        path = os.path.join(tmp_dir, "deletes.tbl")
-
-        tbl = TableFile(path)
-        tbl.create("del_test", user_schema)
-        r1 = tbl.insert_row([1, "Alice", True])
-        r2 = tbl.insert_row([2, "Bob", False])
-        r3 = tbl.insert_row([3, "Charlie", True])
-        tbl.delete_row(r2)
-        tbl.close()
-
-        reset_buffer_manager()
-
-        tbl2 = TableFile(path)
-        tbl2.open()
-        assert tbl2.get_row(r1) == [1, "Alice", True]
-        assert tbl2.get_row(r2) is None  # deleted
-        assert tbl2.get_row(r3) == [3, "Charlie", True]
-        assert tbl2.row_count() == 2
-        tbl2.close()
-
-    # ── Buffer Flush Correctness ────────────────────────────────────
-
-    def test_buffer_flush(self, tmp_dir, user_schema):
-        """Explicit flush makes data persistent without closing."""
-        path = os.path.join(tmp_dir, "flush.tbl")
-
-        tbl = TableFile(path)
-        tbl.create("flush_test", user_schema)
-        rid = tbl.insert_row([1, "test", True])
-        tbl.flush()
-
-        # Read directly from disk to verify
-        reset_buffer_manager()
-        tbl2 = TableFile(path)
-        tbl2.open()
-        row = tbl2.get_row(rid)
-        assert row == [1, "test", True]
-        tbl2.close()
-
     # ── Update ──────────────────────────────────────────────────────
 
-    def test_update_row(self, tmp_dir, user_schema):
-        tbl = self._make_table(tmp_dir, user_schema)
-        rid = tbl.insert_row([1, "Alice", True])
-        assert tbl.update_row(rid, [1, "Updated", False]) is True
-        row = tbl.get_row(rid)
+    def test_update_row(self, shared_tbl):
+        rid = shared_tbl.insert_row([1, "Alice", True])
+        assert shared_tbl.update_row(rid, [1, "Updated", False]) is True
+        row = shared_tbl.get_row(rid)
         assert row == [1, "Updated", False]
-        tbl.close()
 
     # ── All Five Data Types ─────────────────────────────────────────
 
@@ -767,6 +966,19 @@ class TestCatalog:
         assert result == "users.tbl"
         assert "users" not in cat.list_tables()
 
+    def test_schema_lookup_memoized_until_ddl(self, tmp_dir, user_schema,
+                                              full_schema):
+        cat = Catalog(tmp_dir)
+        cat.load()
+        cat.create_table("users", user_schema)
+        schema = cat.get_table_schema("USERS")
+        assert schema == user_schema
+        assert cat.get_table_schema("users") is schema
+        cat.drop_table("users")
+        assert cat.get_table_schema("users") is None
+        cat.create_table("users", full_schema)
+        assert cat.get_table_schema("users") == full_schema
+
     def test_get_schema(self, tmp_dir, user_schema):
         cat = Catalog(tmp_dir)
         cat.load()
@@ -776,6 +988,18 @@ class TestCatalog:
         assert schema.column_count == 3
         assert schema.column_names() == ["id", "name", "active"]
 
+    def test_table_file_cached_until_drop(self, tmp_dir, user_schema):
+        cat = Catalog(tmp_dir)
+        cat.load()
+        cat.create_table("users", user_schema)
+        path = cat.get_table_file("USERS")
+        assert path == os.path.join(cat.data_dir, "users.tbl")
+        assert cat.get_table_file("users") is path
+        cat.drop_table("users")
+        assert cat.get_table_file("users") is None
+        cat.create_table("users", user_schema, file_name="users_v2.tbl")
+        assert cat.get_table_file("users").endswith("users_v2.tbl")
+
     def test_catalog_survives_restart(self, tmp_dir, user_schema):
         """Catalog data persists after close and reopen."""
         cat1 = Catalog(tmp_dir)
@@ -829,7 +1053,7 @@ class TestPageHardening:
         data[PAGE_SIZE - 1] ^= 0xFF  # flip bits
 
         with pytest.raises(PageCorruptionError, match="CRC mismatch"):
-            Page(page_id=1, data=bytes(data))
+            Page(page_id=1, data=data)
 
     def test_crc_skip_verification(self):
         """Pages can be loaded without CRC check if verify=False."""
@@ -839,9 +1063,29 @@ class TestPageHardening:
         data[PAGE_SIZE - 1] ^= 0xFF  # corrupt
 
         # Should NOT raise with verify=False
-        loaded = Page(page_id=1, data=bytes(data), verify=False)
+        loaded = Page(page_id=1, data=memoryview(data), verify=False)
         assert loaded.page_id == 1
 
+    def test_page_copies_mutable_buffer(self):
+        """A page loaded from a bytearray does not alias the caller's buffer."""
+        page = Page(page_id=1)
+        slot = page.insert_tuple(b"data")
+        data = bytearray(page.to_bytes())
+        loaded = Page(page_id=1, data=data)
+        data[:] = bytes(PAGE_SIZE)
+        assert loaded.get_tuple(slot) == b"data"
+
+    def test_page_to_buffer_is_checksummed_view(self):
+        """to_buffer() stamps the CRC and exposes the page without copying."""
+        page = Page(page_id=1)
+        page.insert_tuple(b"data")
+        view = page.to_buffer()
+        assert view.readonly and len(view) == PAGE_SIZE
+        assert view == page.to_bytes()
+        assert Page(page_id=1, data=view).verify_checksum()
+        page.insert_tuple(b"more")
+        assert view[HEADER_SIZE:] == page.to_bytes()[HEADER_SIZE:]  # shared
+
     def test_structural_invariant_free_space_overlap(self):
         """Page rejects data where free_start is corrupted."""
         page = Page(page_id=1)
@@ -855,7 +1099,7 @@ class TestPageHardening:
         st.pack_into(">I", data, 14, 0)
 
         with pytest.raises(PageCorruptionError):
-            Page(page_id=1, data=bytes(data))
+            Page(page_id=1, data=data)
 
     def test_compaction_preserves_rids(self):
         """Compaction must not change slot IDs — only physical offsets."""
@@ -952,7 +1196,33 @@ class TestCatalogHardening:
         assert data["format_version"] == 1
         assert "schema_evolution" in data
 
+    def test_catalog_reload_sees_changes(self, tmp_dir, user_schema):
+        """Reloading reuses parsed metadata only while catalog.dat is unchanged."""
+        cat1 = Catalog(tmp_dir)
+        cat1.load()
+        cat1.create_table("users", user_schema)
+
+        cat2 = Catalog(tmp_dir)
+        cat2.load()
+        cat2.create_table("orders", user_schema)
+        assert cat1.list_tables() == ["users"]  # instances stay independent
+
+        cat1.load()
+        assert cat1.list_tables() == ["orders", "users"]
+
+        # An external rewrite of catalog.dat is picked up on the next load
+        path = os.path.join(tmp_dir, "catalog.dat")
+        with open(path, "r") as f:
+            data = json.load(f)
+        del data["tables"]["orders"]
+        with open(path, "w") as f:
+            json.dump(data, f)
+        cat3 = Catalog(tmp_dir)
+        cat3.load()
+        assert cat3.list_tables() == ["users"]
+
 
+@pytest.mark.needs_buffer
 class TestScanDeterminism:
     """Verify full table scan produces deterministic order."""
 
@@ -975,6 +1245,7 @@ class TestScanDeterminism:
 # 9. Integration Test — Full Workflow
 # ═══════════════════════════════════════════════════════════════════════════
 
+@pytest.mark.needs_buffer
 class TestIntegration:
     """End-to-end test: catalog + table + CRUD + persistence."""
 
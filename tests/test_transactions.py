@@ -9,7 +9,11 @@ import sys
 import shutil
 import struct
 import tempfile
+import threading
+import time
 import unittest
+import zlib
+from unittest import mock
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -20,6 +24,7 @@ from storage.schema import Schema, Column
 from storage.types import DataType
 from storage.serializer import serialize_row, deserialize_row
 from catalog.catalog import Catalog
+import transactions.wal as wal_module
 from transactions.wal import LogManager, WALRecordType, WALEntry, NULL_LSN, WAL_PADDING
 from transactions.transaction import TransactionManager, TransactionState
 from transactions.recovery import RecoveryManager
@@ -123,6 +128,145 @@ class TestWALBasics(unittest.TestCase):
             lm2.read_record(lsn)
         lm2.close()
 
+    def test_read_record_torn_tail(self):
+        """A record cut short or with a bogus length reports EOF."""
+        lsn = self.lm.append_insert(1, NULL_LSN, "t", 0, 0, b"data")
+        self.lm.close()
+        wal_path = os.path.join(self.tmp, "wal.log")
+        with open(wal_path, "r+b") as f:
+            f.seek(lsn)
+            f.write(struct.pack(">I", 0xFFFFFFF0))
+        self.lm = LogManager(self.tmp)
+        with self.assertRaisesRegex(ValueError, "EOF"):
+            self.lm.read_record(lsn)
+
+    def test_scan_sees_unflushed_and_detects_corruption(self):
+        """scan() reads appends not yet flushed and checks every CRC."""
+        self.lm.append_begin(1)
+        lsn = self.lm.append_insert(1, NULL_LSN, "t", 0, 0, b"data")
+        recs = list(self.lm.scan())
+        self.assertEqual([r.lsn for r in recs], [WAL_PADDING, lsn])
+        self.assertEqual(recs[1].payload, self.lm.read_record(lsn).payload)
+
+        self.lm.flush()
+        wal_path = os.path.join(self.tmp, "wal.log")
+        with open(wal_path, "r+b") as f:
+            f.seek(lsn + 20)
+            f.write(b"\xFF")
+        with self.assertRaises(ValueError):
+            list(self.lm.scan())
+
+    def test_appends_staged_until_flush(self):
+        """Appends are batched in memory; reads and flushes write them out."""
+        wal_path = os.path.join(self.tmp, "wal.log")
+        lsns = [self.lm.append_insert(1, NULL_LSN, "t", 0, i, b"row")
+                for i in range(5)]
+        self.assertEqual(os.path.getsize(wal_path), WAL_PADDING)
+        self.assertEqual(self.lm.read_record(lsns[-1]).lsn, lsns[-1])
+        self.lm.append_begin(2)
+        self.lm.flush()
+        self.assertEqual(os.path.getsize(wal_path), self.lm.next_lsn)
+
+    def test_preallocated_log_reopens_at_last_record(self):
+        """A zero-filled extent is not log: reopening resumes after the records."""
+        self.lm.close()
+        wal_path = os.path.join(self.tmp, "wal.log")
+        self.lm = LogManager(self.tmp, preallocate=8192)
+        begin = self.lm.append_begin(1)
+        self.lm.append_commit(1, begin)
+        end = self.lm.next_lsn
+        self.assertEqual(os.path.getsize(wal_path), 8192)
+        self.lm.close()
+
+        self.lm = LogManager(self.tmp, preallocate=8192)
+        self.assertEqual(self.lm.next_lsn, end)
+        self.assertEqual(self.lm.append_begin(2), end)
+        self.assertEqual([r.txn_id for r in self.lm.scan()], [1, 1, 2])
+        self.assertEqual(os.path.getsize(wal_path), 8192)
+
+    @unittest.skipUnless(wal_module._HAS_VECTORED_IO, "needs os.pwritev")
+    def test_staged_records_written_as_iovecs(self):
+        """A drain hands records to pwritev in IOV_MAX-sized batches."""
+        n = wal_module._IOV_MAX + 10
+        with mock.patch.object(wal_module, "WAL_APPEND_BUFFER_SIZE", 1 << 30), \
+                mock.patch.object(wal_module.os, "pwritev",
+                                  wraps=os.pwritev) as pwritev:
+            lsns = [self.lm.append_insert(1, NULL_LSN, "t", 0, i, b"row")
+                    for i in range(n)]
+            self.lm.flush()
+        self.assertEqual(pwritev.call_count, 2)
+        self.assertEqual([e.lsn for e in self.lm.scan()], lsns)
+        self.assertEqual(self.lm.read_record(lsns[-1]).lsn, lsns[-1])
+
+    def test_batch_entries_share_batch_buffer(self):
+        """Entries built from a batch view its buffer instead of copying."""
+        self.lm.append_insert(1, NULL_LSN, "t", 0, 0, b"data")
+        (batch,) = self.lm.scan_batch()
+        entry = batch.entry(0)
+        self.assertIsInstance(entry.payload, memoryview)
+        self.assertIs(entry.payload.obj, batch.buffer)
+        self.assertEqual(LogManager.parse_dml_payload(entry.payload)[3], b"data")
+
+    @unittest.skipUnless(wal_module._HAS_FADVISE, "needs os.posix_fadvise")
+    def test_advise_sequential(self):
+        """The WAL fd is advised for a sequential read ahead of time."""
+        with mock.patch.object(wal_module.os, "posix_fadvise") as fadvise:
+            self.lm.advise_sequential()
+        advice = [c.args[3] for c in fadvise.call_args_list]
+        self.assertEqual(advice, [os.POSIX_FADV_SEQUENTIAL, os.POSIX_FADV_WILLNEED])
+
+    @unittest.skipUnless(wal_module._HAS_FADVISE, "needs os.posix_fadvise")
+    def test_scan_releases_consumed_windows(self):
+        """Scans drop the log pages behind them one window at a time."""
+        window = wal_module.mmap.PAGESIZE
+        lsns = [self.lm.append_insert(1, NULL_LSN, "t", 0, i, b"x" * 200)
+                for i in range(60)]
+        for scan in (self.lm.scan, self.lm.scan_batch):
+            with mock.patch.object(wal_module, "SCAN_WINDOW", window), \
+                    mock.patch.object(wal_module.os, "posix_fadvise") as fadvise:
+                kwargs = {"batch_size": 8} if scan == self.lm.scan_batch else {}
+                list(scan(**kwargs))
+            released = [c.args[1:3] for c in fadvise.call_args_list
+                        if c.args[3] == os.POSIX_FADV_DONTNEED]
+            self.assertTrue(released)
+            self.assertEqual(released[0][0], 0)
+            for (off, n), (next_off, _) in zip(released, released[1:]):
+                self.assertEqual(off + n, next_off)  # contiguous, in order
+            self.assertLessEqual(sum(n for _, n in released), self.lm.next_lsn)
+        self.assertEqual([r.lsn for r in self.lm.scan()], lsns)
+
+    def test_pack_dml_layout(self):
+        """DML payloads are the table/RID header plus length-prefixed images."""
+        payload = LogManager._pack_dml("tbl", 7, 2, b"old", b"")
+        self.assertEqual(bytes(payload), LogManager._pack_table_rid("tbl", 7, 2)
+                         + b"\x00\x03old" + b"\x00\x00")
+        tname, pid, sid, old, new = LogManager.parse_update_payload(payload)
+        self.assertEqual((tname, pid, sid, bytes(old), bytes(new)),
+                         ("tbl", 7, 2, b"old", b""))
+
+    def test_image_parsers_skip_table_name(self):
+        """Redo's parsers return the same images without the table name."""
+        payload = LogManager._pack_dml("tbl", 7, 2, b"old", b"new")
+        with mock.patch.object(LogManager, "_parse_table_rid") as parse_rid:
+            sid, old, new = LogManager.parse_update_images(payload)
+            sid2, data = LogManager.parse_dml_image(payload)
+        parse_rid.assert_not_called()
+        self.assertEqual((sid, bytes(old), bytes(new)), (2, b"old", b"new"))
+        self.assertEqual((sid2, bytes(data)), (2, b"old"))
+
+    def test_scan_batch_matches_scan(self):
+        """Batches hold the same records as scan(), column by column."""
+        self.lm.append_begin(1)
+        for i in range(7):
+            self.lm.append_insert(1, NULL_LSN, "t", 0, i, b"row%d" % i)
+        self.lm.append_commit(1, NULL_LSN)
+        batches = list(self.lm.scan_batch(batch_size=4))
+        self.assertEqual([len(b) for b in batches], [4, 4, 1])
+        entries = [b.entry(i) for b in batches for i in range(len(b))]
+        self.assertEqual(entries, list(self.lm.scan()))
+        self.assertEqual(bytes(batches[1].payload(0)), entries[4].payload)
+        self.assertEqual(batches[-1].end, self.lm.next_lsn)
+
     def test_clr_payload(self):
         """CLR stores undo_next_lsn and inner operation."""
         lsn = self.lm.append_clr(1, NULL_LSN, 42,
@@ -134,6 +278,28 @@ class TestWALBasics(unittest.TestCase):
         self.assertEqual(inner_type, WALRecordType.DELETE)
         self.assertEqual(inner_payload, b"clr_inner")
 
+    def test_nested_clr_payload_is_not_copied(self):
+        """Parsing a CLR's inner DML payload returns views of the record."""
+        inner = LogManager._pack_table_rid("t", 7, 2) + b"\x00\x03abc"
+        lsn = self.lm.append_clr(1, NULL_LSN, 0, WALRecordType.INSERT, inner)
+        rec = self.lm.read_record(lsn)
+        _, _, inner_payload = LogManager.parse_clr_payload(rec.payload)
+        tname, pid, sid, data = LogManager.parse_dml_payload(inner_payload)
+        self.assertEqual((tname, pid, sid, data), ("t", 7, 2, b"abc"))
+        # read_record's payload is itself a read-only view of the record buffer
+        self.assertIs(data.obj, rec.payload.obj)
+        self.assertTrue(rec.payload.readonly)
+
+    def test_read_record_crcs_without_copying(self):
+        """read_record hands crc32 a view of the record buffer, not a slice copy."""
+        lsn = self.lm.append_insert(1, NULL_LSN, "t", 0, 0, b"x" * 100)
+        with mock.patch.object(wal_module.zlib, "crc32",
+                               wraps=zlib.crc32) as crc32:
+            rec = self.lm.read_record(lsn)
+        crc32.assert_called_once()
+        self.assertIsInstance(crc32.call_args.args[0], memoryview)
+        self.assertEqual(bytes(rec.payload[-100:]), b"x" * 100)
+
     def test_checkpoint_payload(self):
         """CHECKPOINT stores active transaction list."""
         lsn = self.lm.append_checkpoint([(10, 100), (20, 200)])
@@ -170,6 +336,73 @@ class TestWALBasics(unittest.TestCase):
         self.assertGreater(self.lm.durable_lsn, initial)
 
 
+    def test_group_commit_shares_syncs(self):
+        """Concurrent commits are all durable, with fewer syncs than commits."""
+        n = 8
+        syncs = []
+        real_sync = wal_module._fdatasync
+
+        def slow_sync(fd):
+            syncs.append(fd)
+            time.sleep(0.02)  # hold the sync so other committers queue up
+            real_sync(fd)
+
+        barrier = threading.Barrier(n)
+        lsns = [None] * n
+
+        def commit(i):
+            begin = self.lm.append_begin(i + 1)
+            barrier.wait()
+            lsns[i] = self.lm.append_commit(i + 1, begin)
+
+        with mock.patch.object(wal_module, "_fdatasync", slow_sync):
+            threads = [threading.Thread(target=commit, args=(i,)) for i in range(n)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertTrue(all(lsn < self.lm.durable_lsn for lsn in lsns))
+        self.assertEqual(self.lm.durable_lsn, self.lm.next_lsn)
+        self.assertLess(len(syncs), n)
+        commits = [r for r in self.lm.scan() if r.record_type == WALRecordType.COMMIT]
+        self.assertEqual(sorted(r.lsn for r in commits), sorted(lsns))
+
+    def test_commit_delay_gathers_one_group(self):
+        """With a commit delay, commits arriving together share one sync."""
+        self.lm.close()
+        self.lm = LogManager(self.tmp, commit_delay=0.2)
+        n = 4
+        syncs = []
+        real_sync = wal_module._fdatasync
+        barrier = threading.Barrier(n)
+
+        def commit(i):
+            begin = self.lm.append_begin(i + 1)
+            barrier.wait()
+            self.lm.append_commit(i + 1, begin)
+
+        with mock.patch.object(wal_module, "_fdatasync",
+                               lambda fd: syncs.append(real_sync(fd))):
+            threads = [threading.Thread(target=commit, args=(i,)) for i in range(n)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(syncs), 1)
+        self.assertEqual(self.lm.durable_lsn, self.lm.next_lsn)
+
+    def test_lone_commit_skips_delay(self):
+        """Below commit_siblings waiting committers, the leader does not wait."""
+        self.lm.close()
+        self.lm = LogManager(self.tmp, commit_delay=5.0, commit_siblings=1)
+        begin = self.lm.append_begin(1)
+        with mock.patch.object(wal_module.time, "sleep") as sleep:
+            lsn = self.lm.append_commit(1, begin)
+        sleep.assert_not_called()
+        self.assertGreater(self.lm.durable_lsn, lsn)
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 2. Page LSN Tests
 # ═══════════════════════════════════════════════════════════════════════════
@@ -283,6 +516,32 @@ class TestTransactionManager(unittest.TestCase):
         self.assertIn(WALRecordType.CLR, types)
         self.assertEqual(types[-1], WALRecordType.ABORT)
 
+    def test_dml_logging_takes_no_mutex(self):
+        """log_* helpers touch only the txn's own chain: no global lock."""
+        tid = self.tm.begin()
+        with mock.patch.object(self.tm, "_mutex") as mutex:
+            lsn1 = self.tm.log_insert(tid, "test", 0, 0, b"a")
+            lsn2 = self.tm.log_update(tid, "test", 0, 0, b"a", b"b")
+        mutex.__enter__.assert_not_called()
+        self.assertEqual(self.lm.read_record(lsn2).prev_lsn, lsn1)
+        self.assertEqual(self.tm.get_last_lsn(tid), lsn2)
+        self.tm.commit(tid)
+
+    def test_abort_undoes_from_memory(self):
+        """Abort takes logged changes from the undo cache, not the WAL."""
+        tid = self.tm.begin()
+        self.tm.log_insert(tid, "test", 0, 0, b"new")
+        self.tm.log_update(tid, "test", 0, 1, b"old", b"upd")
+        self.tm.log_delete(tid, "test", 0, 2, b"gone")
+        with mock.patch.object(self.lm, "read_record",
+                               wraps=self.lm.read_record) as read_record:
+            self.tm.abort(tid)
+        read_record.assert_not_called()
+        clrs = [LogManager.parse_clr_payload(r.payload)[1]
+                for r in self.lm.scan() if r.record_type == WALRecordType.CLR]
+        self.assertEqual(clrs, [WALRecordType.INSERT, WALRecordType.UPDATE,
+                                WALRecordType.DELETE])
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 4. End-to-End Transaction Tests with Executor
@@ -372,6 +631,186 @@ class TestRecovery(unittest.TestCase):
         finally:
             shutil.rmtree(tmp, ignore_errors=True)
 
+    def test_undo_skips_begin_only_txns(self):
+        """Uncommitted txns without changes are aborted without a chain walk."""
+        tmp = _make_tmp()
+        try:
+            lm = LogManager(tmp)
+            lm.append_begin(1)
+            lm.append_begin(2)
+            prev = lm.append_begin(3)
+            lm.append_insert(3, prev, "t", 1, 0, b"data")
+
+            bm = BufferManager(capacity=16)
+            tm = TransactionManager(lm, bm, tmp)
+            rm = RecoveryManager(lm, tm, bm, tmp)
+            with mock.patch.object(tm, "_undo_txn", wraps=tm._undo_txn) as undo:
+                stats = rm.recover()
+            self.assertEqual(stats["undo_count"], 3)
+            self.assertEqual([c.args[0] for c in undo.call_args_list], [3])
+            for tid in (1, 2, 3):
+                self.assertEqual(tm._txns[tid].state, TransactionState.ABORTED)
+            lm.close()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_recovery_reads_wal_once(self):
+        """Analysis collects the redo records; redo does not rescan."""
+        tmp = _make_tmp()
+        try:
+            lm = LogManager(tmp)
+            lm.append_begin(1)
+            lsn = lm.append_insert(1, NULL_LSN, "t", 1, 0, b"data")
+            lm.append_commit(1, lsn)
+
+            bm = BufferManager(capacity=16)
+            tm = TransactionManager(lm, bm, tmp)
+            rm = RecoveryManager(lm, tm, bm, tmp)
+            with mock.patch.object(lm, "scan", wraps=lm.scan) as scan, \
+                    mock.patch.object(lm, "scan_batch",
+                                      wraps=lm.scan_batch) as scan_batch:
+                stats = rm.recover()
+            self.assertEqual(stats["committed_txns"], 1)
+            self.assertEqual(scan.call_count + scan_batch.call_count, 1)
+            lm.close()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_redo_skips_pages_already_current(self):
+        """A page whose page_lsn covers its records is checked only once."""
+        tmp = _make_tmp()
+        try:
+            bm = BufferManager(capacity=16)
+            path = os.path.join(tmp, "t.tbl")
+            tbl = TableFile(path, bm)
+            tbl.create("t", Schema(columns=[Column("id", DataType.INT)]))
+            tbl.close()
+
+            lm = LogManager(tmp)
+            prev = lm.append_begin(1)
+            for sid in range(3):
+                prev = lm.append_insert(1, prev, "t", 1, sid, b"row")
+            lm.append_commit(1, prev)
+            page = Page(page_id=1)
+            page.page_lsn = lm.next_lsn
+            bm.put_page(path, 1, page)
+
+            tm = TransactionManager(lm, bm, tmp)
+            rm = RecoveryManager(lm, tm, bm, tmp)
+            with mock.patch.object(rm, "_should_redo",
+                                   wraps=rm._should_redo) as should_redo:
+                stats = rm.recover()
+            self.assertEqual(stats["redo_count"], 0)
+            self.assertEqual(should_redo.call_count, 1)
+            lm.close()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_redo_leaves_current_pages_unreferenced(self):
+        """Checking a current page's LSN does not set its reference bit."""
+        tmp = _make_tmp()
+        try:
+            bm = BufferManager(capacity=16)
+            path = os.path.join(tmp, "t.tbl")
+            tbl = TableFile(path, bm)
+            tbl.create("t", Schema(columns=[Column("id", DataType.INT)]))
+            tbl.close()
+
+            lm = LogManager(tmp)
+            prev = lm.append_begin(1)
+            prev = lm.append_insert(1, prev, "t", 1, 0, b"row")
+            lm.append_commit(1, prev)
+            page = Page(page_id=1)
+            page.page_lsn = lm.next_lsn
+            bm.put_page(path, 1, page)
+
+            tm = TransactionManager(lm, bm, tmp)
+            rm = RecoveryManager(lm, tm, bm, tmp)
+            with mock.patch.object(bm, "get_page",
+                                   wraps=bm.get_page) as get_page:
+                stats = rm.recover()
+            self.assertEqual(stats["redo_count"], 0)
+            get_page.assert_not_called()
+            self.assertEqual(bm._ref[bm._index[(path, 1)]], 0)
+            lm.close()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_redo_resolves_each_page_once(self):
+        """Records for the same page share one lookup and one mark_dirty."""
+        tmp = _make_tmp()
+        try:
+            bm = BufferManager(capacity=16)
+            path = os.path.join(tmp, "t.tbl")
+            tbl = TableFile(path, bm)
+            tbl.create("t", Schema(columns=[Column("id", DataType.INT)]))
+            tbl.close()
+
+            lm = LogManager(tmp)
+            prev = lm.append_begin(1)
+            for sid in range(3):
+                prev = lm.append_insert(1, prev, "t", 1, sid, b"row")
+            last_insert = prev
+            lm.append_commit(1, prev)
+            page = Page(page_id=1)
+            bm.put_page(path, 1, page)
+
+            tm = TransactionManager(lm, bm, tmp)
+            rm = RecoveryManager(lm, tm, bm, tmp)
+            with mock.patch.object(bm, "mark_dirty",
+                                   wraps=bm.mark_dirty) as mark_dirty:
+                stats = rm.recover()
+            self.assertEqual(stats["redo_count"], 3)
+            mark_dirty.assert_called_once_with(path, 1)
+            self.assertEqual(page.page_lsn, last_insert)
+            lm.close()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def test_table_paths_resolved_once(self):
+        """Redo and undo join each table's file path once, not per record."""
+        lm = mock.MagicMock()
+        bm = BufferManager(capacity=4)
+        tm = TransactionManager(lm, bm, "/data")
+        rm = RecoveryManager(lm, tm, bm, "/data")
+        expected = os.path.join("/data", "t.tbl")
+        with mock.patch("os.path.join", wraps=os.path.join) as join:
+            for mgr in (tm, rm):
+                for _ in range(3):
+                    self.assertEqual(mgr._path_for("t"), expected)
+        self.assertEqual(join.call_count, 2)  # one miss per manager
+
+    def test_parallel_analysis_matches_serial(self):
+        """Segmented analysis merges to the same result as one scan."""
+        tmp = _make_tmp()
+        try:
+            lm = LogManager(tmp)
+            last = {}
+            for tid in range(1, 9):
+                last[tid] = lm.append_begin(tid)
+            for i in range(40):
+                tid = i % 8 + 1
+                last[tid] = lm.append_insert(tid, last[tid], "t", 1, i, b"x" * 50)
+            for tid in (1, 4, 7):
+                lm.append_commit(tid, last[tid])
+            lm.append_abort(2, last[2])
+
+            bm = BufferManager(capacity=16)
+            tm = TransactionManager(lm, bm, tmp)
+            rm = RecoveryManager(lm, tm, bm, tmp)
+            bounds = lm.segment_bounds(512)
+            self.assertGreater(len(bounds), 2)
+            self.assertEqual(bounds[-1][1], lm.next_lsn)
+
+            serial = rm._analysis()
+            self.assertEqual(rm._analysis_parallel(n_workers=2, segment_size=512),
+                             serial)
+            self.assertEqual(serial[0], {1, 4, 7})
+            self.assertEqual(sorted(serial[1]), [3, 5, 6, 8])
+            lm.close()
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
     def test_empty_wal_recovery(self):
         """Recovery on empty WAL is a no-op."""
         tmp = _make_tmp()
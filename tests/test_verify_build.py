@@ -0,0 +1,58 @@
+"""
+Tests for verify_build's test-result cache.
+
+The checksums, the pytest run and the report are stubbed, so these tests
+never touch build_integrity/ or spawn pytest.
+"""
+
+import sys
+
+import pytest
+
+import verify_build
+
+
+@pytest.fixture
+def cached_main(tmp_path, monkeypatch):
+    """Run verify_build.main() for one feature; return the test paths it ran."""
+    checksums = {
+        "catalog/catalog.py": "a" * 64,
+        "storage/table.py": "b" * 64,
+        "tests/conftest.py": "c" * 64,
+        "tests/test_storage.py": "d" * 64,
+    }
+    ran = []
+
+    def run_all_feature_tests(features):
+        paths = sorted({verify_build._feature_test_path(f)[0] for f in features})
+        ran.append(paths)
+        return {p: (True, "1 passed") for p in paths}
+
+    monkeypatch.setattr(verify_build, "VERIFY_CACHE_FILE", tmp_path / "verify_cache.json")
+    monkeypatch.setattr(verify_build, "compute_all_checksums",
+                        lambda root, force=False: dict(checksums))
+    monkeypatch.setattr(verify_build, "load_stored_checksums", lambda: dict(checksums))
+    monkeypatch.setattr(verify_build, "save_checksums", lambda c: None)
+    monkeypatch.setattr(verify_build, "print_report", lambda *args: None)
+    monkeypatch.setattr(verify_build, "run_all_feature_tests", run_all_feature_tests)
+    monkeypatch.setattr(sys, "argv", ["verify_build.py", "--feature", "storage_engine"])
+
+    def run():
+        verify_build.main()
+        return ran.pop()
+
+    run.checksums = checksums
+    return run
+
+
+def test_cached_pass_skips_rerun(cached_main):
+    assert cached_main() == ["tests/test_storage.py"]
+    assert cached_main() == []
+
+
+def test_change_outside_dependency_closure_reruns_tests(cached_main):
+    # test_storage.py imports the catalog, which belongs to a feature
+    # that depends on storage_engine, not the other way round
+    assert cached_main() == ["tests/test_storage.py"]
+    cached_main.checksums["catalog/catalog.py"] = "e" * 64
+    assert cached_main() == ["tests/test_storage.py"]
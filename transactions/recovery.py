@@ -11,11 +11,103 @@ Guarantees:
 """
 
 import os
-from typing import Dict, Set
-
-from transactions.wal import LogManager, WALRecordType, WALEntry, NULL_LSN
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+from operator import eq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from transactions.wal import (
+    LogManager, WALRecordType, WALEntry, WALBatch, NULL_LSN, WAL_PADDING,
+    scan_segment_batches,
+)
 from transactions.transaction import TransactionManager, TransactionState
-from storage.page import PAGE_SIZE
+from storage.buffer import write_pages
+from storage.page import Page
+
+
+# Below this WAL size the analysis scan runs in-process; above it the log
+# is split into segments of ANALYSIS_SEGMENT_SIZE scanned by a process pool.
+PARALLEL_ANALYSIS_MIN_BYTES = 64 * 1024 * 1024
+ANALYSIS_SEGMENT_SIZE = 16 * 1024 * 1024
+
+
+@dataclass
+class _SegmentSummary:
+    """What analysis needs from one stretch of the log."""
+    begun: Set[int] = field(default_factory=set)
+    committed: Set[int] = field(default_factory=set)
+    aborted: Set[int] = field(default_factory=set)
+    last_lsn: Dict[int, int] = field(default_factory=dict)  # txn_id -> LSN
+    # txn_id -> {(table, page_id): LSN of its last redoable record there}
+    page_lsn: Dict[int, Dict[Tuple[str, int], int]] = field(default_factory=dict)
+    max_txn_id: int = 0
+    end: int = 0
+
+
+# Record types the redo pass replays
+_REDO_TYPES = frozenset((WALRecordType.INSERT, WALRecordType.DELETE,
+                         WALRecordType.UPDATE, WALRecordType.CLR))
+
+# Plain ints, compared against raw WALBatch.types values
+_BEGIN = int(WALRecordType.BEGIN)
+_COMMIT = int(WALRecordType.COMMIT)
+_ABORT = int(WALRecordType.ABORT)
+
+
+def _redo_page(entry: WALEntry) -> Tuple[str, int]:
+    """(table_name, page_id) touched by an INSERT/DELETE/UPDATE/CLR record."""
+    return _payload_page(entry.record_type, memoryview(entry.payload))
+
+
+def _payload_page(rtype: int, payload: memoryview) -> Tuple[str, int]:
+    if rtype == WALRecordType.CLR:
+        payload = LogManager.parse_clr_payload(payload)[2]
+    table_name, page_id, _, _ = LogManager._parse_table_rid(payload)
+    return table_name, page_id
+
+
+def _summarize(batches: Iterable[WALBatch], start: int,
+               redo: Optional[List[WALEntry]] = None) -> _SegmentSummary:
+    """
+    Summarize decoded batches; if redo is a list, also collect redoable
+    records. WALEntry objects are built only for the records collected.
+
+    Header-only bookkeeping is done per column, not per record: each set
+    is filled by one compress()/map() pass over the batch arrays, which
+    runs in C. Only redoable records, whose payload names a page, take a
+    Python-level loop. CHECKPOINT records list the txns active at that
+    point; the full scan recovers the same information, so they are
+    not consulted.
+    """
+    seg = _SegmentSummary(end=start)
+    for batch in batches:
+        txn_ids, types, lsns = batch.txn_ids, batch.types, batch.lsns
+        seg.last_lsn.update(zip(txn_ids, lsns))
+        seg.max_txn_id = max(seg.max_txn_id, max(txn_ids))
+        seg.end = batch.end
+        seg.begun.update(compress(txn_ids, map(eq, types, repeat(_BEGIN))))
+        seg.committed.update(compress(txn_ids, map(eq, types, repeat(_COMMIT))))
+        seg.aborted.update(compress(txn_ids, map(eq, types, repeat(_ABORT))))
+
+        for i in compress(range(len(types)), map(_REDO_TYPES.__contains__, types)):
+            tid = txn_ids[i]
+            pages = seg.page_lsn.get(tid)
+            if pages is None:
+                pages = seg.page_lsn[tid] = {}
+            if redo is None:
+                payload = batch.payload(i)
+            else:
+                entry = batch.entry(i)
+                redo.append(entry)
+                payload = entry.payload
+            pages[_payload_page(types[i], payload)] = lsns[i]
+    return seg
+
+
+def _analyze_segment(wal_path: str, start: int, end: int) -> _SegmentSummary:
+    """Process-pool worker for RecoveryManager._analysis_parallel."""
+    return _summarize(scan_segment_batches(wal_path, start, end), start)
 
 
 class RecoveryManager:
@@ -36,16 +128,39 @@ class RecoveryManager:
         self._txn = txn_manager
         self._buffer = buffer_manager
         self._data_dir = data_dir
+        self._path_cache: Dict[str, str] = {}  # table name -> .tbl path
+        # (table, page_id) -> LSN of the last committed record for that
+        # page; filled by analysis so redo can skip up-to-date pages
+        self._page_redo_lsn: Dict[Tuple[str, int], int] = {}
+        # txns with at least one INSERT/DELETE/UPDATE/CLR record, from
+        # analysis; None until analysis runs (undo then walks every chain)
+        self._dml_txns: Optional[Set[int]] = None
+        # record type -> redo handler; one dict lookup per record
+        self._redo_dispatch = {
+            WALRecordType.INSERT: self._redo_insert,
+            WALRecordType.DELETE: self._redo_delete,
+            WALRecordType.UPDATE: self._redo_update,
+            WALRecordType.CLR: self._redo_clr,
+        }
 
     def recover(self) -> dict:
         """
         Run full recovery. Returns stats dict for diagnostics.
         """
-        # 0. Ensure WAL is durable before reading
+        # 0. Ensure WAL is durable before reading, and start readahead
         self._log.flush()
-
-        # 1. Analysis phase
-        committed, uncommitted, max_txn_id, max_lsn = self._analysis()
+        self._log.advise_sequential()
+
+        # 1. Analysis phase. A serial scan also keeps the records redo
+        # needs, so the log is read once; large logs are scanned in
+        # parallel and read again by redo rather than held in memory.
+        redo_entries: Optional[List[WALEntry]] = None
+        if self._log.next_lsn >= PARALLEL_ANALYSIS_MIN_BYTES:
+            analysis = self._analysis_parallel()
+        else:
+            redo_entries = []
+            analysis = self._analysis(redo_entries)
+        committed, uncommitted, max_txn_id, max_lsn = analysis
 
         # Update managers with recovered state
         self._log.set_next_lsn(max_lsn)
@@ -62,10 +177,10 @@ class RecoveryManager:
             return stats  # Clean WAL, nothing to do
 
         # 2. Redo phase — replay committed operations
-        stats["redo_count"] = self._redo(committed)
+        stats["redo_count"] = self._redo(committed, redo_entries)
 
         # 3. Undo phase — reverse uncommitted operations
-        stats["undo_count"] = self._undo(uncommitted)
+        stats["undo_count"] = self._undo(uncommitted, redo_entries)
 
         # 4. Post-recovery: flush everything, checkpoint, truncate
         self._post_recovery()
@@ -74,177 +189,216 @@ class RecoveryManager:
 
     # ─── Analysis ────────────────────────────────────────────────────────
 
-    def _analysis(self):
+    def _analysis(self, redo_entries: Optional[List[WALEntry]] = None):
         """
         Scan WAL forward. Build committed/uncommitted sets.
         Returns (committed: set[txn_id], uncommitted: dict[txn_id->last_lsn],
                  max_txn_id, max_lsn).
+        If redo_entries is given, DML and CLR records are appended to it in
+        log order for _redo().
         """
+        summary = _summarize(self._log.scan_batch(), WAL_PADDING, redo_entries)
+        return self._merge_analysis([summary])
+
+    def _analysis_parallel(self, n_workers: Optional[int] = None,
+                           segment_size: int = ANALYSIS_SEGMENT_SIZE):
+        """
+        Same result as _analysis(), but the WAL is cut into record-aligned
+        segments that worker processes scan concurrently. Each returns a
+        per-segment summary; merging them in log order reproduces the
+        serial scan. Falls back to _analysis() for a single segment.
+        """
+        bounds = self._log.segment_bounds(segment_size)
+        if len(bounds) < 2:
+            return self._analysis()
+        path = self._log.path
+        workers = min(n_workers or os.cpu_count() or 1, len(bounds))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(
+                _analyze_segment,
+                [path] * len(bounds),
+                [start for start, _ in bounds],
+                [end for _, end in bounds]))
+        return self._merge_analysis(summaries)
+
+    def _merge_analysis(self, summaries: List["_SegmentSummary"]):
+        """Combine segment summaries (in log order) into _analysis() output."""
         committed: Set[int] = set()
         aborted: Set[int] = set()
-        active: Dict[int, int] = {}   # txn_id -> last_lsn
+        active: Dict[int, int] = {}   # txn_id -> last_lsn since BEGIN
         max_txn_id = 0
         max_lsn = self._log.next_lsn  # default: current end
 
-        for entry in self._log.scan():
-            tid = entry.txn_id
-            if tid > max_txn_id:
-                max_txn_id = tid
-
-            record_end = entry.lsn + entry.total_len
-            if record_end > max_lsn:
-                max_lsn = record_end
-
-            if entry.record_type == WALRecordType.BEGIN:
-                active[tid] = entry.lsn
-
-            elif entry.record_type == WALRecordType.COMMIT:
-                committed.add(tid)
-                active.pop(tid, None)
-
-            elif entry.record_type == WALRecordType.ABORT:
-                aborted.add(tid)
-                active.pop(tid, None)
-
-            elif entry.record_type == WALRecordType.CHECKPOINT:
-                # Checkpoint lists active txns at time of checkpoint
-                # For now we just continue scanning
-                pass
-
-            # Track last_lsn for all active txns
-            if tid in active:
-                active[tid] = entry.lsn
-
-        # uncommitted = active txns that didn't commit or abort
+        txn_pages: Dict[int, Dict[Tuple[str, int], int]] = {}
+
+        for seg in summaries:
+            for tid, pages in seg.page_lsn.items():
+                txn_pages.setdefault(tid, {}).update(pages)
+            for tid in seg.begun:
+                active.setdefault(tid, NULL_LSN)
+            for tid, lsn in seg.last_lsn.items():
+                if tid in active:
+                    active[tid] = lsn
+            committed |= seg.committed
+            aborted |= seg.aborted
+            max_txn_id = max(max_txn_id, seg.max_txn_id)
+            max_lsn = max(max_lsn, seg.end)
+
+        # uncommitted = begun txns that didn't commit or abort
         uncommitted = {tid: lsn for tid, lsn in active.items()
                        if tid not in committed and tid not in aborted}
 
+        # Redo LSN table: last committed record per page, for _redo()
+        redo_lsn: Dict[Tuple[str, int], int] = {}
+        for tid in committed:
+            for page, lsn in txn_pages.get(tid, {}).items():
+                if lsn > redo_lsn.get(page, NULL_LSN):
+                    redo_lsn[page] = lsn
+        self._page_redo_lsn = redo_lsn
+        self._dml_txns = set(txn_pages)
+
         return committed, uncommitted, max_txn_id, max_lsn
 
     # ─── Redo ────────────────────────────────────────────────────────────
 
-    def _redo(self, committed: Set[int]) -> int:
-        """Replay committed ops where record.lsn > page.page_lsn."""
+    def _redo(self, committed: Set[int],
+              entries: Optional[Iterable[WALEntry]] = None) -> int:
+        """
+        Replay committed ops where record.lsn > page.page_lsn.
+        entries are the records collected by _analysis(); None rescans the WAL.
+
+        Work is partitioned by page: a page is looked up in the buffer the
+        first time one of its records appears and marked dirty once at the
+        end, instead of both happening for every record.
+        """
         count = 0
-        for entry in self._log.scan():
-            if entry.txn_id not in committed:
+        if entries is None:
+            entries = self._log.scan()
+        dispatch = self._redo_dispatch
+        # (table, page_id) -> buffered page to replay into, or None when the
+        # page is missing or already covers its last committed record
+        targets: Dict[Tuple[str, int], Optional[Page]] = {}
+        for entry in entries:
+            redo = dispatch.get(entry.record_type)
+            if redo is None or entry.txn_id not in committed:
                 continue
 
-            if entry.record_type == WALRecordType.INSERT:
-                if self._redo_insert(entry):
-                    count += 1
+            key = _redo_page(entry)
+            if key in targets:
+                page = targets[key]
+            else:
+                page = targets[key] = self._redo_target(key)
+            if page is None or entry.lsn <= page.page_lsn:
+                continue
 
-            elif entry.record_type == WALRecordType.DELETE:
-                if self._redo_delete(entry):
-                    count += 1
+            if redo(page, entry.payload):
+                page.page_lsn = entry.lsn
+                count += 1
 
-            elif entry.record_type == WALRecordType.UPDATE:
-                if self._redo_update(entry):
-                    count += 1
+        for (tname, pid), page in targets.items():
+            if page is not None:
+                self._buffer.mark_dirty(self._path_for(tname), pid)
+        return count
 
-            elif entry.record_type == WALRecordType.CLR:
-                if self._redo_clr(entry):
-                    count += 1
+    def _path_for(self, table_name: str) -> str:
+        """Table file path; memoized since redo resolves it per record."""
+        path = self._path_cache.get(table_name)
+        if path is None:
+            path = os.path.join(self._data_dir, f"{table_name}.tbl")
+            self._path_cache[table_name] = path
+        return path
 
-        return count
+    def _redo_target(self, key: Tuple[str, int]) -> Optional[Page]:
+        """
+        The buffered page redo replays into, or None if there is nothing
+        to replay: the table file or page is gone, or its page_lsn already
+        covers the last committed record analysis saw for it.
+
+        The page_lsn check peeks at the page, so a page that is already
+        current (e.g. one whose only records were compensated by CLRs it
+        has seen) is skipped without being referenced in the buffer pool;
+        only pages redo will write are touched.
+        """
+        table_name, page_id = key
+        file_path = self._path_for(table_name)
+        last = self._page_redo_lsn.get(key)
+        if last is not None:
+            # _should_redo() has checked the file and that the page is cached
+            if not self._should_redo(table_name, page_id, last):
+                return None
+        elif not os.path.exists(file_path):
+            return None
+        return self._buffer.get_page(file_path, page_id)
 
     def _should_redo(self, table_name: str, page_id: int, lsn: int) -> bool:
         """Check if this operation needs to be redone (page LSN check)."""
-        file_path = os.path.join(self._data_dir, f"{table_name}.tbl")
+        file_path = self._path_for(table_name)
         if not os.path.exists(file_path):
             return False  # Table file doesn't exist
-        page = self._buffer.get_page(file_path, page_id)
+        page = self._buffer.peek_page(file_path, page_id)
         if page is None:
             return False
         return lsn > page.page_lsn
 
-    def _redo_insert(self, entry: WALEntry) -> bool:
-        tname, pid, sid, tdata = LogManager.parse_dml_payload(entry.payload)
-        if not self._should_redo(tname, pid, entry.lsn):
-            return False
-        file_path = os.path.join(self._data_dir, f"{tname}.tbl")
-        page = self._buffer.get_page(file_path, pid)
+    # Each handler applies one record's payload to its page; _redo()
+    # advances page_lsn when a handler returns True. The page is already
+    # resolved, so handlers skip the table name instead of decoding it.
+
+    def _redo_insert(self, page: Page, payload) -> bool:
+        sid, tdata = LogManager.parse_dml_image(payload)
         # Try restore at specific slot (if slot is deleted/available)
         page.restore_tuple(sid, tdata)
-        page.page_lsn = entry.lsn
-        self._buffer.mark_dirty(file_path, pid)
         return True
 
-    def _redo_delete(self, entry: WALEntry) -> bool:
-        tname, pid, sid, tdata = LogManager.parse_dml_payload(entry.payload)
-        if not self._should_redo(tname, pid, entry.lsn):
-            return False
-        file_path = os.path.join(self._data_dir, f"{tname}.tbl")
-        page = self._buffer.get_page(file_path, pid)
+    def _redo_delete(self, page: Page, payload) -> bool:
+        sid, _ = LogManager.parse_dml_image(payload)
         page.delete_tuple(sid)
-        page.page_lsn = entry.lsn
-        self._buffer.mark_dirty(file_path, pid)
         return True
 
-    def _redo_update(self, entry: WALEntry) -> bool:
-        tname, pid, sid, old_d, new_d = LogManager.parse_update_payload(entry.payload)
-        if not self._should_redo(tname, pid, entry.lsn):
-            return False
-        file_path = os.path.join(self._data_dir, f"{tname}.tbl")
-        page = self._buffer.get_page(file_path, pid)
+    def _redo_update(self, page: Page, payload) -> bool:
+        sid, _, new_d = LogManager.parse_update_images(payload)
         page.update_tuple(sid, new_d)
-        page.page_lsn = entry.lsn
-        self._buffer.mark_dirty(file_path, pid)
         return True
 
-    def _redo_clr(self, entry: WALEntry) -> bool:
+    def _redo_clr(self, page: Page, payload) -> bool:
         """Redo a CLR — these are compensation records from a previous abort."""
-        undo_next, inner_type, inner_payload = LogManager.parse_clr_payload(entry.payload)
-
-        if inner_type == WALRecordType.INSERT:
-            tname, pid, sid, tdata = LogManager.parse_dml_payload(inner_payload)
-            if not self._should_redo(tname, pid, entry.lsn):
-                return False
-            file_path = os.path.join(self._data_dir, f"{tname}.tbl")
-            page = self._buffer.get_page(file_path, pid)
-            page.restore_tuple(sid, tdata)
-            page.page_lsn = entry.lsn
-            self._buffer.mark_dirty(file_path, pid)
-            return True
-
-        elif inner_type == WALRecordType.DELETE:
-            tname, pid, sid, _ = LogManager.parse_dml_payload(inner_payload)
-            if not self._should_redo(tname, pid, entry.lsn):
-                return False
-            file_path = os.path.join(self._data_dir, f"{tname}.tbl")
-            page = self._buffer.get_page(file_path, pid)
-            page.delete_tuple(sid)
-            page.page_lsn = entry.lsn
-            self._buffer.mark_dirty(file_path, pid)
-            return True
-
-        elif inner_type == WALRecordType.UPDATE:
-            tname, pid, sid, old_d, new_d = LogManager.parse_update_payload(inner_payload)
-            if not self._should_redo(tname, pid, entry.lsn):
-                return False
-            file_path = os.path.join(self._data_dir, f"{tname}.tbl")
-            page = self._buffer.get_page(file_path, pid)
-            page.update_tuple(sid, new_d)
-            page.page_lsn = entry.lsn
-            self._buffer.mark_dirty(file_path, pid)
-            return True
-
-        return False
+        _, inner_type, inner_payload = LogManager.parse_clr_payload(payload)
+        if inner_type == WALRecordType.CLR:
+            return False
+        redo = self._redo_dispatch.get(inner_type)
+        return redo is not None and redo(page, inner_payload)
 
     # ─── Undo ────────────────────────────────────────────────────────────
 
-    def _undo(self, uncommitted: Dict[int, int]) -> int:
-        """Undo uncommitted transactions using TransactionManager."""
+    def _undo(self, uncommitted: Dict[int, int],
+              entries: Optional[Iterable[WALEntry]] = None) -> int:
+        """
+        Undo uncommitted transactions using TransactionManager.
+        entries are the records collected by _analysis(); those of the
+        uncommitted txns seed their undo caches so undo reads no WAL.
+        """
+        by_txn: Dict[int, List[WALEntry]] = {}
+        if entries is not None:
+            for entry in entries:
+                if entry.txn_id in uncommitted:
+                    by_txn.setdefault(entry.txn_id, []).append(entry)
+
+        dml_txns = self._dml_txns
         count = 0
         for txn_id, last_lsn in uncommitted.items():
             # Register the txn so TransactionManager can work with it
             self._txn.register_txn(txn_id, TransactionState.ACTIVE, last_lsn)
-            self._txn._undo_txn(txn_id, last_lsn)
+            # A txn that changed nothing (BEGIN only, e.g. a reader cut off
+            # mid-query) has no chain to walk: just log its ABORT.
+            if dml_txns is None or txn_id in dml_txns:
+                self._txn.preload_undo(txn_id, by_txn.get(txn_id, ()))
+                self._txn._undo_txn(txn_id, last_lsn)
 
             # Write ABORT record
             info = self._txn._txns[txn_id]
             self._log.append_abort(txn_id, info.last_lsn)
             info.state = TransactionState.ABORTED
+            info.undo.clear()
             count += 1
 
         return count
@@ -255,14 +409,7 @@ class RecoveryManager:
         """Flush all dirty pages, write checkpoint, truncate WAL."""
         # Flush all dirty pages to disk
         if self._buffer:
-            dirty = self._buffer.flush_all()
-            for file_path, pid, page in dirty:
-                if os.path.exists(file_path):
-                    with open(file_path, "r+b") as f:
-                        f.seek(pid * PAGE_SIZE)
-                        f.write(page.to_bytes())
-                        f.flush()
-                        os.fsync(f.fileno())
+            write_pages(self._buffer.flush_all(), skip_missing=True)
 
         # Write checkpoint (no active txns after recovery)
         self._log.append_checkpoint([])
@@ -10,13 +10,23 @@ Phase 7 upgrades:
   - Physical undo via WAL backward traversal with CLR logging
 """
 
+import itertools
 import os
 import threading
 from enum import Enum
-from typing import Optional, Dict
+from typing import Iterable, Optional, Dict, Tuple
 
-from transactions.wal import LogManager, WALRecordType, NULL_LSN
+from transactions.wal import LogManager, WALRecordType, WALEntry, NULL_LSN
 from storage.page import RID
+from storage.buffer import write_pages
+
+
+# Most records per transaction kept in memory for undo; older records of
+# longer transactions are read back from the WAL.
+UNDO_CACHE_MAX_RECORDS = 10_000
+
+# lsn -> (prev_lsn, record_type, parsed payload), as _undo_txn consumes it
+_UndoRecord = Tuple[int, WALRecordType, tuple]
 
 
 class TransactionState(Enum):
@@ -27,12 +37,13 @@ class TransactionState(Enum):
 
 class _TxnInfo:
     """Internal bookkeeping for one transaction."""
-    __slots__ = ('txn_id', 'state', 'last_lsn')
+    __slots__ = ('txn_id', 'state', 'last_lsn', 'undo')
 
     def __init__(self, txn_id: int):
         self.txn_id = txn_id
         self.state = TransactionState.ACTIVE
         self.last_lsn = NULL_LSN  # chain head for prev_txn_lsn
+        self.undo: Dict[int, _UndoRecord] = {}  # records abort can skip reading
 
 
 class TransactionManager:
@@ -42,7 +53,7 @@ class TransactionManager:
     Phase 7 invariants:
       - Multiple concurrent transactions allowed (guarded by LockManager)
       - Lock release AFTER WAL commit record is durable
-      - Thread-safe txn_id allocation via mutex
+      - Thread-safe txn_id allocation via itertools.count
       - Strict ordering: log WAL → apply change → set page_lsn → mark dirty
       - Abort undoes all changes in reverse LSN order, writing CLRs
     """
@@ -52,10 +63,20 @@ class TransactionManager:
         self._log = log_manager
         self._buffer = buffer_manager
         self._data_dir = data_dir
+        self._path_cache: Dict[str, str] = {}  # table name -> .tbl path
         self._lock = lock_manager       # Optional: concurrency.LockManager
-        self._next_txn_id = 1
+        self._txn_ids = itertools.count(1)  # next() is atomic under the GIL
         self._txns: Dict[int, _TxnInfo] = {}
-        self._mutex = threading.Lock()   # Protects _next_txn_id and _txns
+        # Protects _txns membership and txn state. A txn's last_lsn and
+        # undo cache are only written by the thread running that txn, and
+        # dict.get() is atomic, so the DML logging path takes no lock.
+        self._mutex = threading.Lock()
+        # record type -> (payload parser, undo handler)
+        self._undo_dispatch = {
+            WALRecordType.INSERT: (LogManager.parse_dml_payload, self._undo_insert),
+            WALRecordType.DELETE: (LogManager.parse_dml_payload, self._undo_delete),
+            WALRecordType.UPDATE: (LogManager.parse_update_payload, self._undo_update),
+        }
 
     # ─── Lifecycle ───────────────────────────────────────────────────────
 
@@ -64,16 +85,15 @@ class TransactionManager:
         Start a new transaction. Returns txn_id.
         Thread-safe: multiple concurrent transactions allowed.
         """
+        txn_id = next(self._txn_ids)
+        info = _TxnInfo(txn_id)
         with self._mutex:
-            txn_id = self._next_txn_id
-            self._next_txn_id += 1
-            info = _TxnInfo(txn_id)
             self._txns[txn_id] = info
 
         # WAL logging (LogManager has its own internal synchronization)
         lsn = self._log.append_begin(txn_id)
-        with self._mutex:
-            self._txns[txn_id].last_lsn = lsn
+        info.last_lsn = lsn
+        self._remember(info, lsn, NULL_LSN, WALRecordType.BEGIN, ())
 
         return txn_id
 
@@ -92,6 +112,7 @@ class TransactionManager:
         with self._mutex:
             info.last_lsn = lsn
             info.state = TransactionState.COMMITTED
+            info.undo.clear()
 
         # 2. Release all locks AFTER WAL is durable
         if self._lock:
@@ -118,6 +139,7 @@ class TransactionManager:
         with self._mutex:
             info.last_lsn = lsn
             info.state = TransactionState.ABORTED
+            info.undo.clear()
 
         # 3. Release all locks AFTER undo + ABORT is durable
         if self._lock:
@@ -154,35 +176,39 @@ class TransactionManager:
     def log_insert(self, txn_id: int, table_name: str,
                    page_id: int, slot_id: int, tuple_data: bytes) -> int:
         """Log an INSERT. Returns LSN."""
-        info = self._get_active(txn_id)
-        lsn = self._log.append_insert(
-            txn_id, info.last_lsn, table_name, page_id, slot_id, tuple_data)
-        with self._mutex:
-            info.last_lsn = lsn
-        return lsn
+        return self._log_change(txn_id, WALRecordType.INSERT, self._log.append_insert,
+                                (table_name, page_id, slot_id, tuple_data))
 
     def log_delete(self, txn_id: int, table_name: str,
                    page_id: int, slot_id: int, tuple_data: bytes) -> int:
         """Log a DELETE (with before-image). Returns LSN."""
-        info = self._get_active(txn_id)
-        lsn = self._log.append_delete(
-            txn_id, info.last_lsn, table_name, page_id, slot_id, tuple_data)
-        with self._mutex:
-            info.last_lsn = lsn
-        return lsn
+        return self._log_change(txn_id, WALRecordType.DELETE, self._log.append_delete,
+                                (table_name, page_id, slot_id, tuple_data))
 
     def log_update(self, txn_id: int, table_name: str,
                    page_id: int, slot_id: int,
                    old_data: bytes, new_data: bytes) -> int:
         """Log an UPDATE (with both images). Returns LSN."""
+        return self._log_change(txn_id, WALRecordType.UPDATE, self._log.append_update,
+                                (table_name, page_id, slot_id, old_data, new_data))
+
+    def _log_change(self, txn_id: int, rtype: WALRecordType,
+                    append, args: tuple) -> int:
+        """Append a DML record to txn_id's chain and remember it for undo."""
         info = self._get_active(txn_id)
-        lsn = self._log.append_update(
-            txn_id, info.last_lsn, table_name, page_id, slot_id,
-            old_data, new_data)
-        with self._mutex:
-            info.last_lsn = lsn
+        prev = info.last_lsn
+        lsn = append(txn_id, prev, *args)
+        info.last_lsn = lsn
+        self._remember(info, lsn, prev, rtype, args)
         return lsn
 
+    @staticmethod
+    def _remember(info: _TxnInfo, lsn: int, prev_lsn: int,
+                  rtype: WALRecordType, args: tuple) -> None:
+        """Keep a logged change for undo, up to UNDO_CACHE_MAX_RECORDS."""
+        if len(info.undo) < UNDO_CACHE_MAX_RECORDS:
+            info.undo[lsn] = (prev_lsn, rtype, args)
+
     def update_last_lsn(self, txn_id: int, lsn: int) -> None:
         """Update the last_lsn for a transaction (used by recovery)."""
         with self._mutex:
@@ -193,8 +219,7 @@ class TransactionManager:
     # ─── Internal ────────────────────────────────────────────────────────
 
     def _get_active(self, txn_id: int) -> '_TxnInfo':
-        with self._mutex:
-            info = self._txns.get(txn_id)
+        info = self._txns.get(txn_id)
         if info is None:
             raise RuntimeError(f"Unknown transaction {txn_id}")
         if info.state != TransactionState.ACTIVE:
@@ -203,36 +228,47 @@ class TransactionManager:
         return info
 
     def _undo_txn(self, txn_id: int, from_lsn: int) -> None:
-        """Walk backward through txn's records and undo each mutation."""
+        """
+        Walk backward through txn's records and undo each mutation.
+        Records remembered in the txn's undo cache are not read from the WAL.
+        """
+        cache = self._txns[txn_id].undo
+        dispatch = self._undo_dispatch
         lsn = from_lsn
         while lsn != NULL_LSN:
-            entry = self._log.read_record(lsn)
-            if entry.txn_id != txn_id:
-                raise RuntimeError(
-                    f"LSN chain corrupt: expected txn {txn_id}, got {entry.txn_id}")
-
-            next_lsn = entry.prev_lsn  # next record to undo
-
-            if entry.record_type == WALRecordType.CLR:
+            record = cache.get(lsn)
+            if record is None:
+                entry = self._log.read_record(lsn)
+                if entry.txn_id != txn_id:
+                    raise RuntimeError(
+                        f"LSN chain corrupt: expected txn {txn_id}, got {entry.txn_id}")
+                record = self._undo_record(entry)
+            prev_lsn, rtype, args = record
+
+            next_lsn = prev_lsn  # next record to undo
+
+            if rtype == WALRecordType.CLR:
                 # CLR: skip to undo_next_lsn (already compensated)
-                undo_next, _, _ = LogManager.parse_clr_payload(entry.payload)
-                next_lsn = undo_next
+                next_lsn = args[0]
 
-            elif entry.record_type == WALRecordType.INSERT:
-                tname, pid, sid, tdata = LogManager.parse_dml_payload(entry.payload)
-                self._undo_insert(txn_id, tname, pid, sid, tdata, next_lsn)
-
-            elif entry.record_type == WALRecordType.DELETE:
-                tname, pid, sid, tdata = LogManager.parse_dml_payload(entry.payload)
-                self._undo_delete(txn_id, tname, pid, sid, tdata, next_lsn)
-
-            elif entry.record_type == WALRecordType.UPDATE:
-                tname, pid, sid, old_d, new_d = LogManager.parse_update_payload(entry.payload)
-                self._undo_update(txn_id, tname, pid, sid, old_d, new_d, next_lsn)
+            else:
+                handler = dispatch.get(rtype)
+                if handler is not None:
+                    handler[1](txn_id, *args, next_lsn)
 
             # BEGIN, COMMIT, ABORT — nothing to undo
             lsn = next_lsn
 
+    def _undo_record(self, entry: WALEntry) -> _UndoRecord:
+        """Parse a WAL record into the form _undo_txn consumes."""
+        rtype = entry.record_type
+        if rtype == WALRecordType.CLR:
+            undo_next, _, _ = LogManager.parse_clr_payload(entry.payload)
+            return entry.prev_lsn, rtype, (undo_next,)
+        handler = self._undo_dispatch.get(rtype)
+        args = handler[0](entry.payload) if handler is not None else ()
+        return entry.prev_lsn, rtype, args
+
     def _undo_insert(self, txn_id, tname, page_id, slot_id, tuple_data, undo_next_lsn):
         """Undo INSERT by deleting the tuple, then logging CLR."""
         page = self._get_page(tname, page_id)
@@ -241,13 +277,11 @@ class TransactionManager:
             self._mark_dirty(tname, page_id)
 
         info = self._txns[txn_id]
-        clr_payload = LogManager._pack_table_rid(tname, page_id, slot_id)
-        clr_payload += b'\x00\x00'
+        clr_payload = LogManager._pack_dml(tname, page_id, slot_id, b"")
         clr_lsn = self._log.append_clr(
             txn_id, info.last_lsn, undo_next_lsn,
             WALRecordType.DELETE, clr_payload)
-        with self._mutex:
-            info.last_lsn = clr_lsn
+        info.last_lsn = clr_lsn
 
         if page is not None:
             page.page_lsn = clr_lsn
@@ -260,14 +294,11 @@ class TransactionManager:
             self._mark_dirty(tname, page_id)
 
         info = self._txns[txn_id]
-        prefix = LogManager._pack_table_rid(tname, page_id, slot_id)
-        import struct
-        clr_payload = prefix + struct.pack(">H", len(tuple_data)) + tuple_data
+        clr_payload = LogManager._pack_dml(tname, page_id, slot_id, tuple_data)
         clr_lsn = self._log.append_clr(
             txn_id, info.last_lsn, undo_next_lsn,
             WALRecordType.INSERT, clr_payload)
-        with self._mutex:
-            info.last_lsn = clr_lsn
+        info.last_lsn = clr_lsn
 
         if page is not None:
             page.page_lsn = clr_lsn
@@ -280,52 +311,47 @@ class TransactionManager:
             self._mark_dirty(tname, page_id)
 
         info = self._txns[txn_id]
-        import struct
-        prefix = LogManager._pack_table_rid(tname, page_id, slot_id)
-        clr_payload = (prefix +
-                       struct.pack(">H", len(new_data)) + new_data +
-                       struct.pack(">H", len(old_data)) + old_data)
+        clr_payload = LogManager._pack_dml(tname, page_id, slot_id, new_data, old_data)
         clr_lsn = self._log.append_clr(
             txn_id, info.last_lsn, undo_next_lsn,
             WALRecordType.UPDATE, clr_payload)
-        with self._mutex:
-            info.last_lsn = clr_lsn
+        info.last_lsn = clr_lsn
 
         if page is not None:
             page.page_lsn = clr_lsn
 
+    def _path_for(self, table_name: str) -> str:
+        """Table file path; memoized since undo resolves it per record."""
+        path = self._path_cache.get(table_name)
+        if path is None:
+            path = os.path.join(self._data_dir, f"{table_name}.tbl")
+            self._path_cache[table_name] = path
+        return path
+
     def _get_page(self, table_name, page_id):
         """Get a page from the buffer manager for physical undo."""
         if not self._buffer:
             return None
-        file_path = os.path.join(self._data_dir, f"{table_name}.tbl")
+        file_path = self._path_for(table_name)
         return self._buffer.get_page(file_path, page_id)
 
     def _mark_dirty(self, table_name, page_id):
         """Mark a page dirty in the buffer manager."""
         if not self._buffer:
             return
-        file_path = os.path.join(self._data_dir, f"{table_name}.tbl")
+        file_path = self._path_for(table_name)
         self._buffer.mark_dirty(file_path, page_id)
 
     def _flush_dirty_pages(self):
         """Flush all dirty data pages to disk."""
         if self._buffer:
-            dirty = self._buffer.flush_all()
-            for file_path, pid, page in dirty:
-                with open(file_path, "r+b") as f:
-                    from storage.page import PAGE_SIZE
-                    f.seek(pid * PAGE_SIZE)
-                    f.write(page.to_bytes())
-                    f.flush()
-                    os.fsync(f.fileno())
+            write_pages(self._buffer.flush_all())
 
     # ─── Recovery support ────────────────────────────────────────────────
 
     def set_next_txn_id(self, txn_id: int):
         """Set by recovery manager after analysis."""
-        with self._mutex:
-            self._next_txn_id = txn_id
+        self._txn_ids = itertools.count(txn_id)
 
     def register_txn(self, txn_id: int, state: TransactionState, last_lsn: int):
         """Register a transaction found during recovery analysis."""
@@ -334,3 +360,14 @@ class TransactionManager:
             info.state = state
             info.last_lsn = last_lsn
             self._txns[txn_id] = info
+
+    def preload_undo(self, txn_id: int, entries: Iterable[WALEntry]) -> None:
+        """
+        Seed a registered txn's undo cache with its records, already read
+        during recovery analysis, so _undo_txn need not read them again.
+        """
+        info = self._txns[txn_id]
+        for entry in entries:
+            if len(info.undo) >= UNDO_CACHE_MAX_RECORDS:
+                break
+            info.undo[entry.lsn] = self._undo_record(entry)
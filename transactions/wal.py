@@ -5,14 +5,26 @@ Append-only binary log for crash recovery and rollback.
 
 LSN = byte offset in WAL file (enables O(1) random access for undo).
 File starts with 4 zero bytes; NULL_LSN = 0 means "no previous record".
+
+Teaching note:
+  COMMIT/ABORT/CHECKPOINT must be durable before they are acknowledged.
+  Their appenders call flush_to(lsn), which implements group commit: the
+  first waiter becomes the leader and issues one fdatasync covering every
+  record appended so far; committers that arrive meanwhile wait on a
+  condition variable and are usually covered by that same sync.
 """
 
+import mmap
 import os
+from array import array
 import struct
+import threading
+import time
 import zlib
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import Iterator, Optional, BinaryIO
+from functools import lru_cache
+from typing import Iterator, Optional, BinaryIO, Union
 
 # ─── Constants ──────────────────────────────────────────────────────────────
 
@@ -31,22 +43,305 @@ class WALRecordType(IntEnum):
 
 # Record header: total_len(I) lsn(I) txn_id(I) prev_txn_lsn(I) type(B)
 _HDR_FMT = ">IIIIB"
-_HDR_SIZE = struct.calcsize(_HDR_FMT)   # 17
-_CRC_SIZE = 4
+_HDR = struct.Struct(_HDR_FMT)
+_HDR_SIZE = _HDR.size                   # 17
+_CRC = struct.Struct(">I")
+_CRC_SIZE = _CRC.size
 _MIN_RECORD = _HDR_SIZE + _CRC_SIZE     # 21
 
+# Payload fields
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_PAGE_SLOT = struct.Struct(">IH")       # page_id, slot_id
+_CLR_HDR = struct.Struct(">IB")         # undo_next_lsn, inner_type
+_TXN_ENTRY = struct.Struct(">II")       # checkpoint: txn_id, last_lsn
+
+# Appended records are staged in memory and written out in one system call
+# once this many bytes are pending (or on flush/read/scan/truncate).
+WAL_APPEND_BUFFER_SIZE = 64 * 1024
+
+# fdatasync skips inode timestamps; not available on every platform
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Zeros written per call when growing a preallocated log
+_ZERO_CHUNK = bytes(1024 * 1024)
+
+# Positional vectored I/O (POSIX). Staged records are handed to the kernel
+# as an iovec, so they are never concatenated in Python, and reads fill
+# caller-owned buffers. Elsewhere the file object is used instead.
+_HAS_VECTORED_IO = hasattr(os, "pwritev") and hasattr(os, "preadv")
+_IOV_MAX = 1024
+
+# Log scans read front to back; tell the kernel so it reads ahead
+# aggressively (and drops pages behind) rather than faulting in one page
+# at a time. Both hints are advisory and absent on some platforms.
+_HAS_FADVISE = hasattr(os, "posix_fadvise")
+_MADV_SEQUENTIAL = getattr(mmap, "MADV_SEQUENTIAL", None)
+
+
+def _map_sequential(fd: int, length: int) -> mmap.mmap:
+    """Map the first length bytes of fd read-only, advised for a forward scan."""
+    mm = mmap.mmap(fd, length, access=mmap.ACCESS_READ)
+    if _MADV_SEQUENTIAL is not None:
+        mm.madvise(_MADV_SEQUENTIAL)
+    return mm
+
 # ─── WALEntry ───────────────────────────────────────────────────────────────
 
 @dataclass
 class WALEntry:
-    """Parsed WAL record."""
+    """
+    Parsed WAL record.
+
+    payload is a read-only memoryview into the record (read_record) or
+    the mapped log (WALBatch), or bytes when built directly. Views are
+    unhashable and have no str methods; call bytes() on one to keep or
+    decode it.
+    """
     lsn: int
     txn_id: int
     prev_lsn: int
     record_type: WALRecordType
-    payload: bytes
+    payload: Union[bytes, memoryview]
     total_len: int
 
+def _encode_record(lsn: int, txn_id: int, prev_lsn: int,
+                   rtype: WALRecordType, payload: bytes) -> bytearray:
+    """Assemble header | payload | CRC in one buffer, CRC'd in a single call."""
+    total_len = _HDR_SIZE + len(payload) + _CRC_SIZE
+    crc_off = total_len - _CRC_SIZE
+    buf = bytearray(total_len)
+    _HDR.pack_into(buf, 0, total_len, lsn, txn_id, prev_lsn, rtype)
+    buf[_HDR_SIZE:crc_off] = payload
+    _CRC.pack_into(buf, crc_off, zlib.crc32(memoryview(buf)[:crc_off]))
+    return buf
+
+
+def _check_record(buf, off: int, lsn: int) -> tuple[int, int, int, int, int]:
+    """
+    Validate the record at buf[off:], whose LSN is lsn, and CRC-check it.
+    Returns its header (total_len, lsn, txn_id, prev_lsn, type).
+    """
+    avail = len(buf) - off
+    if avail < _HDR_SIZE:
+        raise ValueError(f"Unexpected EOF reading header at LSN {lsn}")
+
+    total_len, rec_lsn, txn_id, prev_lsn, rtype_val = _HDR.unpack_from(buf, off)
+
+    # Sanity checks
+    if rec_lsn != lsn:
+        raise ValueError(f"LSN mismatch at offset {lsn}: header says {rec_lsn}")
+    if total_len < _MIN_RECORD:
+        raise ValueError(f"Record too small ({total_len}) at LSN {lsn}")
+    if avail < total_len:
+        raise ValueError(f"Unexpected EOF reading payload at LSN {lsn}")
+
+    crc_off = off + total_len - _CRC_SIZE
+    (stored_crc,) = _CRC.unpack_from(buf, crc_off)
+    if zlib.crc32(buf[off:crc_off]) != stored_crc:
+        raise ValueError(f"CRC mismatch at LSN {lsn}")
+    return total_len, rec_lsn, txn_id, prev_lsn, rtype_val
+
+
+def _decode_record(buf, off: int, lsn: int) -> WALEntry:
+    """
+    Decode and CRC-check the record at buf[off:], whose LSN is lsn.
+    buf may be bytes or a memoryview; only the payload is copied out.
+    """
+    total_len, _, txn_id, prev_lsn, rtype_val = _check_record(buf, off, lsn)
+    crc_off = off + total_len - _CRC_SIZE
+    return WALEntry(
+        lsn=lsn,
+        txn_id=txn_id,
+        prev_lsn=prev_lsn,
+        record_type=WALRecordType(rtype_val),
+        payload=bytes(buf[off + _HDR_SIZE:crc_off]),
+        total_len=total_len,
+    )
+
+
+# A scan hands back the log pages it has consumed, SCAN_WINDOW bytes at a
+# time, so one pass over a large WAL does not evict the rest of the OS page
+# cache (the ring-buffer idea PostgreSQL applies to big sequential scans).
+SCAN_WINDOW = 2 * 1024 * 1024
+_MADV_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+
+class _ScanWindow:
+    """Releases whole SCAN_WINDOWs of a mapped log once a scan is past them."""
+    __slots__ = ("mm", "fd", "released")
+
+    def __init__(self, mm: mmap.mmap, fd: int, start: int):
+        self.mm = mm
+        self.fd = fd
+        self.released = start - start % mmap.PAGESIZE  # madvise needs alignment
+
+    def advance(self, pos: int) -> None:
+        """The scan has consumed everything below pos."""
+        length = (pos - self.released) // SCAN_WINDOW * SCAN_WINDOW
+        if not length:
+            return
+        # Unmap our pages first; the page cache keeps pages that are mapped
+        if _MADV_DONTNEED is not None:
+            self.mm.madvise(_MADV_DONTNEED, self.released, length)
+        if _HAS_FADVISE:
+            os.posix_fadvise(self.fd, self.released, length, os.POSIX_FADV_DONTNEED)
+        self.released += length
+
+
+def _iter_records(fd: int, start: int, end: int) -> Iterator[WALEntry]:
+    """Decode the records in [start, end) of the log open as fd."""
+    with _map_sequential(fd, end) as mm, memoryview(mm) as view:
+        window = _ScanWindow(mm, fd, start)
+        pos = start
+        while pos < end:
+            entry = _decode_record(view, pos, pos)
+            yield entry
+            pos += entry.total_len
+            if pos - window.released >= SCAN_WINDOW:
+                window.advance(pos)
+
+
+def scan_segment(wal_path: str, start: int, end: int) -> Iterator[WALEntry]:
+    """
+    Yield the records in [start, end) of the WAL file at wal_path.
+    Opens its own mapping, so it can run in another process; start must
+    be a record boundary (see LogManager.segment_bounds).
+    """
+    with open(wal_path, "rb") as f:
+        yield from _iter_records(f.fileno(), start, end)
+
+# ─── Batch decoding ─────────────────────────────────────────────────────────
+
+_RECORD_TYPES = frozenset(int(t) for t in WALRecordType)
+# Raw type -> member; a dict lookup is much cheaper than WALRecordType(raw)
+_RECORD_TYPE_OF = {int(t): t for t in WALRecordType}
+
+# Records decoded per WALBatch by default
+SCAN_BATCH_SIZE = 4096
+
+
+class WALBatch:
+    """
+    Consecutive records decoded column-wise. Header fields live in
+    parallel arrays indexed by record; payloads stay in one buffer shared
+    by the batch, so decoding allocates per batch rather than per record.
+    Materialize a WALEntry with entry(i) only where one is needed.
+
+    The buffer is copied out of the log mapping once per batch, so the
+    mapping can be closed as soon as the scan ends; payloads handed out
+    from it are views and keep the batch buffer alive.
+    """
+    __slots__ = ("base", "buffer", "view", "lsns", "txn_ids", "prev_lsns",
+                 "types", "total_lens")
+
+    def __init__(self, base: int, buffer: bytes, lsns: array, txn_ids: array,
+                 prev_lsns: array, types: array, total_lens: array):
+        self.base = base              # LSN of buffer[0]
+        self.buffer = buffer
+        self.view = memoryview(buffer)  # payload() slices this, not a new view
+        self.lsns = lsns
+        self.txn_ids = txn_ids
+        self.prev_lsns = prev_lsns
+        self.types = types            # raw WALRecordType values
+        self.total_lens = total_lens
+
+    def __len__(self) -> int:
+        return len(self.lsns)
+
+    @property
+    def end(self) -> int:
+        """LSN just past the last record."""
+        return self.lsns[-1] + self.total_lens[-1]
+
+    def payload(self, i: int) -> memoryview:
+        """Payload of record i, as a view into the batch buffer."""
+        off = self.lsns[i] - self.base
+        return self.view[off + _HDR_SIZE:off + self.total_lens[i] - _CRC_SIZE]
+
+    def entry(self, i: int) -> WALEntry:
+        """Record i as a WALEntry whose payload is a view, not a copy."""
+        return WALEntry(
+            lsn=self.lsns[i],
+            txn_id=self.txn_ids[i],
+            prev_lsn=self.prev_lsns[i],
+            record_type=_RECORD_TYPE_OF[self.types[i]],
+            payload=self.payload(i),
+            total_len=self.total_lens[i],
+        )
+
+
+def _iter_batches(fd: int, start: int, end: int,
+                  batch_size: int) -> Iterator[WALBatch]:
+    """Decode the records in [start, end) of the log open as fd into WALBatches."""
+    with _map_sequential(fd, end) as mm, memoryview(mm) as view:
+        window = _ScanWindow(mm, fd, start)
+        yield from _decode_batches(view, start, end, batch_size, window)
+
+
+def _decode_batches(view, start: int, end: int, batch_size: int,
+                    window: _ScanWindow) -> Iterator[WALBatch]:
+    pos = start
+    while pos < end:
+        base = pos
+        lsns, txn_ids, prev_lsns = array("I"), array("I"), array("I")
+        types, total_lens = array("B"), array("I")
+        for _ in range(batch_size):
+            if pos >= end:
+                break
+            total_len, _, txn_id, prev_lsn, rtype = _check_record(view, pos, pos)
+            if rtype not in _RECORD_TYPES:
+                raise ValueError(f"Unknown record type {rtype} at LSN {pos}")
+            lsns.append(pos)
+            txn_ids.append(txn_id)
+            prev_lsns.append(prev_lsn)
+            types.append(rtype)
+            total_lens.append(total_len)
+            pos += total_len
+        batch = WALBatch(base, bytes(view[base:pos]), lsns, txn_ids,
+                         prev_lsns, types, total_lens)
+        window.advance(pos)  # the batch holds its own copy
+        yield batch
+
+
+def scan_segment_batches(wal_path: str, start: int, end: int,
+                         batch_size: int = SCAN_BATCH_SIZE) -> Iterator[WALBatch]:
+    """scan_segment(), decoded into WALBatches."""
+    with open(wal_path, "rb") as f:
+        yield from _iter_batches(f.fileno(), start, end, batch_size)
+
+
+@lru_cache(maxsize=1024)
+def _table_name_field(table_name: str) -> bytes:
+    """The length-prefixed UTF-8 table name that starts every DML payload.
+    A log holds few distinct tables, so each is encoded once."""
+    tb = table_name.encode("utf-8")
+    return _U16.pack(len(tb)) + tb
+
+def _log_end(fd: int, size: int) -> int:
+    """
+    End of the records in a log file of the given size. That is the size
+    itself, unless the file ends in zeros (preallocated, not yet written),
+    in which case record lengths are walked up to the first zero header.
+    A bad length ends the walk at the file size, so scans still report it.
+    """
+    if size <= WAL_PADDING:
+        return size
+    pos = WAL_PADDING
+    with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mm:
+        if mm[size - 4:] != bytes(4):
+            return size
+        while pos < size:
+            if size - pos < 4:
+                return pos  # inside the zero tail
+            (total_len,) = _U32.unpack_from(mm, pos)
+            if total_len == 0:
+                return pos
+            if total_len < _MIN_RECORD or pos + total_len > size:
+                break
+            pos += total_len
+    return size
+
 # ─── LogManager ─────────────────────────────────────────────────────────────
 
 class LogManager:
@@ -58,15 +353,31 @@ class LogManager:
       - CRC32 on every record
       - flush() forces fsync to disk
       - durable_lsn tracks what has been fsynced
+      - Thread-safe: appends and reads are serialized on one I/O lock;
+        commit flushes are batched (group commit, see flush_to)
     """
 
-    def __init__(self, data_dir: str):
+    def __init__(self, data_dir: str, commit_delay: float = 0.0,
+                 commit_siblings: int = 0, preallocate: int = 0):
         self._wal_path = os.path.join(data_dir, "wal.log")
+        # Seconds a group-commit leader waits before syncing, so commits
+        # arriving meanwhile share its fsync (cf. PostgreSQL commit_delay).
+        # The wait is skipped unless at least commit_siblings other
+        # committers are already waiting: a lone commit has no one to share
+        # its fsync with, so delaying it only adds latency.
+        self._commit_delay = commit_delay
+        self._commit_siblings = commit_siblings
+        # With preallocate > 0 the file grows in zero-filled extents of
+        # that many bytes, ahead of the records. An fdatasync then only
+        # has data to write: the file size and block map change once per
+        # extent rather than on every commit. The log end is no longer the
+        # file size; it is where the first all-zero header starts.
+        self._preallocate = preallocate
 
         # Create file if needed
         if not os.path.exists(self._wal_path):
             with open(self._wal_path, "wb") as f:
-                f.write(struct.pack(">I", 0))  # 4-byte NULL padding
+                f.write(_U32.pack(0))  # 4-byte NULL padding
                 f.flush()
                 os.fsync(f.fileno())
 
@@ -76,13 +387,27 @@ class LogManager:
         size = self._file.seek(0, os.SEEK_END)
         if size == 0:
             # Empty file — write padding
-            self._file.write(struct.pack(">I", 0))
+            self._file.write(_U32.pack(0))
             self._file.flush()
             os.fsync(self._file.fileno())
             size = WAL_PADDING
 
-        self._next_lsn = size
-        self._durable_lsn = size  # On open, whatever is on disk is durable
+        self._alloc_end = size
+        self._next_lsn = _log_end(self._file.fileno(), size)
+        self._durable_lsn = self._next_lsn  # On open, whatever is on disk is durable
+
+        self._io_lock = threading.Lock()   # file position, _next_lsn, _pending
+        # Encoded records not yet written; they occupy the _pending_bytes
+        # LSNs just below _next_lsn
+        self._pending: list[bytearray] = []
+        self._pending_bytes = 0
+        # read_record's header buffer, reused under _io_lock
+        self._hdr_buf = bytearray(_HDR_SIZE)
+        # Group commit: _sync_cv guards _durable_lsn, _syncing and
+        # _committers (callers currently inside flush_to)
+        self._sync_cv = threading.Condition()
+        self._syncing = False
+        self._committers = 0
 
     # ─── Properties ──────────────────────────────────────────────────────
 
@@ -97,18 +422,100 @@ class LogManager:
 
     def set_next_lsn(self, lsn: int) -> None:
         """Used by recovery manager to advance LSN after scanning."""
-        if lsn > self._next_lsn:
-            self._next_lsn = lsn
-            self._file.seek(lsn)
+        with self._io_lock:
+            self._drain_locked()
+            if lsn > self._next_lsn:
+                self._next_lsn = lsn
+                self._file.seek(lsn)
 
     # ─── Core I/O ────────────────────────────────────────────────────────
 
+    def _drain_locked(self) -> None:
+        """Write staged records to the file. Caller holds _io_lock."""
+        records = self._pending
+        if not records:
+            return
+        offset = self._next_lsn - self._pending_bytes
+        if self._preallocate and self._next_lsn > self._alloc_end:
+            self._extend_locked(self._next_lsn)
+        if _HAS_VECTORED_IO:
+            fd = self._file.fileno()
+            for i in range(0, len(records), _IOV_MAX):
+                batch = records[i:i + _IOV_MAX]
+                size = sum(map(len, batch))
+                written = os.pwritev(fd, batch, offset)
+                if written < size:  # short write: finish the rest plainly
+                    rest = memoryview(b"".join(batch))[written:]
+                    while rest:
+                        n = os.pwrite(fd, rest, offset + written)
+                        rest = rest[n:]
+                        written += n
+                offset += size
+        else:
+            self._file.seek(offset)
+            self._file.write(b"".join(records))
+        records.clear()
+        self._pending_bytes = 0
+
+    def _extend_locked(self, needed: int) -> None:
+        """Zero-fill the file up to the extent covering needed. Caller holds _io_lock."""
+        step = self._preallocate
+        new_end = -(-needed // step) * step
+        fd = self._file.fileno()
+        pos = self._alloc_end
+        while pos < new_end:
+            n = min(len(_ZERO_CHUNK), new_end - pos)
+            if _HAS_VECTORED_IO:
+                pos += os.pwrite(fd, _ZERO_CHUNK[:n], pos)
+            else:
+                self._file.seek(pos)
+                pos += self._file.write(_ZERO_CHUNK[:n])
+        self._alloc_end = new_end
+
     def flush(self) -> None:
         """Force all buffered WAL data to disk."""
         if self._file:
-            self._file.flush()
-            os.fsync(self._file.fileno())
-            self._durable_lsn = self._next_lsn
+            with self._io_lock:
+                self._drain_locked()
+                self._file.flush()
+                target = self._next_lsn
+            _fdatasync(self._file.fileno())
+            with self._sync_cv:
+                if target > self._durable_lsn:
+                    self._durable_lsn = target
+
+    def flush_to(self, lsn: int) -> None:
+        """
+        Block until the record at lsn is durable (group commit).
+
+        If no sync is in flight, the caller leads one flush covering all
+        records appended so far; otherwise it waits for the running sync
+        and re-checks, so concurrent committers share fsyncs. With a
+        commit_delay the leader first waits that long, trading latency
+        for larger groups when commits arrive faster than fsyncs finish,
+        but only while commit_siblings other committers are waiting.
+        """
+        with self._sync_cv:
+            self._committers += 1
+            try:
+                while self._durable_lsn <= lsn:
+                    if not self._syncing:
+                        self._syncing = True
+                        break
+                    self._sync_cv.wait()
+                else:
+                    return
+                siblings = self._committers - 1
+            finally:
+                self._committers -= 1
+        try:
+            if self._commit_delay and siblings >= self._commit_siblings:
+                time.sleep(self._commit_delay)
+            self.flush()
+        finally:
+            with self._sync_cv:
+                self._syncing = False
+                self._sync_cv.notify_all()
 
     def close(self) -> None:
         if self._file:
@@ -120,40 +527,58 @@ class LogManager:
         """Truncate WAL to given offset. Used after checkpoint."""
         if to_lsn < WAL_PADDING:
             to_lsn = WAL_PADDING
-        self._file.truncate(to_lsn)
-        self._file.seek(to_lsn)
-        self._next_lsn = to_lsn
+        with self._io_lock:
+            self._drain_locked()
+            self._file.truncate(to_lsn)
+            self._file.seek(to_lsn)
+            self._next_lsn = self._alloc_end = to_lsn
         self.flush()
+        with self._sync_cv:
+            self._durable_lsn = to_lsn
 
     # ─── Write ───────────────────────────────────────────────────────────
 
     def _write_record(self, txn_id: int, prev_lsn: int,
                       rtype: WALRecordType, payload: bytes) -> int:
-        """Append a record. Returns its LSN (byte offset). Does NOT flush."""
-        lsn = self._next_lsn
-        total_len = _HDR_SIZE + len(payload) + _CRC_SIZE
-
-        hdr = struct.pack(_HDR_FMT, total_len, lsn, txn_id, prev_lsn, rtype)
-        crc = zlib.crc32(hdr)
-        if payload:
-            crc = zlib.crc32(payload, crc)
-        crc_bytes = struct.pack(">I", crc & 0xFFFFFFFF)
-
-        self._file.seek(lsn)
-        self._file.write(hdr)
-        if payload:
-            self._file.write(payload)
-        self._file.write(crc_bytes)
-
-        self._next_lsn = lsn + total_len
+        """
+        Append a record. Returns its LSN (byte offset). Does NOT flush.
+        The record is staged in memory until the append buffer fills or
+        the log is flushed, read or scanned.
+        """
+        with self._io_lock:
+            lsn = self._next_lsn
+            record = _encode_record(lsn, txn_id, prev_lsn, rtype, payload)
+            self._pending.append(record)
+            self._pending_bytes += len(record)
+            self._next_lsn = lsn + len(record)
+            if self._pending_bytes >= WAL_APPEND_BUFFER_SIZE:
+                self._drain_locked()
         return lsn
 
     # ─── Payload builders ────────────────────────────────────────────────
 
     @staticmethod
     def _pack_table_rid(table_name: str, page_id: int, slot_id: int) -> bytes:
-        tb = table_name.encode("utf-8")
-        return struct.pack(">H", len(tb)) + tb + struct.pack(">IH", page_id, slot_id)
+        return _table_name_field(table_name) + _PAGE_SLOT.pack(page_id, slot_id)
+
+    @staticmethod
+    def _pack_dml(table_name: str, page_id: int, slot_id: int,
+                  *images) -> bytearray:
+        """
+        DML payload: the table/RID header, then each image length-prefixed.
+        Built in one pre-sized buffer instead of by concatenation.
+        """
+        name = _table_name_field(table_name)
+        off = len(name) + _PAGE_SLOT.size
+        buf = bytearray(off + sum(2 + len(img) for img in images))
+        buf[:len(name)] = name
+        _PAGE_SLOT.pack_into(buf, len(name), page_id, slot_id)
+        for img in images:
+            n = len(img)
+            _U16.pack_into(buf, off, n)
+            buf[off + 2:off + 2 + n] = img
+            off += 2 + n
+        return buf
 
     # ─── Public append methods ───────────────────────────────────────────
 
@@ -162,35 +587,30 @@ class LogManager:
 
     def append_commit(self, txn_id: int, prev_lsn: int) -> int:
         lsn = self._write_record(txn_id, prev_lsn, WALRecordType.COMMIT, b"")
-        self.flush()  # COMMIT MUST be durable before acknowledged
+        self.flush_to(lsn)  # COMMIT MUST be durable before acknowledged
         return lsn
 
     def append_abort(self, txn_id: int, prev_lsn: int) -> int:
         lsn = self._write_record(txn_id, prev_lsn, WALRecordType.ABORT, b"")
-        self.flush()
+        self.flush_to(lsn)
         return lsn
 
     def append_insert(self, txn_id: int, prev_lsn: int,
                       table_name: str, page_id: int, slot_id: int,
                       tuple_data: bytes) -> int:
-        prefix = self._pack_table_rid(table_name, page_id, slot_id)
-        payload = prefix + struct.pack(">H", len(tuple_data)) + tuple_data
+        payload = self._pack_dml(table_name, page_id, slot_id, tuple_data)
         return self._write_record(txn_id, prev_lsn, WALRecordType.INSERT, payload)
 
     def append_delete(self, txn_id: int, prev_lsn: int,
                       table_name: str, page_id: int, slot_id: int,
                       tuple_data: bytes) -> int:
-        prefix = self._pack_table_rid(table_name, page_id, slot_id)
-        payload = prefix + struct.pack(">H", len(tuple_data)) + tuple_data
+        payload = self._pack_dml(table_name, page_id, slot_id, tuple_data)
         return self._write_record(txn_id, prev_lsn, WALRecordType.DELETE, payload)
 
     def append_update(self, txn_id: int, prev_lsn: int,
                       table_name: str, page_id: int, slot_id: int,
                       old_data: bytes, new_data: bytes) -> int:
-        prefix = self._pack_table_rid(table_name, page_id, slot_id)
-        payload = (prefix +
-                   struct.pack(">H", len(old_data)) + old_data +
-                   struct.pack(">H", len(new_data)) + new_data)
+        payload = self._pack_dml(table_name, page_id, slot_id, old_data, new_data)
         return self._write_record(txn_id, prev_lsn, WALRecordType.UPDATE, payload)
 
     def append_clr(self, txn_id: int, prev_lsn: int,
@@ -201,113 +621,220 @@ class LogManager:
         is safe.  undo_next_lsn = prev record to undo next (chain skip).
         inner_type/payload describe the compensating action (redo-only).
         """
-        payload = struct.pack(">IB", undo_next_lsn, inner_type) + inner_payload
+        payload = bytearray(_CLR_HDR.size + len(inner_payload))
+        _CLR_HDR.pack_into(payload, 0, undo_next_lsn, inner_type)
+        payload[_CLR_HDR.size:] = inner_payload
         return self._write_record(txn_id, prev_lsn, WALRecordType.CLR, payload)
 
     def append_checkpoint(self, active_txns: list[tuple[int, int]]) -> int:
         """active_txns = [(txn_id, last_lsn), ...]"""
-        payload = struct.pack(">I", len(active_txns))
-        for tid, last_lsn in active_txns:
-            payload += struct.pack(">II", tid, last_lsn)
+        payload = bytearray(_U32.size + len(active_txns) * _TXN_ENTRY.size)
+        _U32.pack_into(payload, 0, len(active_txns))
+        for i, (tid, last_lsn) in enumerate(active_txns):
+            _TXN_ENTRY.pack_into(payload, _U32.size + i * _TXN_ENTRY.size,
+                                 tid, last_lsn)
         lsn = self._write_record(0, NULL_LSN, WALRecordType.CHECKPOINT, payload)
-        self.flush()
+        self.flush_to(lsn)
         return lsn
 
     # ─── Read ────────────────────────────────────────────────────────────
 
     def read_record(self, lsn: int) -> WALEntry:
         """Read a single record at the given LSN (byte offset)."""
-        self._file.seek(lsn)
-        hdr_data = self._file.read(_HDR_SIZE)
-        if len(hdr_data) < _HDR_SIZE:
-            raise ValueError(f"Unexpected EOF reading header at LSN {lsn}")
-
-        total_len, rec_lsn, txn_id, prev_lsn, rtype_val = struct.unpack(_HDR_FMT, hdr_data)
-
-        # Sanity checks
-        if rec_lsn != lsn:
-            raise ValueError(f"LSN mismatch at offset {lsn}: header says {rec_lsn}")
-        if total_len < _MIN_RECORD:
-            raise ValueError(f"Record too small ({total_len}) at LSN {lsn}")
-
-        payload_len = total_len - _HDR_SIZE - _CRC_SIZE
-        rest = self._file.read(payload_len + _CRC_SIZE)
-        if len(rest) < payload_len + _CRC_SIZE:
-            raise ValueError(f"Unexpected EOF reading payload at LSN {lsn}")
-
-        payload = rest[:payload_len]
-        stored_crc = struct.unpack(">I", rest[payload_len:])[0]
-
-        # CRC verify
-        computed = zlib.crc32(hdr_data)
-        if payload:
-            computed = zlib.crc32(payload, computed)
-        if (computed & 0xFFFFFFFF) != stored_crc:
-            raise ValueError(f"CRC mismatch at LSN {lsn}")
-
+        with self._io_lock:
+            self._drain_locked()
+            hdr = self._hdr_buf
+            if self._read_at(hdr, lsn) < _HDR_SIZE:
+                raise ValueError(f"Unexpected EOF reading header at LSN {lsn}")
+
+            # One buffer for the whole record; the body is read straight
+            # into it. Never read past the log end, even if total_len is bad.
+            total_len = _HDR.unpack_from(hdr)[0]
+            size = max(min(total_len, self._next_lsn - lsn), _HDR_SIZE)
+            record = bytearray(size)
+            record[:_HDR_SIZE] = hdr
+            with memoryview(record) as view:
+                got = self._read_at(view[_HDR_SIZE:], lsn + _HDR_SIZE)
+            del record[_HDR_SIZE + got:]
+        # Checked through a view, so the CRC runs over the buffer in place
+        # (slicing the bytearray would copy it); the payload is a read-only
+        # view of this record's own buffer too
+        view = memoryview(record).toreadonly()
+        total_len, _, txn_id, prev_lsn, rtype_val = _check_record(view, 0, lsn)
         return WALEntry(
             lsn=lsn,
             txn_id=txn_id,
             prev_lsn=prev_lsn,
             record_type=WALRecordType(rtype_val),
-            payload=payload,
+            payload=view[_HDR_SIZE:total_len - _CRC_SIZE],
             total_len=total_len,
         )
 
+    def _read_at(self, buf, offset: int) -> int:
+        """Fill buf from the file at offset; returns bytes read. Caller holds _io_lock."""
+        if _HAS_VECTORED_IO:
+            # pwritev bypasses the file object's buffer; read the same way
+            return os.preadv(self._file.fileno(), [buf], offset)
+        self._file.seek(offset)
+        return self._file.readinto(buf)
+
     def scan(self, start_lsn: int = WAL_PADDING) -> Iterator[WALEntry]:
-        """Yield all records from start_lsn to end of file."""
-        pos = start_lsn
-        file_end = self._file.seek(0, os.SEEK_END)
-        while pos < file_end:
-            entry = self.read_record(pos)
-            yield entry
-            pos += entry.total_len
+        """
+        Yield all records from start_lsn to end of file.
+
+        The file is mapped once and records are decoded in place, so the
+        scan costs no read() call or buffer allocation per record. Pages
+        behind the scan are released every SCAN_WINDOW bytes.
+        """
+        with self._io_lock:
+            self._drain_locked()
+            self._file.flush()  # make buffered appends visible to the mapping
+            file_end = self._next_lsn
+        if start_lsn >= file_end:
+            return
+        yield from _iter_records(self._file.fileno(), start_lsn, file_end)
+
+    def scan_batch(self, start_lsn: int = WAL_PADDING,
+                   batch_size: int = SCAN_BATCH_SIZE) -> Iterator[WALBatch]:
+        """
+        Like scan(), but yield WALBatches of up to batch_size records,
+        for passes such as recovery analysis that read mostly headers.
+        """
+        with self._io_lock:
+            self._drain_locked()
+            self._file.flush()
+            file_end = self._next_lsn
+        if start_lsn >= file_end:
+            return
+        yield from _iter_batches(self._file.fileno(), start_lsn, file_end,
+                                 batch_size)
+
+    def advise_sequential(self) -> None:
+        """
+        Hint that the whole log is about to be read front to back (as
+        recovery does), so the kernel starts reading it in ahead of the
+        scan. A no-op where posix_fadvise is unavailable.
+        """
+        if _HAS_FADVISE:
+            fd = self._file.fileno()
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+
+    @property
+    def path(self) -> str:
+        return self._wal_path
+
+    def segment_bounds(self, segment_size: int) -> list[tuple[int, int]]:
+        """
+        Split the log into [start, end) ranges of about segment_size bytes
+        that begin and end on record boundaries, for scanning in parallel
+        with scan_segment(). Only record lengths are read; if a length is
+        implausible the remainder becomes one segment, whose scan raises.
+        """
+        with self._io_lock:
+            self._drain_locked()
+            self._file.flush()
+            file_end = self._next_lsn
+        if file_end <= WAL_PADDING:
+            return []
+        bounds = []
+        seg_start = pos = WAL_PADDING
+        with _map_sequential(self._file.fileno(), file_end) as mm:
+            while file_end - pos >= _HDR_SIZE:
+                (total_len,) = _U32.unpack_from(mm, pos)
+                if total_len < _MIN_RECORD or pos + total_len > file_end:
+                    break
+                pos += total_len
+                if pos - seg_start >= segment_size:
+                    bounds.append((seg_start, pos))
+                    seg_start = pos
+        if seg_start < file_end:
+            bounds.append((seg_start, file_end))
+        return bounds
 
     # ─── Payload parsing helpers (used by recovery / txn manager) ────────
 
+    # Parsers take bytes or a memoryview and return memoryview slices for
+    # the data images, so nested payloads (CLRs) and redo/undo, which only
+    # copy the image into a page, never materialize an intermediate bytes.
+
     @staticmethod
-    def parse_dml_payload(payload: bytes):
+    def _parse_table_rid(mv: memoryview) -> tuple[str, int, int, int]:
+        """(table_name, page_id, slot_id, offset past the header)."""
+        tb_len = _U16.unpack_from(mv, 0)[0]
+        off = 2 + tb_len
+        table_name = str(mv[2:off], "utf-8")
+        page_id, slot_id = _PAGE_SLOT.unpack_from(mv, off)
+        return table_name, page_id, slot_id, off + _PAGE_SLOT.size
+
+    @staticmethod
+    def _skip_table_rid(mv: memoryview) -> tuple[int, int, int]:
+        """(page_id, slot_id, offset past the header); the name is not decoded."""
+        off = 2 + _U16.unpack_from(mv, 0)[0]
+        page_id, slot_id = _PAGE_SLOT.unpack_from(mv, off)
+        return page_id, slot_id, off + _PAGE_SLOT.size
+
+    @staticmethod
+    def _image_at(mv: memoryview, off: int) -> tuple[memoryview, int]:
+        """(length-prefixed image at off, offset past it)."""
+        end = off + 2 + _U16.unpack_from(mv, off)[0]
+        return mv[off + 2:end], end
+
+    @staticmethod
+    def parse_dml_payload(payload):
         """
         Parse INSERT/DELETE payload → (table_name, page_id, slot_id, tuple_data).
+        tuple_data is a memoryview into payload.
         """
-        off = 0
-        tb_len = struct.unpack_from(">H", payload, off)[0]; off += 2
-        table_name = payload[off:off+tb_len].decode("utf-8"); off += tb_len
-        page_id, slot_id = struct.unpack_from(">IH", payload, off); off += 6
-        tup_len = struct.unpack_from(">H", payload, off)[0]; off += 2
-        tuple_data = payload[off:off+tup_len]
-        return table_name, page_id, slot_id, tuple_data
+        mv = memoryview(payload)
+        table_name, page_id, slot_id, off = LogManager._parse_table_rid(mv)
+        return table_name, page_id, slot_id, LogManager._image_at(mv, off)[0]
 
     @staticmethod
-    def parse_update_payload(payload: bytes):
+    def parse_update_payload(payload):
         """
         Parse UPDATE payload → (table_name, page_id, slot_id, old_data, new_data).
+        old_data and new_data are memoryviews into payload.
         """
-        off = 0
-        tb_len = struct.unpack_from(">H", payload, off)[0]; off += 2
-        table_name = payload[off:off+tb_len].decode("utf-8"); off += tb_len
-        page_id, slot_id = struct.unpack_from(">IH", payload, off); off += 6
-        old_len = struct.unpack_from(">H", payload, off)[0]; off += 2
-        old_data = payload[off:off+old_len]; off += old_len
-        new_len = struct.unpack_from(">H", payload, off)[0]; off += 2
-        new_data = payload[off:off+new_len]
+        mv = memoryview(payload)
+        table_name, page_id, slot_id, off = LogManager._parse_table_rid(mv)
+        old_data, off = LogManager._image_at(mv, off)
+        new_data, _ = LogManager._image_at(mv, off)
         return table_name, page_id, slot_id, old_data, new_data
 
     @staticmethod
-    def parse_clr_payload(payload: bytes):
-        """Parse CLR payload → (undo_next_lsn, inner_type, inner_payload)."""
-        undo_next_lsn, inner_type = struct.unpack_from(">IB", payload, 0)
-        inner_payload = payload[5:]
-        return undo_next_lsn, inner_type, inner_payload
+    def parse_dml_image(payload):
+        """
+        Parse INSERT/DELETE payload → (slot_id, tuple_data), for callers
+        that already know the page (redo). The table name is skipped, not
+        decoded.
+        """
+        mv = memoryview(payload)
+        _, slot_id, off = LogManager._skip_table_rid(mv)
+        return slot_id, LogManager._image_at(mv, off)[0]
+
+    @staticmethod
+    def parse_update_images(payload):
+        """Parse UPDATE payload → (slot_id, old_data, new_data); see parse_dml_image."""
+        mv = memoryview(payload)
+        _, slot_id, off = LogManager._skip_table_rid(mv)
+        old_data, off = LogManager._image_at(mv, off)
+        new_data, _ = LogManager._image_at(mv, off)
+        return slot_id, old_data, new_data
+
+    @staticmethod
+    def parse_clr_payload(payload):
+        """
+        Parse CLR payload → (undo_next_lsn, inner_type, inner_payload).
+        inner_payload is a memoryview into payload.
+        """
+        mv = memoryview(payload)
+        undo_next_lsn, inner_type = _CLR_HDR.unpack_from(mv, 0)
+        return undo_next_lsn, inner_type, mv[_CLR_HDR.size:]
 
     @staticmethod
-    def parse_checkpoint_payload(payload: bytes):
+    def parse_checkpoint_payload(payload):
         """Parse CHECKPOINT → list of (txn_id, last_lsn)."""
-        n = struct.unpack_from(">I", payload, 0)[0]
-        result = []
-        off = 4
-        for _ in range(n):
-            tid, last_lsn = struct.unpack_from(">II", payload, off)
-            result.append((tid, last_lsn))
-            off += 8
-        return result
+        n = _U32.unpack_from(payload, 0)[0]
+        mv = memoryview(payload)[4:4 + n * _TXN_ENTRY.size]
+        return list(_TXN_ENTRY.iter_unpack(mv))
@@ -9,11 +9,18 @@ Deterministic hashing guarantees:
 - File iteration order sorted alphabetically (os.walk + sorted)
 - JSON output uses sorted keys
 - No environment-dependent paths embedded in hashes
+
+Files are hashed on a thread pool: hashlib releases the GIL while
+digesting large buffers, and file reads overlap. Results are still
+collected in sorted path order.
 """
 
 import hashlib
 import json
+import mmap
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Optional
 
@@ -23,6 +30,19 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 CHECKSUMS_FILE = PROJECT_ROOT / "build_integrity" / "checksums.json"
 
+# Sidecar cache of (mtime_ns, size, sha256) per file, next to CHECKSUMS_FILE.
+# Local state only: it is not part of the tracked checksums.
+CHECKSUM_CACHE_NAME = ".checksum_cache.json"
+
+# verify_build.py's cache of passing test runs; also local, never hashed
+VERIFY_CACHE_NAME = ".verify_cache.json"
+
+# Files modified this recently are not cached (see compute_all_checksums)
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Python 3.11+; older versions hash a read-only mapping instead
+_file_digest = getattr(hashlib, "file_digest", None)
+
 
 def compute_file_checksum(filepath: Path) -> str:
     """
@@ -34,47 +54,119 @@ def compute_file_checksum(filepath: Path) -> str:
     text_extensions = {".py", ".json", ".md", ".txt", ".cfg", ".ini", ".toml"}
     suffix = filepath.suffix.lower()
 
-    sha256 = hashlib.sha256()
-
     if suffix in text_extensions:
-        # Normalize line endings: read as text, re-encode with LF
-        with open(filepath, "r", encoding="utf-8", newline="") as f:
-            content = f.read()
-        # Normalize all line endings to LF
-        normalized = content.replace("\r\n", "\n").replace("\r", "\n")
-        sha256.update(normalized.encode("utf-8"))
-    else:
-        # Binary: hash raw bytes
+        # Normalize line endings on the raw bytes: for UTF-8 text this is
+        # the same as decoding, replacing and re-encoding, without the copies
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256.update(chunk)
-
-    return sha256.hexdigest()
-
-
-def compute_all_checksums(root: Optional[Path] = None) -> Dict[str, str]:
+            content = f.read()
+        if b"\r" in content:
+            content = content.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return hashlib.sha256(content).hexdigest()
+
+    # Binary: hash raw bytes in C, without a Python-level read loop
+    with open(filepath, "rb") as f:
+        if _file_digest is not None:
+            return _file_digest(f, "sha256").hexdigest()
+        sha256 = hashlib.sha256()
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                sha256.update(mm)
+        return sha256.hexdigest()
+
+
+def compute_all_checksums(root: Optional[Path] = None,
+                          force: bool = False) -> Dict[str, str]:
     """
     Compute SHA256 checksums for all relevant project files.
     Scans .py, .json, .md files; excludes __pycache__, .git, data/, etc.
     File order is deterministic (sorted).
+
+    Files whose (mtime_ns, size) match the checksum cache reuse the
+    cached hash instead of being read. Pass force=True to rehash
+    everything, e.g. when files may have been altered with their
+    timestamps preserved.
     """
     if root is None:
         root = PROJECT_ROOT
 
+    files: list[tuple[str, str, list[int]]] = []
+    for rel, entry in _walk_sorted(root):
+        st = entry.stat()
+        files.append((rel, entry.path, [st.st_mtime_ns, st.st_size]))
+
+    cache_file = root / "build_integrity" / CHECKSUM_CACHE_NAME
+    cache = {} if force else _load_cache(cache_file)
     checksums: Dict[str, str] = {}
-    exclude_dirs = {"__pycache__", ".git", "data", ".pytest_cache", ".mypy_cache"}
+    stale: list[tuple[str, Path]] = []
+    for rel, filepath, stamp in files:
+        hit = cache.get(rel)
+        if hit is not None and hit[:2] == stamp:
+            checksums[rel] = hit[2]
+        else:
+            checksums[rel] = ""  # placeholder keeps the traversal order
+            stale.append((rel, Path(filepath)))  # only files to hash need a Path
+
+    if stale:
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as pool:
+            digests = pool.map(compute_file_checksum, [p for _, p in stale])
+            for (rel, _), digest in zip(stale, digests):
+                checksums[rel] = digest
+
+    # A file modified within the timestamp granularity of this run could
+    # change again without its stamp changing; leave it out so the next
+    # run hashes it rather than trusting the cache.
+    recent = time.time_ns() - _RACY_WINDOW_NS
+    new_cache = {rel: stamp + [checksums[rel]] for rel, _, stamp in files
+                 if stamp[0] < recent}
+    if new_cache != cache:
+        _save_cache(cache_file, new_cache)
+    return checksums
+
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Sort and filter directories for deterministic traversal
-        dirnames[:] = sorted(d for d in dirnames if d not in exclude_dirs)
+def _walk_sorted(root: Path):
+    """
+    Yield (rel_path, DirEntry) for every tracked file under root, in the
+    order a sorted top-down os.walk() would: a directory's files, then
+    each subdirectory in name order. Uses os.scandir(), whose entries
+    carry their file type, so no separate stat is needed to tell files
+    from directories.
+    """
+    exclude_dirs = {"__pycache__", ".git", "data", ".pytest_cache", ".mypy_cache"}
+    exclude_files = {"checksums.json", CHECKSUM_CACHE_NAME, VERIFY_CACHE_NAME}
+    stack = [(os.fspath(root), "")]
+    while stack:
+        dirpath, prefix = stack.pop()
+        with os.scandir(dirpath) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir():
+                # Like os.walk(), symlinked directories are not descended
+                if name not in exclude_dirs and not entry.is_symlink():
+                    subdirs.append((entry.path, prefix + name + "/"))
+            elif name.endswith((".py", ".json", ".md")) and name not in exclude_files:
+                yield prefix + name, entry
+        stack.extend(reversed(subdirs))
+
+
+def _load_cache(cache_file: Path) -> Dict[str, list]:
+    """rel_path -> [mtime_ns, size, sha256]; empty if missing or unreadable."""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-        for filename in sorted(filenames):
-            if filename.endswith((".py", ".json", ".md")) and filename != "checksums.json":
-                filepath = Path(dirpath) / filename
-                rel_path = filepath.relative_to(root).as_posix()
-                checksums[rel_path] = compute_file_checksum(filepath)
 
-    return checksums
+def _save_cache(cache_file: Path, cache: Dict[str, list]) -> None:
+    """Best effort: a read-only tree just hashes every run."""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8", newline="\n") as f:
+            json.dump(cache, f, sort_keys=True)
+    except OSError:
+        pass
 
 
 def load_stored_checksums() -> Dict[str, str]:
@@ -53,40 +53,82 @@ def get_development_order(registry: Dict[str, Any]) -> List[str]:
 
 def detect_circular_dependencies(registry: Dict[str, Any]) -> List[List[str]]:
     """
-    Detect circular dependencies in the feature graph using DFS.
-    Returns a list of cycles found (each cycle is a list of feature IDs).
-    Empty list = no cycles.
+    Detect circular dependencies in the feature graph.
+    Returns a list of cycles found (each cycle is a list of feature IDs,
+    starting and ending with the same one). Empty list = no cycles.
+
+    Uses an iterative Tarjan SCC pass, so deep dependency chains cannot
+    hit the recursion limit, and reports one cycle per strongly connected
+    component (every feature on a cycle belongs to exactly one), so the
+    same loop is never listed twice.
     """
     features = registry.get("features", {})
-    visited: Set[str] = set()
-    rec_stack: Set[str] = set()
-    cycles: List[List[str]] = []
-
-    def _dfs(node: str, path: List[str]) -> None:
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
 
-        feature = features.get(node, {})
-        for dep_id in feature.get("dependencies", []):
-            if dep_id not in visited:
-                _dfs(dep_id, path)
-            elif dep_id in rec_stack:
-                # Found a cycle — extract it
-                cycle_start = path.index(dep_id)
-                cycle = path[cycle_start:] + [dep_id]
-                cycles.append(cycle)
+    def _deps(node: str) -> List[str]:
+        return features.get(node, {}).get("dependencies", [])
 
-        path.pop()
-        rec_stack.discard(node)
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    scc_stack: List[str] = []
+    cycles: List[List[str]] = []
 
-    for feature_id in features:
-        if feature_id not in visited:
-            _dfs(feature_id, [])
+    for root in features:
+        if root in index:
+            continue
+        # Each frame is (node, iterator over its remaining dependencies)
+        work_stack = [(root, iter(_deps(root)))]
+        index[root] = lowlink[root] = len(index)
+        scc_stack.append(root)
+        on_stack.add(root)
+        while work_stack:
+            node, deps = work_stack[-1]
+            for dep_id in deps:
+                if dep_id not in index:
+                    index[dep_id] = lowlink[dep_id] = len(index)
+                    scc_stack.append(dep_id)
+                    on_stack.add(dep_id)
+                    work_stack.append((dep_id, iter(_deps(dep_id))))
+                    break
+                if dep_id in on_stack:
+                    lowlink[node] = min(lowlink[node], index[dep_id])
+            else:
+                work_stack.pop()
+                if work_stack:
+                    parent = work_stack[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = set()
+                    while True:
+                        member = scc_stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in _deps(node):
+                        cycles.append(_cycle_through(node, component, _deps))
 
     return cycles
 
 
+def _cycle_through(start: str, component: Set[str], deps) -> List[str]:
+    """A dependency cycle from start back to itself within component (BFS)."""
+    parent: Dict[str, str] = {}
+    queue = [start]
+    for node in queue:
+        for dep_id in deps(node):
+            if dep_id == start:
+                path = [start]
+                while node != start:
+                    path.append(node)
+                    node = parent[node]
+                return [start] + path[:0:-1] + [start]
+            if dep_id in component and dep_id not in parent:
+                parent[dep_id] = node
+                queue.append(dep_id)
+    return [start, start]  # unreachable: start lies on a cycle in component
+
+
 def validate_dependency_graph(registry: Dict[str, Any]) -> tuple[bool, list[str]]:
     """
     Full dependency graph validation:
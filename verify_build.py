@@ -10,13 +10,16 @@ Usage:
     python verify_build.py --self-check # Verify only verification infrastructure
     python verify_build.py --report     # Report only (no test execution)
     python verify_build.py --update     # Recompute and store checksums
+    python verify_build.py --force      # Rehash files and rerun tests, ignoring caches
 """
 
 import argparse
+import hashlib
 import json
-import subprocess
+import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -33,6 +36,7 @@ from verification.checksums import (
     load_stored_checksums,
     save_checksums,
     get_feature_file_checksums,
+    VERIFY_CACHE_NAME,
 )
 from verification.registry import (
     load_registry,
@@ -59,62 +63,223 @@ class Color:
     RESET = "\033[0m"
 
 
+# Built once at import rather than per call
+_STATUS_ICONS = {
+    "VERIFIED": f"{Color.GREEN}✔{Color.RESET}",
+    "COMPLETE": f"{Color.GREEN}●{Color.RESET}",
+    "IN_PROGRESS": f"{Color.YELLOW}⚠{Color.RESET}",
+    "NOT_STARTED": f"{Color.RED}❌{Color.RESET}",
+}
+
+_CHANGE_COLORS = {
+    "modified": Color.YELLOW,
+    "added": Color.GREEN,
+    "deleted": Color.RED,
+}
+
+
 def status_icon(status: str) -> str:
     """Return a colored icon for a feature status."""
-    icons = {
-        "VERIFIED": f"{Color.GREEN}✔{Color.RESET}",
-        "COMPLETE": f"{Color.GREEN}●{Color.RESET}",
-        "IN_PROGRESS": f"{Color.YELLOW}⚠{Color.RESET}",
-        "NOT_STARTED": f"{Color.RED}❌{Color.RESET}",
-    }
-    return icons.get(status, "?")
+    return _STATUS_ICONS.get(status, "?")
 
 
 # ─── Test Runner ────────────────────────────────────────────────────────────
 
-def run_feature_tests(feature: Dict[str, Any]) -> Tuple[bool, str]:
+def _feature_test_path(feature: Dict[str, Any]) -> Tuple[Optional[str], str]:
     """
-    Run tests for a specific feature using pytest.
-    Returns (passed, output_summary).
+    The test file named by a feature's pytest verification method, as
+    (relative_path, "") — or (None, reason) if there is none to run.
     """
     verification_method = feature.get("verification_method", "")
     if not verification_method or not verification_method.startswith("pytest"):
-        return False, "No test command defined"
+        return None, "No test command defined"
 
     # Extract test file path from verification method
     parts = verification_method.split()
     if len(parts) < 2:
-        return False, "Invalid verification method format"
+        return None, "Invalid verification method format"
+
+    if not (PROJECT_ROOT / parts[1]).exists():
+        return None, f"Test file not found: {parts[1]}"
+    return parts[1], ""
+
+
+def _features_by_test_path(
+    features: List[Dict[str, Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """Map each distinct test file to the first feature that declares it."""
+    by_path: Dict[str, Dict[str, Any]] = {}
+    for feature in features:
+        rel_path = _feature_test_path(feature)[0]
+        if rel_path is not None:
+            by_path.setdefault(rel_path, feature)
+    return by_path
+
+
+def run_feature_tests(feature: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Run tests for a specific feature using pytest.
+    Returns (passed, output_summary).
+    """
+    import subprocess
+    import threading
 
-    test_path = PROJECT_ROOT / parts[1]
-    if not test_path.exists():
-        return False, f"Test file not found: {parts[1]}"
+    rel_path, reason = _feature_test_path(feature)
+    if rel_path is None:
+        return False, reason
+    test_path = PROJECT_ROOT / rel_path
 
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             [sys.executable, "-m", "pytest", str(test_path), "-v", "--tb=short", "-q"],
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=120,
             cwd=str(PROJECT_ROOT),
         )
-        passed = result.returncode == 0
-        output = result.stdout.strip()
-        if result.stderr.strip():
-            output += "\n" + result.stderr.strip()
-
-        # Extract summary line
-        lines = output.split("\n")
-        summary_line = lines[-1] if lines else "No output"
-        return passed, summary_line
-    except subprocess.TimeoutExpired:
-        return False, "Tests timed out (>120s)"
+        # Stream the output, keeping only the last non-empty line (the
+        # summary); a watchdog kills pytest if it runs too long.
+        timed_out = threading.Event()
+        watchdog = threading.Timer(120, lambda: (timed_out.set(), proc.kill()))
+        watchdog.start()
+        summary_line = "No output"
+        try:
+            with proc.stdout:
+                for line in proc.stdout:
+                    if line.strip():
+                        summary_line = line.strip()
+            returncode = proc.wait()
+        finally:
+            watchdog.cancel()
+
+        if timed_out.is_set():
+            return False, "Tests timed out (>120s)"
+        return returncode == 0, summary_line
     except FileNotFoundError:
         return False, "pytest not found — install with: pip install pytest"
     except Exception as e:
         return False, f"Error running tests: {e}"
 
 
+def run_all_feature_tests(
+    features: List[Dict[str, Any]],
+) -> Optional[Dict[str, Tuple[bool, str]]]:
+    """
+    Run the test files of all given features in ONE pytest process and
+    split the outcome per file from its JUnit XML report, so interpreter
+    startup and collection are paid once rather than per feature.
+
+    A collection error in one file must not fail the others, so the run
+    continues past it; any file that reports errors or no tests at all
+    is rerun alone with run_feature_tests to get its own verdict.
+
+    Returns {relative_test_path: (passed, summary)}, or None if the run
+    produced no report (run_feature_tests is then used per feature).
+    """
+    by_path = _features_by_test_path(features)
+    paths = sorted(by_path)
+    if not paths:
+        return {}
+
+    # Only test runs need these; --report and --update never import them
+    import subprocess
+    import tempfile
+    from xml.etree import ElementTree
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report = Path(tmp) / "report.xml"
+        try:
+            subprocess.run(
+                [sys.executable, "-m", "pytest", *paths, "-q", "--tb=short",
+                 "--continue-on-collection-errors",
+                 f"--junitxml={report}", "-o", "junit_family=xunit1"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=120 * len(paths),
+                cwd=str(PROJECT_ROOT),
+            )
+            root = ElementTree.parse(report).getroot()
+        except (subprocess.TimeoutExpired, OSError, ElementTree.ParseError):
+            return None
+
+    # Per file: [passed, failed, errors, skipped]
+    counts = {p: [0, 0, 0, 0] for p in paths}
+    for case in root.iter("testcase"):
+        tally = counts.get(Path(case.get("file", "")).as_posix())
+        if tally is None:
+            continue
+        if case.find("failure") is not None:
+            tally[1] += 1
+        elif case.find("error") is not None:
+            tally[2] += 1
+        elif case.find("skipped") is not None:
+            tally[3] += 1
+        else:
+            tally[0] += 1
+
+    results: Dict[str, Tuple[bool, str]] = {}
+    for path, (n_passed, n_failed, n_errors, n_skipped) in counts.items():
+        if n_errors or not (n_passed or n_failed or n_skipped):
+            results[path] = run_feature_tests(by_path[path])
+            continue
+        parts = [f"{n} {label}" for n, label in (
+            (n_failed, "failed"), (n_passed, "passed"),
+            (n_skipped, "skipped"), (n_errors, "errors")) if n]
+        results[path] = (n_failed == 0 and n_passed > 0, ", ".join(parts))
+    return results
+
+
+# ─── Test Result Cache ──────────────────────────────────────────────────────
+
+# feature_id -> {"key": fingerprint, "summary": str} of its last passing
+# test run. Local state, like the checksum cache next to it.
+VERIFY_CACHE_FILE = PROJECT_ROOT / "build_integrity" / VERIFY_CACHE_NAME
+
+
+def feature_fingerprint(
+    feature_id: str,
+    registry: Dict[str, Any],
+    checksums: Dict[str, str],
+) -> Optional[str]:
+    """
+    Hash of everything a feature's tests can depend on: its verification
+    method and the tracked checksum of every .py file in the project,
+    tests and conftest included. A test module imports well beyond its
+    feature's dependency closure (test_storage.py uses the catalog, the
+    physical planner uses indexing and concurrency), so any source edit
+    invalidates every cached pass. None if the feature has no test file.
+    """
+    feature = get_feature(registry, feature_id) or {}
+    test_path, _ = _feature_test_path(feature)
+    if test_path is None:
+        return None
+
+    h = hashlib.blake2b(feature.get("verification_method", "").encode("utf-8"))
+    for path in sorted(checksums):
+        if path.endswith(".py"):
+            h.update(f"\n{path}:{checksums[path]}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_verify_cache() -> Dict[str, Dict[str, str]]:
+    """Cached passing test runs; empty if missing or unreadable."""
+    try:
+        with open(VERIFY_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_verify_cache(cache: Dict[str, Dict[str, str]]) -> None:
+    """Best effort: without a writable cache, tests simply always run."""
+    try:
+        VERIFY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(VERIFY_CACHE_FILE, "w", encoding="utf-8", newline="\n") as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+    except OSError:
+        pass
+
+
 # ─── Verification Logic ────────────────────────────────────────────────────
 
 def verify_feature(
@@ -123,10 +288,13 @@ def verify_feature(
     registry: Dict[str, Any],
     checksums: Dict[str, str],
     run_tests: bool = True,
+    test_results: Optional[Dict[str, Tuple[bool, str]]] = None,
 ) -> Dict[str, Any]:
     """
     Perform full verification of a single feature.
     Returns a verification result dict.
+    test_results, from run_all_feature_tests(), supplies test outcomes
+    by test file; without it the feature's tests are run here.
     """
     result: Dict[str, Any] = {
         "feature_id": feature_id,
@@ -151,6 +319,12 @@ def verify_feature(
     if not files_ok:
         result["issues"].append(f"Missing files: {', '.join(missing)}")
 
+    # A NOT_STARTED claim only needs its skeleton files checked;
+    # dependencies, checksums and tests cannot change the outcome.
+    declared = feature.get("status", "NOT_STARTED")
+    if declared == "NOT_STARTED":
+        return result
+
     # 2. Check dependencies
     deps_ok, unmet = check_dependencies_met(registry, feature_id, "COMPLETE")
     result["dependencies_met"] = deps_ok
@@ -172,20 +346,20 @@ def verify_feature(
 
     # 4. Run tests if applicable
     if run_tests and feature.get("unit_tests_present", False):
-        passed, output = run_feature_tests(feature)
+        rel_path, reason = _feature_test_path(feature)
+        if test_results is None:
+            passed, output = run_feature_tests(feature)
+        elif rel_path is None:
+            passed, output = False, reason
+        else:
+            passed, output = test_results[rel_path]
         result["tests_passed"] = passed
         result["test_output"] = output
         if not passed:
             result["issues"].append(f"Tests failed: {output}")
 
     # 5. Determine verified status
-    declared = feature.get("status", "NOT_STARTED")
-
-    if declared == "NOT_STARTED":
-        # Check if skeleton files exist — that's fine, still NOT_STARTED
-        result["verified_status"] = "NOT_STARTED"
-
-    elif declared == "IN_PROGRESS":
+    if declared == "IN_PROGRESS":
         if files_ok:
             result["verified_status"] = "IN_PROGRESS"
         else:
@@ -221,21 +395,26 @@ def print_report(
     changes: Dict[str, str],
     registry: Dict[str, Any],
 ) -> None:
-    """Print the BUILD STATUS REPORT to stdout."""
-    print()
-    print(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
-    print(f"{Color.BOLD}{Color.CYAN}           BUILD STATUS REPORT — MiniDB{Color.RESET}")
-    print(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
-    print(f"  Generated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
-    print(f"  Files tracked: {len(checksums)}")
+    """
+    Print the BUILD STATUS REPORT to stdout. Lines are collected and
+    written in one call rather than one print() (and write) per line.
+    """
+    out: List[str] = []
+    emit = out.append
+    emit("")
+    emit(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
+    emit(f"{Color.BOLD}{Color.CYAN}           BUILD STATUS REPORT — MiniDB{Color.RESET}")
+    emit(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
+    emit(f"  Generated: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    emit(f"  Files tracked: {len(checksums)}")
     if changes:
-        print(f"  {Color.YELLOW}Files changed since last check: {len(changes)}{Color.RESET}")
-    print(f"{Color.BOLD}{'─' * 60}{Color.RESET}")
-    print()
+        emit(f"  {Color.YELLOW}Files changed since last check: {len(changes)}{Color.RESET}")
+    emit(f"{Color.BOLD}{'─' * 60}{Color.RESET}")
+    emit("")
 
     # Feature status table
-    print(f"{Color.BOLD}  FEATURE STATUS{Color.RESET}")
-    print(f"  {'─' * 56}")
+    emit(f"{Color.BOLD}  FEATURE STATUS{Color.RESET}")
+    emit(f"  {'─' * 56}")
 
     all_passed = True
     for r in results:
@@ -249,42 +428,38 @@ def print_report(
             mismatch = f" {Color.YELLOW}(declared: {r['declared_status']}){Color.RESET}"
             all_passed = False
 
-        print(f"  {icon} {name:<35} {status}{mismatch}")
+        emit(f"  {icon} {name:<35} {status}{mismatch}")
 
         if r["issues"]:
             for issue in r["issues"]:
-                print(f"    {Color.DIM}└─ {issue}{Color.RESET}")
+                emit(f"    {Color.DIM}└─ {issue}{Color.RESET}")
             all_passed = False
 
-    print()
-    print(f"  {'─' * 56}")
+    emit("")
+    emit(f"  {'─' * 56}")
 
     # Next step
     next_step = get_next_required_step(registry)
     if next_step:
         feature = get_feature(registry, next_step)
         name = feature["name"] if feature else next_step
-        print(f"  {Color.CYAN}▶ Next required step:{Color.RESET} {name} ({next_step})")
+        emit(f"  {Color.CYAN}▶ Next required step:{Color.RESET} {name} ({next_step})")
     else:
-        print(f"  {Color.GREEN}▶ All features complete!{Color.RESET}")
+        emit(f"  {Color.GREEN}▶ All features complete!{Color.RESET}")
 
-    print()
+    emit("")
 
     # File changes
     if changes:
-        print(f"{Color.BOLD}  FILE CHANGES SINCE LAST VERIFICATION{Color.RESET}")
-        print(f"  {'─' * 56}")
+        emit(f"{Color.BOLD}  FILE CHANGES SINCE LAST VERIFICATION{Color.RESET}")
+        emit(f"  {'─' * 56}")
         for filepath, change_type in sorted(changes.items()):
-            type_color = {
-                "modified": Color.YELLOW,
-                "added": Color.GREEN,
-                "deleted": Color.RED,
-            }.get(change_type, "")
-            print(f"  {type_color}{change_type:>10}{Color.RESET}  {filepath}")
-        print()
+            type_color = _CHANGE_COLORS.get(change_type, "")
+            emit(f"  {type_color}{change_type:>10}{Color.RESET}  {filepath}")
+        emit("")
 
     # Summary
-    print(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
+    emit(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
     summary = get_status_summary(registry)
     verified = len(summary.get("VERIFIED", []))
     complete = len(summary.get("COMPLETE", []))
@@ -292,18 +467,21 @@ def print_report(
     not_started = len(summary.get("NOT_STARTED", []))
     total = verified + complete + in_progress + not_started
 
-    print(f"  {Color.GREEN}✔ VERIFIED: {verified}{Color.RESET}  "
-          f"{Color.GREEN}● COMPLETE: {complete}{Color.RESET}  "
-          f"{Color.YELLOW}⚠ IN_PROGRESS: {in_progress}{Color.RESET}  "
-          f"{Color.RED}❌ NOT_STARTED: {not_started}{Color.RESET}  "
-          f"/ {total} total")
+    emit(f"  {Color.GREEN}✔ VERIFIED: {verified}{Color.RESET}  "
+         f"{Color.GREEN}● COMPLETE: {complete}{Color.RESET}  "
+         f"{Color.YELLOW}⚠ IN_PROGRESS: {in_progress}{Color.RESET}  "
+         f"{Color.RED}❌ NOT_STARTED: {not_started}{Color.RESET}  "
+         f"/ {total} total")
 
     if all_passed:
-        print(f"\n  {Color.GREEN}{Color.BOLD}BUILD INTEGRITY: CONSISTENT{Color.RESET}")
+        emit(f"\n  {Color.GREEN}{Color.BOLD}BUILD INTEGRITY: CONSISTENT{Color.RESET}")
     else:
-        print(f"\n  {Color.YELLOW}{Color.BOLD}BUILD INTEGRITY: ISSUES DETECTED{Color.RESET}")
-    print(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
-    print()
+        emit(f"\n  {Color.YELLOW}{Color.BOLD}BUILD INTEGRITY: ISSUES DETECTED{Color.RESET}")
+    emit(f"{Color.BOLD}{'═' * 60}{Color.RESET}")
+    emit("")
+
+    sys.stdout.write("\n".join(out) + "\n")
+    sys.stdout.flush()
 
 
 # ─── Main ───────────────────────────────────────────────────────────────────
@@ -328,6 +506,11 @@ def main() -> int:
         action="store_true",
         help="Recompute and store checksums without running tests",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rehash every file and rerun every test, ignoring the caches",
+    )
     parser.add_argument(
         "--feature",
         type=str,
@@ -352,7 +535,7 @@ def main() -> int:
         print()
 
     # 2. Compute current checksums
-    current_checksums = compute_all_checksums(PROJECT_ROOT)
+    current_checksums = compute_all_checksums(PROJECT_ROOT, force=args.force)
 
     # 3. Load stored checksums and detect changes
     stored_checksums = load_stored_checksums()
@@ -366,34 +549,90 @@ def main() -> int:
             return 0
 
     # 5. Determine which features to verify
-    dev_order = get_development_order(registry)
     if args.self_check:
         feature_ids = ["verification_infrastructure"]
     elif args.feature:
         feature_ids = [args.feature]
     else:
-        feature_ids = dev_order
+        feature_ids = get_development_order(registry)
 
-    # 6. Run verification
+    # 6. Run verification. Features are independent and, when they run
+    # their own tests, each mostly waits on a pytest subprocess, so they
+    # are verified on a thread pool; map() keeps development order.
     run_tests = not args.report
-    results: List[Dict[str, Any]] = []
+    to_verify: List[Tuple[str, Dict[str, Any]]] = []
 
     for feature_id in feature_ids:
         feature = get_feature(registry, feature_id)
         if feature is None:
             print(f"{Color.YELLOW}WARNING: Feature '{feature_id}' not in registry{Color.RESET}")
             continue
+        to_verify.append((feature_id, feature))
+
+    # All test files run in one pytest process up front; if that yields
+    # no report, each distinct test file runs in its own process. A feature
+    # whose fingerprint matches its last passing run reuses that result.
+    test_results = None
+    verify_cache = {} if args.force else load_verify_cache()
+    fingerprints: Dict[str, Optional[str]] = {}
+    if run_tests:
+        cached: Dict[str, Tuple[bool, str]] = {}
+        to_test = []
+        for feature_id, feature in to_verify:
+            if (not feature.get("unit_tests_present", False)
+                    or feature.get("status", "NOT_STARTED") == "NOT_STARTED"):
+                continue
+            key = feature_fingerprint(feature_id, registry, current_checksums)
+            fingerprints[feature_id] = key
+            hit = verify_cache.get(feature_id)
+            if key is not None and hit is not None and hit.get("key") == key:
+                cached[_feature_test_path(feature)[0]] = (
+                    True, f"{hit['summary']} (cached)")
+            else:
+                to_test.append(feature)
+        test_results = run_all_feature_tests(to_test)
+        if test_results is None:
+            # No report: run each distinct test file on its own, once,
+            # however many features share it.
+            by_path = _features_by_test_path(to_test)
+            if by_path:
+                workers = min(len(by_path), os.cpu_count() or 1)
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    outcomes = pool.map(run_feature_tests, by_path.values())
+                    test_results = dict(zip(by_path, outcomes))
+            else:
+                test_results = {}
+        test_results = {**cached, **test_results}
 
-        result = verify_feature(
-            feature_id, feature, registry, current_checksums, run_tests=run_tests
-        )
-        results.append(result)
+    results: List[Dict[str, Any]] = []
+    if to_verify:
+        workers = min(len(to_verify), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                lambda item: verify_feature(
+                    item[0], item[1], registry, current_checksums,
+                    run_tests=run_tests, test_results=test_results,
+                ),
+                to_verify,
+            ))
+
+    # Remember passing runs; drop entries for features that failed
+    for r in results:
+        key = fingerprints.get(r["feature_id"])
+        if r["tests_passed"] and key is not None:
+            summary = r["test_output"].removesuffix(" (cached)")
+            verify_cache[r["feature_id"]] = {"key": key, "summary": summary}
+        elif r["tests_passed"] is False:
+            verify_cache.pop(r["feature_id"], None)
+    if run_tests:
+        save_verify_cache(verify_cache)
 
     # 7. Print report
     print_report(results, current_checksums, changes, registry)
 
-    # 8. Save updated checksums
-    save_checksums(current_checksums)
+    # 8. Save updated checksums (an unchanged tree leaves the file alone)
+    if changes:
+        save_checksums(current_checksums)
 
     # 9. Return exit code (0 = consistent, 1 = issues)
     has_issues = any(r["issues"] for r in results)